@@ -1,4 +1,3 @@
-import { useEffect, useState } from "react";
 import {
   Container,
   Typography,
@@ -12,15 +11,22 @@ import {
   Button,
   IconButton,
   Box,
+  CircularProgress,
 } from "@mui/material";
 import { Edit, Delete } from "@mui/icons-material";
 import { Link as RouterLink } from "react-router-dom";
 import Loader from "./Loader";
+import { useInfiniteList } from "../hooks/useInfiniteList";
 import { fetchContacts, deleteContact } from "../utils/apis";
 
 function ContactList() {
-  const [contacts, setContacts] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: contacts,
+    setItems: setContacts,
+    loading,
+    hasMore,
+    sentinelRef,
+  } = useInfiniteList(fetchContacts);
 
   const handleDelete = async (id) => {
     if (window.confirm("Are you sure you want to delete this contact?")) {
@@ -33,20 +39,6 @@ function ContactList() {
     }
   };
 
-  useEffect(() => {
-    const loadContacts = async () => {
-      try {
-        const data = await fetchContacts();
-        setContacts(data);
-      } catch (error) {
-        console.error("Error fetching contacts:", error.message);
-      } finally {
-        setLoading(false);
-      }
-    };
-    loadContacts();
-  }, []);
-
   if (loading) {
     return <Loader />;
   }
@@ -109,6 +101,14 @@ function ContactList() {
           </TableBody>
         </Table>
       </TableContainer>
+      {hasMore && (
+        <Box
+          ref={sentinelRef}
+          sx={{ display: "flex", justifyContent: "center", py: 2 }}
+        >
+          <CircularProgress size={24} />
+        </Box>
+      )}
     </Container>
   );
 }
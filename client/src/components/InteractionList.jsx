@@ -1,4 +1,3 @@
-import { useEffect, useState } from "react";
 import { Link as RouterLink } from "react-router-dom";
 import {
   Container,
@@ -12,15 +11,22 @@ import {
   Paper,
   Button,
   Box,
+  CircularProgress,
   IconButton,
 } from "@mui/material";
 import { Edit, Delete } from "@mui/icons-material";
 import Loader from "./Loader";
+import { useInfiniteList } from "../hooks/useInfiniteList";
 import { fetchInteractions, deleteInteraction } from "../utils/apis";
 
 function InteractionList() {
-  const [interactions, setInteractions] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: interactions,
+    setItems: setInteractions,
+    loading,
+    hasMore,
+    sentinelRef,
+  } = useInfiniteList(fetchInteractions);
 
   const handleDelete = async (id) => {
     if (window.confirm("Are you sure you want to delete this interaction?")) {
@@ -33,20 +39,6 @@ function InteractionList() {
     }
   };
 
-  useEffect(() => {
-    const loadInteractions = async () => {
-      try {
-        const data = await fetchInteractions();
-        setInteractions(data);
-      } catch (error) {
-        console.error("Error fetching interactions:", error.message);
-      } finally {
-        setLoading(false);
-      }
-    };
-    loadInteractions();
-  }, []);
-
   if (loading) {
     return <Loader />;
   }
@@ -110,6 +102,14 @@ function InteractionList() {
           </TableBody>
         </Table>
       </TableContainer>
+      {hasMore && (
+        <Box
+          ref={sentinelRef}
+          sx={{ display: "flex", justifyContent: "center", py: 2 }}
+        >
+          <CircularProgress size={24} />
+        </Box>
+      )}
     </Container>
   );
 }
@@ -1,9 +1,5 @@
 import { useEffect, useState } from "react";
-import {
-  getAverageInteractionDurationAllRestaurants,
-  getUnderperformingRestaurants,
-  getPerformanceScores,
-} from "../utils/apis";
+import { getDashboard } from "../utils/apis";
 
 import { Container, Typography, Divider, Paper, Grid } from "@mui/material";
 import Loader from "./Loader";
@@ -47,14 +43,13 @@ const Metrics = () => {
   useEffect(() => {
     const fetchMetrics = async () => {
       try {
-        const averageInteractionData =
-          await getAverageInteractionDurationAllRestaurants();
-        const underperformingData = await getUnderperformingRestaurants();
-        const performanceData = await getPerformanceScores();
-
-        setAverageInteractionDurationAllRestaurants(averageInteractionData);
-        setUnderperformingRestaurants(underperformingData);
-        setPerformanceScores(performanceData);
+        const dashboard = await getDashboard();
+
+        setAverageInteractionDurationAllRestaurants(
+          dashboard.average_interaction_duration
+        );
+        setUnderperformingRestaurants(dashboard.underperforming);
+        setPerformanceScores(dashboard.performance_scores);
       } catch (error) {
         console.error("Error fetching metrics:", error);
       } finally {
@@ -1,4 +1,3 @@
-import { useEffect, useState } from "react";
 import { Link as RouterLink } from "react-router-dom";
 import {
   Container,
@@ -11,17 +10,24 @@ import {
   TableHead,
   TableRow,
   Box,
+  CircularProgress,
   Paper,
   IconButton,
   Tooltip,
 } from "@mui/material";
 import { Edit, Delete } from "@mui/icons-material";
 import Loader from "./Loader";
+import { useInfiniteList } from "../hooks/useInfiniteList";
 import { fetchRestaurants, deleteRestaurant } from "../utils/apis";
 
 function RestaurantList() {
-  const [restaurants, setRestaurants] = useState([]);
-  const [loading, setLoading] = useState(true);
+  const {
+    items: restaurants,
+    setItems: setRestaurants,
+    loading,
+    hasMore,
+    sentinelRef,
+  } = useInfiniteList(fetchRestaurants);
 
   const handleDelete = async (id) => {
     if (window.confirm("Are you sure you want to delete this restaurant?")) {
@@ -34,21 +40,6 @@ function RestaurantList() {
     }
   };
 
-  useEffect(() => {
-    const loadRestaurants = async () => {
-      try {
-        const data = await fetchRestaurants();
-        setRestaurants(data);
-      } catch (error) {
-        console.error("Error fetching restaurants:", error.message);
-      } finally {
-        setLoading(false);
-      }
-    };
-
-    loadRestaurants();
-  }, []);
-
   const trimText = (text, length = 30) => {
     if (!text) return "N/A";
     return text.length > length ? `${text.slice(0, length)}...` : text;
@@ -120,6 +111,14 @@ function RestaurantList() {
           </TableBody>
         </Table>
       </TableContainer>
+      {hasMore && (
+        <Box
+          ref={sentinelRef}
+          sx={{ display: "flex", justifyContent: "center", py: 2 }}
+        >
+          <CircularProgress size={24} />
+        </Box>
+      )}
     </Container>
   );
 }
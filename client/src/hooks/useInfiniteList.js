@@ -0,0 +1,47 @@
+import { useCallback, useEffect, useRef, useState } from "react";
+
+export function useInfiniteList(fetchPage, pageSize = 50) {
+  const [items, setItems] = useState([]);
+  const [cursor, setCursor] = useState(null);
+  const [hasMore, setHasMore] = useState(true);
+  const [loading, setLoading] = useState(true);
+  const loadingRef = useRef(false);
+  const sentinelRef = useRef(null);
+
+  const loadMore = useCallback(async () => {
+    if (loadingRef.current || !hasMore) return;
+    loadingRef.current = true;
+    try {
+      const page = await fetchPage({ cursor, limit: pageSize });
+      setItems((prev) => [...prev, ...page.items]);
+      setCursor(page.next_cursor);
+      setHasMore(Boolean(page.next_cursor));
+    } catch (error) {
+      console.error("Error fetching page:", error.message);
+      setHasMore(false);
+    } finally {
+      loadingRef.current = false;
+      setLoading(false);
+    }
+  }, [fetchPage, cursor, hasMore, pageSize]);
+
+  useEffect(() => {
+    if (items.length === 0 && hasMore) {
+      loadMore();
+    }
+  }, [items.length, hasMore, loadMore]);
+
+  useEffect(() => {
+    const sentinel = sentinelRef.current;
+    if (!sentinel || !hasMore) return;
+    const observer = new IntersectionObserver((entries) => {
+      if (entries[0].isIntersecting) {
+        loadMore();
+      }
+    });
+    observer.observe(sentinel);
+    return () => observer.disconnect();
+  }, [loadMore, hasMore, loading]);
+
+  return { items, setItems, loading, hasMore, sentinelRef };
+}
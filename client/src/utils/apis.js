@@ -8,16 +8,41 @@ const getAuthHeaders = () => {
   };
 };
 
-export const fetchRestaurants = async () => {
-  const response = await fetch(`${SERVER_URL}/api/restaurants`, {
+const buildQuery = (params = {}) => {
+  const query = new URLSearchParams();
+  Object.entries(params).forEach(([key, value]) => {
+    if (value !== undefined && value !== null && value !== "") {
+      query.append(key, value);
+    }
+  });
+  const queryString = query.toString();
+  return queryString ? `?${queryString}` : "";
+};
+
+const fetchPage = async (path, params, errorMessage) => {
+  const response = await fetch(`${SERVER_URL}${path}${buildQuery(params)}`, {
     headers: getAuthHeaders(),
   });
   if (!response.ok) {
-    throw new Error("Failed to fetch restaurants");
+    throw new Error(errorMessage);
   }
   return await response.json();
 };
 
+const fetchAllPages = async (path, errorMessage) => {
+  const items = [];
+  let cursor = null;
+  do {
+    const page = await fetchPage(path, { cursor, limit: 500 }, errorMessage);
+    items.push(...page.items);
+    cursor = page.next_cursor;
+  } while (cursor);
+  return items;
+};
+
+export const fetchRestaurants = async (params) =>
+  fetchPage("/api/restaurants", params, "Failed to fetch restaurants");
+
 export const deleteRestaurant = async (id) => {
   const response = await fetch(`${SERVER_URL}/api/restaurants/${id}`, {
     method: "DELETE",
@@ -41,6 +66,17 @@ export const getAverageInteractionDuration = async (restaurantId) => {
   return await response.json();
 };
 
+export const getDashboard = async (panels) => {
+  const query = buildQuery({ panels: panels?.join(",") });
+  const response = await fetch(`${SERVER_URL}/api/dashboard${query}`, {
+    headers: getAuthHeaders(),
+  });
+  if (!response.ok) {
+    throw new Error("Failed to fetch dashboard");
+  }
+  return await response.json();
+};
+
 export const getAverageInteractionDurationAllRestaurants = async () => {
   const response = await fetch(
     `${SERVER_URL}/api/restaurants/average_interaction_duration`,
@@ -82,15 +118,8 @@ export const getPerformanceScores = async () => {
   return await response.json();
 };
 
-export const fetchInteractions = async () => {
-  const response = await fetch(`${SERVER_URL}/api/interactions`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch interactions");
-  }
-  return await response.json();
-};
+export const fetchInteractions = async (params) =>
+  fetchPage("/api/interactions", params, "Failed to fetch interactions");
 
 export const deleteInteraction = async (id) => {
   const response = await fetch(`${SERVER_URL}/api/interactions/${id}`, {
@@ -102,15 +131,8 @@ export const deleteInteraction = async (id) => {
   }
 };
 
-export const fetchContacts = async () => {
-  const response = await fetch(`${SERVER_URL}/api/contacts`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch contacts");
-  }
-  return await response.json();
-};
+export const fetchContacts = async (params) =>
+  fetchPage("/api/contacts", params, "Failed to fetch contacts");
 
 export const deleteContact = async (id) => {
   const response = await fetch(`${SERVER_URL}/api/contacts/${id}`, {
@@ -214,25 +236,11 @@ export const fetchContactById = async (id) => {
   return await response.json();
 };
 
-export const fetchAllRestaurants = async () => {
-  const response = await fetch(`${SERVER_URL}/api/restaurants`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch restaurants");
-  }
-  return await response.json();
-};
+export const fetchAllRestaurants = async () =>
+  fetchAllPages("/api/restaurants", "Failed to fetch restaurants");
 
-export const fetchAllContacts = async () => {
-  const response = await fetch(`${SERVER_URL}/api/contacts`, {
-    headers: getAuthHeaders(),
-  });
-  if (!response.ok) {
-    throw new Error("Failed to fetch contacts");
-  }
-  return await response.json();
-};
+export const fetchAllContacts = async () =>
+  fetchAllPages("/api/contacts", "Failed to fetch contacts");
 
 export const fetchInteractionById = async (id) => {
   const response = await fetch(`${SERVER_URL}/api/interactions/${id}`, {
@@ -244,10 +252,13 @@ export const fetchInteractionById = async (id) => {
   return await response.json();
 };
 
-export const fetchRestaurantById = async (id) => {
-  const response = await fetch(`${SERVER_URL}/api/restaurants/${id}`, {
-    headers: getAuthHeaders(),
-  });
+export const fetchRestaurantById = async (id, include = "") => {
+  const response = await fetch(
+    `${SERVER_URL}/api/restaurants/${id}?include=${include}`,
+    {
+      headers: getAuthHeaders(),
+    }
+  );
   if (!response.ok) {
     throw new Error("Failed to fetch restaurant");
   }
@@ -1,60 +1,138 @@
 import os
+import click
+from datetime import datetime
 from dotenv import load_dotenv
 from flask import Flask, app, current_app, jsonify
 from flask_cors import CORS
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from logging.handlers import RotatingFileHandler
 import logging
+import threading
 import traceback
 from lib.config import Config
+from lib.json_provider import OrjsonProvider
 from db.models import db
-from lib.extensions import cache, jwt, redis_client
-from routes.restaurants import restaurant_bp
+from lib.extensions import cache, jwt, redis_pool
+from lib.pools import engine_options
+from lib.metrics import init_metrics
+from lib.query_guard import init_query_guard
+from routes.restaurants import restaurant_bp, warm_analytics_cache
 from routes.contacts import contact_bp
 from routes.interactions import interaction_bp
 from routes.users import user_bp, fetch_users
 from routes.health import health_bp
-from apscheduler.schedulers.background import BackgroundScheduler
-from lib.utils import configure_scheduler
+from routes.exports import export_bp
+from routes.deletes import delete_bp
+from routes.metrics import metrics_bp
+from routes.calls import call_bp
+from routes.analytics import analytics_bp
+from lib.scheduler import LeasedScheduler
+from lib.utils import ping_server
+from lib.commands import register_commands
 
 load_dotenv()
 
+_startup_lock = threading.Lock()
+
 
 def configure_scheduler_for_db(app):
-    scheduler = BackgroundScheduler()
+    scheduler = LeasedScheduler(app, redis_pool.client)
+    scheduler.add_job(
+        func=ping_server,
+        trigger="interval",
+        minutes=10,
+        id="ping_server_job",
+        max_instances=1,
+    )
     scheduler.add_job(
         func=lambda: fetch_users(app),
         trigger="interval",
         hours=24,
         id="fetch_users_job",
-        replace_existing=True,
         max_instances=3
     )
+    # Runs once at startup, then recomputes only the payloads whose tags
+    # changed since the last run, so bursts of writes are coalesced into at
+    # most one recompute per interval.
+    scheduler.add_job(
+        func=lambda: warm_analytics_cache(app),
+        trigger="interval",
+        seconds=app.config["CACHE_WARM_INTERVAL"],
+        next_run_time=datetime.now(),
+        id="warm_analytics_cache_job",
+        max_instances=1,
+        coalesce=True,
+    )
     scheduler.start()
+    app.extensions["leased_scheduler"] = scheduler
+
+def start_background_services(app):
+    """Start the scheduler and check Redis, once per process."""
+    with _startup_lock:
+        if "leased_scheduler" in app.extensions:
+            return
+        try:
+            redis_pool.client.ping()
+            print("Redis connection successful")
+        except Exception as e:
+            print(f"Error connecting to Redis: {str(e)}")
+        configure_scheduler_for_db(app)
+
+
+def reset_after_fork(app):
+    # Sockets opened in the parent (gunicorn --preload) must not be shared
+    # with the workers: drop them without closing, so the parent's copies
+    # stay intact, and let each worker open its own.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+    redis_pool.pool.reset()
+    # A scheduler started in the parent (LAZY_STARTUP=false with preloading)
+    # is inherited without its threads; drop it so the worker starts its own.
+    app.extensions.pop("leased_scheduler", None)
+    start_background_services(app)
+
 
 def create_app():
     app = Flask("KAM")
     app.config.from_object(Config)
+    app.json = OrjsonProvider(app)
+    app.config.setdefault("SQLALCHEMY_ENGINE_OPTIONS", engine_options(app.config))
 
     db.init_app(app)
     jwt.init_app(app)
+    redis_pool.init_app(app)
     cache.init_app(app)
-    Migrate(app, db)
+    # Only the flask CLI needs `flask db`; web workers skip importing alembic.
+    if click.get_current_context(silent=True) is not None:
+        from flask_migrate import Migrate
+
+        Migrate(app, db)
+    register_commands(app)
+    init_metrics(app)
+    init_query_guard(app)
     CORS(app)
-    configure_scheduler(app)
-    configure_scheduler_for_db(app)
-    try:
-        redis_client.ping()
-        print("Redis connection successful")
-    except Exception as e:
-        print(f"Error connecting to Redis: {str(e)}")
+    if app.config["LAZY_STARTUP"]:
+        # Deferred to the first request (or gunicorn's post_fork hook), so
+        # importing the app for CLI commands, migrations or a preloading
+        # master starts no threads and opens no connections.
+        @app.before_request
+        def start_on_first_request():
+            if "leased_scheduler" not in app.extensions:
+                start_background_services(app)
+    else:
+        start_background_services(app)
 
     app.register_blueprint(restaurant_bp, url_prefix="/api")
     app.register_blueprint(contact_bp, url_prefix="/api")
     app.register_blueprint(interaction_bp, url_prefix="/api")
     app.register_blueprint(user_bp, url_prefix="/api")
     app.register_blueprint(health_bp, url_prefix="/api")
+    app.register_blueprint(export_bp, url_prefix="/api")
+    app.register_blueprint(delete_bp, url_prefix="/api")
+    app.register_blueprint(metrics_bp, url_prefix="/api")
+    app.register_blueprint(call_bp, url_prefix="/api")
+    app.register_blueprint(analytics_bp, url_prefix="/api")
 
     @app.route("/", methods=["GET"])
     def hello_world():
@@ -84,6 +162,16 @@ def configure_logger(app):
         return jsonify({"error": "An internal error occurred"}), 500
 
 
+def __getattr__(name):
+    # `gunicorn app:flask_app` keeps working, but the app is only built when
+    # something asks for it rather than on import.
+    global flask_app
+    if name == "flask_app":
+        flask_app = create_app()
+        return flask_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 if __name__ == "__main__":
     flask_app = create_app()
     with flask_app.app_context():
@@ -91,6 +179,3 @@ if __name__ == "__main__":
     debug_mode = os.getenv("DEBUG", "True").lower() == "true"
     port = int(os.getenv("PORT", 5000))
     flask_app.run(host="0.0.0.0", port=port, debug=debug_mode)
-
-
-flask_app = create_app()
@@ -0,0 +1,237 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy import case, func, select
+from db.models import (
+    db,
+    Restaurant,
+    RestaurantStats,
+    RestaurantStatus,
+    InteractionRollup,
+    is_underperforming,
+    performance_score,
+)
+from db.calls import overdue_before
+from db.stats import COUNTER_COLUMNS, OUTCOME_COLUMNS
+
+
+# Set-based counterparts of the per-row Restaurant metric methods. Metrics are
+# read from the precomputed restaurant_stats rows (see db/stats.py), so the
+# cost is one query over restaurants regardless of how many interactions exist.
+
+
+def restaurant_metrics():
+    return (
+        db.session.query(
+            Restaurant.id,
+            Restaurant.name,
+            Restaurant.revenue,
+            func.coalesce(RestaurantStats.interaction_count, 0).label(
+                "total_interactions"
+            ),
+            RestaurantStats.last_interaction_date,
+            (
+                RestaurantStats.duration_sum
+                * 1.0
+                / func.nullif(RestaurantStats.duration_count, 0)
+            ).label("average_interaction_duration"),
+        )
+        .outerjoin(RestaurantStats, RestaurantStats.restaurant_id == Restaurant.id)
+        .order_by(Restaurant.id)
+        .all()
+    )
+
+
+def performance_scores(rows=None):
+    rows = restaurant_metrics() if rows is None else rows
+    return [
+        {
+            "id": r.id,
+            "name": r.name,
+            "performance_score": str(
+                performance_score(
+                    r.total_interactions, r.revenue, r.last_interaction_date
+                )
+            ).split(".")[0],
+        }
+        for r in rows
+    ]
+
+
+def underperforming_restaurants(rows=None, now=None):
+    rows = restaurant_metrics() if rows is None else rows
+    now = now or datetime.utcnow()
+    return [
+        {
+            "id": r.id,
+            "name": r.name,
+            "last_interaction_date": (
+                r.last_interaction_date.isoformat()
+                if r.last_interaction_date
+                else None
+            ),
+            "time_since_last_interaction": (
+                (now - r.last_interaction_date).days
+                if r.last_interaction_date
+                else None
+            ),
+            "revenue": r.revenue,
+        }
+        for r in rows
+        if is_underperforming(r.last_interaction_date, r.revenue, now)
+    ]
+
+
+def average_interaction_durations(rows=None):
+    rows = restaurant_metrics() if rows is None else rows
+    return [
+        {
+            "id": r.id,
+            "name": r.name,
+            "average_interaction_duration": str(
+                r.average_interaction_duration or 0
+            ).split(".")[0],
+        }
+        for r in rows
+    ]
+
+
+DASHBOARD_PANELS = {
+    "average_interaction_duration": average_interaction_durations,
+    "underperforming": underperforming_restaurants,
+    "performance_scores": performance_scores,
+}
+
+
+def dashboard():
+    rows = restaurant_metrics()
+    return {name: build(rows) for name, build in DASHBOARD_PANELS.items()}
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+CENTS = Decimal("0.01")
+
+
+def kam_portfolios(kam_ids, now=None):
+    """Portfolio totals of each KAM in ``kam_ids`` from one query grouped by
+    ``assigned_kam_id``; interaction volume comes from restaurant_stats.
+    Overdue calls are counted as in the due-call queue (routes/calls.py).
+    """
+    statuses = list(RestaurantStatus)
+    rows = db.session.execute(
+        select(
+            Restaurant.assigned_kam_id,
+            func.count(Restaurant.id),
+            *[_count_where(Restaurant.status == status) for status in statuses],
+            func.coalesce(func.sum(Restaurant.revenue), 0),
+            func.coalesce(func.sum(RestaurantStats.interaction_count), 0),
+            _count_where(Restaurant.next_call_due_at < overdue_before(now)),
+        )
+        .outerjoin(RestaurantStats, RestaurantStats.restaurant_id == Restaurant.id)
+        .where(Restaurant.assigned_kam_id.in_(kam_ids))
+        .group_by(Restaurant.assigned_kam_id)
+    ).all()
+    totals = {row[0]: row[1:] for row in rows}
+    empty = (0,) * (len(statuses) + 4)
+    portfolios = {}
+    for kam_id in kam_ids:
+        restaurants, *by_status, revenue, interactions, overdue = totals.get(
+            kam_id, empty
+        )
+        portfolios[kam_id] = {
+            "kam_id": kam_id,
+            "restaurants": restaurants,
+            "by_status": {
+                status.value: count for status, count in zip(statuses, by_status)
+            },
+            "total_revenue": Decimal(revenue).quantize(CENTS),
+            "interactions": interactions,
+            "overdue_calls": overdue,
+        }
+    return portfolios
+
+
+def _period_start(day, granularity):
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+TIMESERIES_GRANULARITIES = ("day", "week", "month")
+
+
+def interaction_timeseries(
+    start,
+    end,
+    granularity="day",
+    restaurant_id=None,
+    kam_id=None,
+    interaction_type=None,
+    by_type=False,
+):
+    """Interaction counts, outcome mix and durations per day, week (starting
+    Monday) or month between the ``start`` and ``end`` dates, inclusive.
+
+    Reads interaction_rollups, already summed per day, so the cost follows the
+    number of days and restaurants in range rather than of interactions.
+    """
+    if granularity not in TIMESERIES_GRANULARITIES:
+        raise ValueError(f"Invalid granularity: {granularity}")
+    dimensions = [InteractionRollup.day]
+    if by_type:
+        dimensions.append(InteractionRollup.type)
+    query = (
+        select(
+            *dimensions,
+            *[
+                func.sum(getattr(InteractionRollup, column))
+                for column in COUNTER_COLUMNS
+            ],
+        )
+        .where(InteractionRollup.day >= start, InteractionRollup.day <= end)
+        .group_by(*dimensions)
+        .order_by(*dimensions)
+    )
+    if restaurant_id is not None:
+        query = query.where(InteractionRollup.restaurant_id == restaurant_id)
+    if kam_id is not None:
+        query = query.where(
+            InteractionRollup.restaurant_id.in_(
+                select(Restaurant.id).where(Restaurant.assigned_kam_id == kam_id)
+            )
+        )
+    if interaction_type is not None:
+        query = query.where(InteractionRollup.type == interaction_type)
+
+    buckets = {}
+    for row in db.session.execute(query):
+        period = _period_start(row[0], granularity)
+        key = (period, row[1].value) if by_type else (period,)
+        counters = buckets.setdefault(key, dict.fromkeys(COUNTER_COLUMNS, 0))
+        for column, value in zip(COUNTER_COLUMNS, row[len(dimensions) :]):
+            counters[column] += value
+
+    series = []
+    for key, counters in sorted(buckets.items()):
+        point = {"period": key[0].isoformat()}
+        if by_type:
+            point["type"] = key[1]
+        point.update(
+            interactions=counters["interaction_count"],
+            total_duration_minutes=counters["duration_sum"],
+            average_duration_minutes=(
+                counters["duration_sum"] / counters["duration_count"]
+                if counters["duration_count"]
+                else None
+            ),
+            outcomes={
+                outcome.value: counters[column]
+                for outcome, column in OUTCOME_COLUMNS.items()
+            },
+        )
+        series.append(point)
+    return series
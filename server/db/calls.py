@@ -0,0 +1,239 @@
+from datetime import datetime, timedelta
+from sqlalchemy import bindparam, event, func, inspect, select
+from db.models import (
+    db,
+    Restaurant,
+    Interaction,
+    InteractionType,
+    RestaurantStatus,
+    CallFrequency,
+)
+from db.stats import interaction_snapshot
+
+restaurants_table = Restaurant.__table__
+
+CALL_ATTRS = ("restaurant_id", "type", "interaction_date")
+
+CALL_INTERVALS = {
+    CallFrequency.DAILY: timedelta(days=1),
+    CallFrequency.WEEKLY: timedelta(days=7),
+    CallFrequency.MONTHLY: timedelta(days=30),
+}
+
+
+def next_call_due(call_frequency, last_call_date, status, created_at=None):
+    """When the next call to a restaurant is due, or ``None`` for lost ones.
+
+    A restaurant that was never called is due from the moment it was added.
+    """
+    if status == RestaurantStatus.LOST:
+        return None
+    if last_call_date is None:
+        return created_at or datetime.utcnow()
+    # Unset enums fall back to the column defaults, as they will on insert.
+    return last_call_date + CALL_INTERVALS[call_frequency or CallFrequency.WEEKLY]
+
+
+def overdue_before(now=None):
+    """Calls due before the start of today are overdue; the rest of today's
+    queue is merely due.
+    """
+    now = now or datetime.utcnow()
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def schedule_rows(rows):
+    """Fill ``next_call_due_at`` on restaurant rows inserted through Core."""
+    for row in rows:
+        row["next_call_due_at"] = next_call_due(
+            row.get("call_frequency"),
+            row.get("last_call_date"),
+            row.get("status"),
+            row.get("created_at"),
+        )
+    return rows
+
+
+@event.listens_for(Restaurant, "before_insert")
+@event.listens_for(Restaurant, "before_update")
+def _schedule_next_call(mapper, connection, restaurant):
+    # The column default only fills created_at in the INSERT itself, too late
+    # for a restaurant that is due from the moment it was added.
+    if restaurant.created_at is None:
+        restaurant.created_at = datetime.utcnow()
+    restaurant.next_call_due_at = next_call_due(
+        restaurant.call_frequency,
+        restaurant.last_call_date,
+        restaurant.status,
+        restaurant.created_at,
+    )
+
+
+def _changed_calls(session):
+    # Calls that were deleted or edited, by restaurant and previous date:
+    # a restaurant whose last_call_date one of them set moves back to its
+    # latest remaining call after the flush. Edits that turn an interaction
+    # into a call, or move a call, can also move a restaurant forward.
+    removed, changed = {}, set()
+    for obj in session.deleted:
+        if isinstance(obj, Interaction):
+            previous = interaction_snapshot(obj, inspect(obj), CALL_ATTRS, previous=True)
+            if previous["type"] == InteractionType.CALL:
+                removed.setdefault(previous["restaurant_id"], set()).add(
+                    previous["interaction_date"]
+                )
+    for obj in session.dirty:
+        if not isinstance(obj, Interaction) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        previous = interaction_snapshot(obj, state, CALL_ATTRS, previous=True)
+        current = interaction_snapshot(obj, state, CALL_ATTRS)
+        if previous == current:
+            continue
+        if previous["type"] == InteractionType.CALL:
+            removed.setdefault(previous["restaurant_id"], set()).add(
+                previous["interaction_date"]
+            )
+        if current["type"] == InteractionType.CALL:
+            changed.add(current["restaurant_id"])
+    removed.pop(None, None)
+    changed.discard(None)
+    return removed, changed
+
+
+@event.listens_for(db.session, "before_flush")
+def _record_logged_calls(session, flush_context, instances):
+    removed, changed = _changed_calls(session)
+    removed_calls = session.info.setdefault("removed_calls", {})
+    for restaurant_id, dates in removed.items():
+        removed_calls.setdefault(restaurant_id, set()).update(dates)
+    session.info.setdefault("call_restaurant_ids", set()).update(changed)
+    # Logging a call moves the restaurant's last_call_date forward; the
+    # before_update hook above then reschedules it in the same flush.
+    latest = {}
+    for obj in session.new:
+        if (
+            isinstance(obj, Interaction)
+            and obj.type == InteractionType.CALL
+            and obj.restaurant_id is not None
+            and obj.interaction_date is not None
+        ):
+            previous = latest.get(obj.restaurant_id)
+            if previous is None or obj.interaction_date > previous:
+                latest[obj.restaurant_id] = obj.interaction_date
+    if not latest:
+        return
+    with session.no_autoflush:
+        for restaurant_id, called_at in latest.items():
+            restaurant = session.get(Restaurant, restaurant_id)
+            if restaurant is None:
+                continue
+            if restaurant.last_call_date is None or restaurant.last_call_date < called_at:
+                restaurant.last_call_date = called_at
+
+
+@event.listens_for(db.session, "after_flush")
+def _recompute_changed_calls(session, flush_context):
+    removed_calls = session.info.pop("removed_calls", {})
+    restaurant_ids = session.info.pop("call_restaurant_ids", set()) | set(removed_calls)
+    if not restaurant_ids:
+        return
+    record_calls(restaurant_ids, session.connection(), removed_calls)
+    # The update above bypassed the ORM; reload the loaded restaurants.
+    mapper = inspect(Restaurant)
+    for restaurant_id in restaurant_ids:
+        key = mapper.identity_key_from_primary_key((restaurant_id,))
+        restaurant = session.identity_map.get(key)
+        if restaurant is not None:
+            session.expire(restaurant, ["last_call_date", "next_call_due_at"])
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_changed_calls(session):
+    session.info.pop("removed_calls", None)
+    session.info.pop("call_restaurant_ids", None)
+
+
+def last_calls_among(criterion, connection=None):
+    """The CALL interactions matching ``criterion`` that set their
+    restaurant's ``last_call_date``, as ``{restaurant_id: {date}}``; pass it
+    to ``record_calls`` once they are deleted through Core.
+    """
+    connection = connection or db.session.connection()
+    rows = connection.execute(
+        select(Interaction.restaurant_id, Interaction.interaction_date)
+        .join(Restaurant, Restaurant.id == Interaction.restaurant_id)
+        .where(
+            criterion,
+            Interaction.type == InteractionType.CALL,
+            Interaction.interaction_date == Restaurant.last_call_date,
+        )
+        .distinct()
+    )
+    removed_calls = {}
+    for restaurant_id, called_at in rows:
+        removed_calls.setdefault(restaurant_id, set()).add(called_at)
+    return removed_calls
+
+
+def record_calls(restaurant_ids, connection=None, removed_calls=None):
+    """Catch ``last_call_date`` and ``next_call_due_at`` up with CALL
+    interactions inserted through Core statements, which skip the flush
+    events.
+
+    ``removed_calls`` maps restaurant ids to the previous dates of calls that
+    were edited or deleted. A restaurant whose ``last_call_date`` is one of
+    them moves back to its latest remaining call; a date no call set, such
+    as one entered by hand, only ever moves forward, and one whose calls
+    are all gone is kept.
+    """
+    removed_calls = removed_calls or {}
+    restaurant_ids = list(restaurant_ids)
+    if not restaurant_ids:
+        return
+    connection = connection or db.session.connection()
+    latest_call = (
+        select(func.max(Interaction.interaction_date))
+        .where(
+            Interaction.restaurant_id == Restaurant.id,
+            Interaction.type == InteractionType.CALL,
+        )
+        .scalar_subquery()
+    )
+    rows = connection.execute(
+        select(
+            Restaurant.id,
+            Restaurant.call_frequency,
+            Restaurant.last_call_date,
+            Restaurant.status,
+            Restaurant.created_at,
+            latest_call,
+        ).where(Restaurant.id.in_(restaurant_ids))
+    ).all()
+    updates = []
+    for restaurant_id, frequency, last_call_date, status, created_at, called_at in rows:
+        if called_at is None or called_at == last_call_date:
+            continue
+        if not (
+            last_call_date is None
+            or last_call_date < called_at
+            or last_call_date in removed_calls.get(restaurant_id, ())
+        ):
+            continue
+        updates.append(
+            {
+                "restaurant_id": restaurant_id,
+                "called_at": called_at,
+                "due_at": next_call_due(frequency, called_at, status, created_at),
+            }
+        )
+    if updates:
+        connection.execute(
+            restaurants_table.update()
+            .where(restaurants_table.c.id == bindparam("restaurant_id"))
+            .values(
+                last_call_date=bindparam("called_at"),
+                next_call_due_at=bindparam("due_at"),
+            ),
+            updates,
+        )
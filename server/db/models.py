@@ -13,6 +13,33 @@ UserRole = enums.UserRole
 PreferredContactMethod = enums.PreferredContactMethod
 
 
+def is_underperforming(last_interaction_date, revenue, now=None):
+    if not last_interaction_date:
+        return True
+    now = now or datetime.utcnow()
+    time_since_last_interaction = (now - last_interaction_date).days
+    if time_since_last_interaction > 30 or (revenue or 0) < 1000:
+        return True
+
+    return False
+
+
+def performance_score(total_interactions, revenue, last_interaction_date):
+    interaction_weight = 0.4
+    revenue_weight = 0.4
+    engagement_weight = 0.2
+
+    interaction_score = total_interactions
+    revenue_score = float(revenue) / 1000 if revenue else 0
+    engagement_score = 1 if last_interaction_date else 0
+
+    return (
+        (interaction_score * interaction_weight)
+        + (revenue_score * revenue_weight)
+        + (engagement_score * engagement_weight)
+    )
+
+
 class User(db.Model):
     __tablename__ = "users"
     id = db.Column(db.Integer, primary_key=True)
@@ -37,6 +64,16 @@ class User(db.Model):
 
 class Restaurant(db.Model):
     __tablename__ = "restaurants"
+    __table_args__ = (
+        # Serves the per-KAM due-call queue (see db/calls.py) as well as
+        # plain lookups by KAM.
+        db.Index(
+            "ix_restaurants_assigned_kam_id_next_call_due_at_id",
+            "assigned_kam_id",
+            "next_call_due_at",
+            "id",
+        ),
+    )
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     address = db.Column(db.String(200))
@@ -47,6 +84,7 @@ class Restaurant(db.Model):
         db.Enum(CallFrequency), default=CallFrequency.WEEKLY, nullable=False
     )
     last_call_date = db.Column(db.DateTime, nullable=True)
+    next_call_due_at = db.Column(db.DateTime, nullable=True)
     revenue = db.Column(Numeric(12, 2), nullable=True)
     notes = db.Column(db.Text)
 
@@ -55,7 +93,10 @@ class Restaurant(db.Model):
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
 
-    assigned_kam_id = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
+    assigned_kam_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True),
+        active_history=True,
+    )
     assigned_kam = db.relationship("User", back_populates="restaurants", lazy=True)
 
     contacts = db.relationship("Contact", back_populates="restaurant", lazy=True)
@@ -89,35 +130,19 @@ class Restaurant(db.Model):
         return self.revenue or 0
 
     def is_underperforming(self):
-        recent_interaction = self.last_interaction_date()
-        if not recent_interaction:
-            return True
-        time_since_last_interaction = (datetime.utcnow() - recent_interaction).days
-        if time_since_last_interaction > 30 or self.total_revenue() < 1000:
-            return True
-
-        return False
+        return is_underperforming(self.last_interaction_date(), self.total_revenue())
 
     def performance_score(self):
-        interaction_weight = 0.4
-        revenue_weight = 0.4
-        engagement_weight = 0.2
-
-        interaction_score = self.total_interactions()
-        revenue_score = (
-            float(self.total_revenue()) / 1000 if self.total_revenue() else 0
-        ) 
-        engagement_score = 1 if self.last_interaction_date() else 0
-
-        return (
-            (interaction_score * interaction_weight)
-            + (revenue_score * revenue_weight)
-            + (engagement_score * engagement_weight)
+        return performance_score(
+            self.total_interactions(),
+            self.total_revenue(),
+            self.last_interaction_date(),
         )
 
 
 class Contact(db.Model):
     __tablename__ = "contacts"
+    __table_args__ = (db.Index("ix_contacts_restaurant_id", "restaurant_id"),)
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     role = db.Column(db.String(100), nullable=False)
@@ -126,8 +151,9 @@ class Contact(db.Model):
     preferred_contact_method = db.Column(db.Enum(PreferredContactMethod))
     time_zone = db.Column(db.String(50))
 
-    restaurant_id = db.Column(
-        db.Integer, db.ForeignKey("restaurants.id"), nullable=False
+    restaurant_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("restaurants.id"), nullable=False),
+        active_history=True,
     )
     restaurant = db.relationship("Restaurant", back_populates="contacts")
 
@@ -144,16 +170,41 @@ class Contact(db.Model):
 
 class Interaction(db.Model):
     __tablename__ = "interactions"
+    __table_args__ = (
+        db.Index(
+            "ix_interactions_restaurant_id_interaction_date_id",
+            "restaurant_id",
+            "interaction_date",
+            "id",
+        ),
+        db.Index(
+            "ix_interactions_contact_id_interaction_date_id",
+            "contact_id",
+            "interaction_date",
+            "id",
+        ),
+        db.Index("ix_interactions_interaction_date_id", "interaction_date", "id"),
+    )
     id = db.Column(db.Integer, primary_key=True)
-    interaction_date = db.Column(db.DateTime, nullable=False)
-    type = db.Column(db.Enum(InteractionType), nullable=False)
+    # The summary tables (db/stats.py, db/rollups.py), the call schedule and
+    # the cache tags need the previous value of these columns, so it is
+    # loaded before they are changed on an expired instance.
+    interaction_date = db.column_property(
+        db.Column(db.DateTime, nullable=False), active_history=True
+    )
+    type = db.column_property(
+        db.Column(db.Enum(InteractionType), nullable=False), active_history=True
+    )
     details = db.Column(db.Text)
-    outcome = db.Column(db.Enum(InteractionOutcome))
-    duration_minutes = db.Column(db.Integer)
+    outcome = db.column_property(
+        db.Column(db.Enum(InteractionOutcome)), active_history=True
+    )
+    duration_minutes = db.column_property(db.Column(db.Integer), active_history=True)
 
     contact_id = db.Column(db.Integer, db.ForeignKey("contacts.id"), nullable=False)
-    restaurant_id = db.Column(
-        db.Integer, db.ForeignKey("restaurants.id"), nullable=False
+    restaurant_id = db.column_property(
+        db.Column(db.Integer, db.ForeignKey("restaurants.id"), nullable=False),
+        active_history=True,
     )
 
     contact = db.relationship("Contact", back_populates="interactions", lazy=True)
@@ -166,3 +217,47 @@ class Interaction(db.Model):
 
     def __repr__(self):
         return f"<Interaction {self.type.value} on {self.interaction_date}>"
+
+
+class RestaurantStats(db.Model):
+    __tablename__ = "restaurant_stats"
+    restaurant_id = db.Column(
+        db.Integer, db.ForeignKey("restaurants.id"), primary_key=True
+    )
+    interaction_count = db.Column(db.Integer, default=0, nullable=False)
+    duration_sum = db.Column(db.Integer, default=0, nullable=False)
+    duration_count = db.Column(db.Integer, default=0, nullable=False)
+    last_interaction_date = db.Column(db.DateTime, nullable=True)
+    successful_count = db.Column(db.Integer, default=0, nullable=False)
+    needs_follow_up_count = db.Column(db.Integer, default=0, nullable=False)
+    no_response_count = db.Column(db.Integer, default=0, nullable=False)
+    cancelled_count = db.Column(db.Integer, default=0, nullable=False)
+
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def __repr__(self):
+        return f"<RestaurantStats {self.restaurant_id}>"
+
+
+class InteractionRollup(db.Model):
+    __tablename__ = "interaction_rollups"
+    __table_args__ = (
+        db.Index("ix_interaction_rollups_restaurant_id_day", "restaurant_id", "day"),
+    )
+    day = db.Column(db.Date, primary_key=True)
+    restaurant_id = db.Column(
+        db.Integer, db.ForeignKey("restaurants.id"), primary_key=True
+    )
+    type = db.Column(db.Enum(InteractionType), primary_key=True)
+    interaction_count = db.Column(db.Integer, default=0, nullable=False)
+    duration_sum = db.Column(db.Integer, default=0, nullable=False)
+    duration_count = db.Column(db.Integer, default=0, nullable=False)
+    successful_count = db.Column(db.Integer, default=0, nullable=False)
+    needs_follow_up_count = db.Column(db.Integer, default=0, nullable=False)
+    no_response_count = db.Column(db.Integer, default=0, nullable=False)
+    cancelled_count = db.Column(db.Integer, default=0, nullable=False)
+
+    def __repr__(self):
+        return f"<InteractionRollup {self.day} {self.restaurant_id} {self.type.value}>"
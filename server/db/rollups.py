@@ -0,0 +1,194 @@
+from datetime import datetime, time, timedelta
+from sqlalchemy import and_, case, event, func, select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from db.models import db, Interaction, InteractionRollup
+from db.stats import (
+    COUNTER_COLUMNS,
+    OUTCOME_COLUMNS,
+    collect_interaction_deltas,
+    remove_rows_of_deleted_restaurants,
+)
+
+rollups_table = InteractionRollup.__table__
+
+UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+KEY_COLUMNS = ["day", "restaurant_id", "type"]
+
+
+def rollup_select(criterion=None):
+    day = func.date(Interaction.interaction_date)
+    query = (
+        select(
+            day,
+            Interaction.restaurant_id,
+            Interaction.type,
+            func.count(Interaction.id),
+            func.coalesce(func.sum(Interaction.duration_minutes), 0),
+            func.count(Interaction.duration_minutes),
+            *[
+                func.coalesce(
+                    func.sum(case((Interaction.outcome == outcome, 1), else_=0)), 0
+                )
+                for outcome in OUTCOME_COLUMNS
+            ],
+        )
+        .group_by(day, Interaction.restaurant_id, Interaction.type)
+    )
+    if criterion is not None:
+        query = query.where(criterion)
+    return query
+
+
+def _insert_from_select(connection, criterion=None):
+    connection.execute(
+        rollups_table.insert().from_select(
+            [*KEY_COLUMNS, *COUNTER_COLUMNS], rollup_select(criterion)
+        )
+    )
+
+
+def refresh_interaction_rollups(restaurant_ids, connection=None):
+    """Recompute the rollups of ``restaurant_ids`` after Core statements that
+    skip the flush events.
+    """
+    restaurant_ids = list(restaurant_ids)
+    if not restaurant_ids:
+        return
+    connection = connection or db.session.connection()
+    connection.execute(
+        rollups_table.delete().where(rollups_table.c.restaurant_id.in_(restaurant_ids))
+    )
+    _insert_from_select(connection, Interaction.restaurant_id.in_(restaurant_ids))
+
+
+def rebuild_interaction_rollups(since=None):
+    """Rebuild the rollups from the interactions, only for days from
+    ``since`` on when given.
+    """
+    connection = db.session.connection()
+    if since is None:
+        connection.execute(rollups_table.delete())
+        _insert_from_select(connection)
+    else:
+        connection.execute(rollups_table.delete().where(rollups_table.c.day >= since.date()))
+        _insert_from_select(connection, Interaction.interaction_date >= since)
+    db.session.commit()
+    return db.session.query(func.count()).select_from(InteractionRollup).scalar()
+
+
+SNAPSHOT_ATTRS = (
+    "restaurant_id",
+    "type",
+    "interaction_date",
+    "duration_minutes",
+    "outcome",
+)
+
+
+def _apply_snapshot(deltas, snapshot, sign):
+    if None in (
+        snapshot["restaurant_id"],
+        snapshot["type"],
+        snapshot["interaction_date"],
+    ):
+        return
+    key = (snapshot["interaction_date"].date(), snapshot["restaurant_id"], snapshot["type"])
+    counters = deltas.setdefault(key, dict.fromkeys(COUNTER_COLUMNS, 0))
+    counters["interaction_count"] += sign
+    if snapshot["duration_minutes"] is not None:
+        counters["duration_sum"] += sign * snapshot["duration_minutes"]
+        counters["duration_count"] += sign
+    if snapshot["outcome"] in OUTCOME_COLUMNS:
+        counters[OUTCOME_COLUMNS[snapshot["outcome"]]] += sign
+
+
+def _refresh_key(connection, day, restaurant_id, type_):
+    """Recompute one rollup row from the interactions, the way a rebuild
+    does, for dialects without an upsert.
+    """
+    start = datetime.combine(day, time.min)
+    connection.execute(
+        rollups_table.delete().where(
+            rollups_table.c.day == day,
+            rollups_table.c.restaurant_id == restaurant_id,
+            rollups_table.c.type == type_,
+        )
+    )
+    _insert_from_select(
+        connection,
+        and_(
+            Interaction.restaurant_id == restaurant_id,
+            Interaction.type == type_,
+            Interaction.interaction_date >= start,
+            Interaction.interaction_date < start + timedelta(days=1),
+        ),
+    )
+
+
+def _upsert(connection):
+    statement = UPSERT_INSERTS[connection.dialect.name](rollups_table)
+    # Adding to whatever is there makes the first interaction of a key safe
+    # under concurrency: the losing insert turns into the update.
+    return statement.on_conflict_do_update(
+        index_elements=KEY_COLUMNS,
+        set_={
+            name: rollups_table.c[name] + statement.excluded[name]
+            for name in COUNTER_COLUMNS
+        },
+    )
+
+
+def _apply_deltas(connection, deltas):
+    rows = [
+        {"day": day, "restaurant_id": restaurant_id, "type": type_, **counters}
+        for (day, restaurant_id, type_), counters in deltas.items()
+        if any(counters.values())
+    ]
+    if not rows:
+        return
+    # A stable key order keeps concurrent flushes from deadlocking.
+    rows.sort(key=lambda row: (row["day"], row["restaurant_id"], row["type"].name))
+    if connection.dialect.name not in UPSERT_INSERTS:
+        for row in rows:
+            _refresh_key(connection, row["day"], row["restaurant_id"], row["type"])
+        return
+    connection.execute(_upsert(connection), rows)
+    for row in rows:
+        if row["interaction_count"] < 0:
+            connection.execute(
+                rollups_table.delete().where(
+                    rollups_table.c.day == row["day"],
+                    rollups_table.c.restaurant_id == row["restaurant_id"],
+                    rollups_table.c.type == row["type"],
+                    rollups_table.c.interaction_count <= 0,
+                )
+            )
+
+
+def subtract_from_interaction_rollups(rows, connection=None):
+    """Take interactions deleted through Core statements out of the rollups;
+    ``rows`` map at least SNAPSHOT_ATTRS to the deleted values.
+    """
+    deltas = {}
+    for row in rows:
+        _apply_snapshot(deltas, row, -1)
+    if deltas:
+        _apply_deltas(connection or db.session.connection(), deltas)
+
+
+@event.listens_for(db.session, "before_flush")
+def _remove_rollups_of_deleted_restaurants(session, flush_context, instances):
+    session.info["rollup_deleted_restaurant_ids"] = remove_rows_of_deleted_restaurants(
+        session, rollups_table
+    )
+
+
+@event.listens_for(db.session, "after_flush")
+def _maintain_interaction_rollups(session, flush_context):
+    deleted_ids = session.info.pop("rollup_deleted_restaurant_ids", set())
+    deltas = collect_interaction_deltas(session, SNAPSHOT_ATTRS, _apply_snapshot)
+    deltas = {key: counters for key, counters in deltas.items() if key[1] not in deleted_ids}
+    if deltas:
+        _apply_deltas(session.connection(), deltas)
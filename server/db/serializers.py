@@ -0,0 +1,78 @@
+from functools import lru_cache
+from sqlalchemy import Date, DateTime, Enum, Numeric
+from db.models import Restaurant, Contact, Interaction, User
+
+RESTAURANT_FIELDS = (
+    "id",
+    "name",
+    "address",
+    "status",
+    "call_frequency",
+    "last_call_date",
+    "revenue",
+    "notes",
+)
+CONTACT_FIELDS = (
+    "id",
+    "name",
+    "role",
+    "email",
+    "phone",
+    "preferred_contact_method",
+    "time_zone",
+    "restaurant_id",
+)
+INTERACTION_FIELDS = (
+    "id",
+    "interaction_date",
+    "type",
+    "outcome",
+    "details",
+    "duration_minutes",
+    "restaurant_id",
+    "contact_id",
+)
+USER_FIELDS = ("id", "name", "email", "phone", "role", "created_at", "updated_at")
+
+DEFAULT_FIELDS = {
+    Restaurant: RESTAURANT_FIELDS,
+    Contact: CONTACT_FIELDS,
+    Interaction: INTERACTION_FIELDS,
+    User: USER_FIELDS,
+}
+
+
+def _conversion(column_type):
+    if isinstance(column_type, Enum):
+        return "{}.value"
+    if isinstance(column_type, (DateTime, Date)):
+        return "{}.isoformat()"
+    if isinstance(column_type, Numeric):
+        return "str({})"
+    return None
+
+
+@lru_cache(maxsize=None)
+def serializer(model, fields=None):
+    """Return a function turning a ``model`` instance, or any row with the
+    same attribute names, into a dict of ``fields``.
+
+    The function is generated once per model and field tuple, with the
+    enum, datetime and Decimal conversions inlined for each column.
+    """
+    fields = tuple(fields or DEFAULT_FIELDS[model])
+    columns = model.__table__.columns
+    lines = ["def serialize(obj):"]
+    items = []
+    for index, name in enumerate(fields):
+        conversion = _conversion(columns[name].type)
+        if conversion is None:
+            items.append(f"{name!r}: obj.{name}")
+        else:
+            lines.append(f"    v{index} = obj.{name}")
+            value = conversion.format(f"v{index}")
+            items.append(f"{name!r}: {value} if v{index} is not None else None")
+    lines.append("    return {" + ", ".join(items) + "}")
+    namespace = {}
+    exec(compile("\n".join(lines), f"<{model.__name__} serializer>", "exec"), namespace)
+    return namespace["serialize"]
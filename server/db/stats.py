@@ -0,0 +1,228 @@
+from datetime import datetime
+from sqlalchemy import case, event, func, inspect, select
+from db.models import db, Restaurant, Interaction, RestaurantStats, InteractionOutcome
+
+stats_table = RestaurantStats.__table__
+
+OUTCOME_COLUMNS = {
+    InteractionOutcome.SUCCESSFUL: "successful_count",
+    InteractionOutcome.NEEDS_FOLLOW_UP: "needs_follow_up_count",
+    InteractionOutcome.NO_RESPONSE: "no_response_count",
+    InteractionOutcome.CANCELLED: "cancelled_count",
+}
+
+COUNTER_COLUMNS = [
+    "interaction_count",
+    "duration_sum",
+    "duration_count",
+    *OUTCOME_COLUMNS.values(),
+]
+
+
+def stats_select(restaurant_ids=None):
+    query = (
+        select(
+            Restaurant.id,
+            func.count(Interaction.id),
+            func.coalesce(func.sum(Interaction.duration_minutes), 0),
+            func.count(Interaction.duration_minutes),
+            func.max(Interaction.interaction_date),
+            *[
+                func.coalesce(
+                    func.sum(case((Interaction.outcome == outcome, 1), else_=0)), 0
+                )
+                for outcome in OUTCOME_COLUMNS
+            ],
+            func.now(),
+        )
+        .select_from(Restaurant)
+        .outerjoin(Interaction, Interaction.restaurant_id == Restaurant.id)
+        .group_by(Restaurant.id)
+    )
+    if restaurant_ids is not None:
+        query = query.where(Restaurant.id.in_(restaurant_ids))
+    return query
+
+
+def _insert_from_select(connection, restaurant_ids=None):
+    columns = [
+        "restaurant_id",
+        "interaction_count",
+        "duration_sum",
+        "duration_count",
+        "last_interaction_date",
+        *OUTCOME_COLUMNS.values(),
+        "updated_at",
+    ]
+    connection.execute(
+        stats_table.insert().from_select(columns, stats_select(restaurant_ids))
+    )
+
+
+def refresh_restaurant_stats(restaurant_ids, connection=None):
+    restaurant_ids = list(restaurant_ids)
+    if not restaurant_ids:
+        return
+    connection = connection or db.session.connection()
+    connection.execute(
+        stats_table.delete().where(stats_table.c.restaurant_id.in_(restaurant_ids))
+    )
+    _insert_from_select(connection, restaurant_ids)
+
+
+def rebuild_restaurant_stats():
+    connection = db.session.connection()
+    connection.execute(stats_table.delete())
+    _insert_from_select(connection)
+    db.session.commit()
+    return db.session.query(func.count(RestaurantStats.restaurant_id)).scalar()
+
+
+SNAPSHOT_ATTRS = ("restaurant_id", "duration_minutes", "outcome", "interaction_date")
+
+
+def interaction_snapshot(interaction, state, attrs, previous=False):
+    values = {}
+    for attr in attrs:
+        history = state.attrs[attr].history
+        if previous and history.deleted:
+            values[attr] = history.deleted[0]
+        else:
+            values[attr] = getattr(interaction, attr)
+    return values
+
+
+def _apply_snapshot(deltas, snapshot, sign):
+    restaurant_id = snapshot["restaurant_id"]
+    if restaurant_id is None:
+        return
+    delta = deltas.setdefault(
+        restaurant_id,
+        {"counters": dict.fromkeys(COUNTER_COLUMNS, 0), "latest": None, "recompute": False},
+    )
+    counters = delta["counters"]
+    counters["interaction_count"] += sign
+    if snapshot["duration_minutes"] is not None:
+        counters["duration_sum"] += sign * snapshot["duration_minutes"]
+        counters["duration_count"] += sign
+    if snapshot["outcome"] in OUTCOME_COLUMNS:
+        counters[OUTCOME_COLUMNS[snapshot["outcome"]]] += sign
+    if sign > 0:
+        if delta["latest"] is None or snapshot["interaction_date"] > delta["latest"]:
+            delta["latest"] = snapshot["interaction_date"]
+    else:
+        delta["recompute"] = True
+
+
+def collect_interaction_deltas(session, attrs, apply_snapshot):
+    """Fold the interactions added, deleted or changed in ``session`` into a
+    dict of deltas: ``apply_snapshot(deltas, snapshot, sign)`` is called with
+    the ``attrs`` of every row to add (+1) or take away (-1).
+    """
+    deltas = {}
+    for obj in session.new:
+        if isinstance(obj, Interaction):
+            apply_snapshot(deltas, interaction_snapshot(obj, inspect(obj), attrs), 1)
+    for obj in session.deleted:
+        if isinstance(obj, Interaction):
+            snapshot = interaction_snapshot(obj, inspect(obj), attrs, previous=True)
+            apply_snapshot(deltas, snapshot, -1)
+    for obj in session.dirty:
+        if not isinstance(obj, Interaction) or not session.is_modified(obj):
+            continue
+        state = inspect(obj)
+        previous = interaction_snapshot(obj, state, attrs, previous=True)
+        current = interaction_snapshot(obj, state, attrs)
+        if previous != current:
+            apply_snapshot(deltas, previous, -1)
+            apply_snapshot(deltas, current, 1)
+    return deltas
+
+
+def _apply_deltas(connection, deltas):
+    missing = []
+    for restaurant_id, delta in deltas.items():
+        values = {
+            name: stats_table.c[name] + amount
+            for name, amount in delta["counters"].items()
+            if amount
+        }
+        last_interaction = stats_table.c.last_interaction_date
+        if delta["recompute"]:
+            values["last_interaction_date"] = (
+                select(func.max(Interaction.interaction_date))
+                .where(Interaction.restaurant_id == restaurant_id)
+                .scalar_subquery()
+            )
+        elif delta["latest"] is not None:
+            values["last_interaction_date"] = case(
+                (
+                    last_interaction.is_(None) | (last_interaction < delta["latest"]),
+                    delta["latest"],
+                ),
+                else_=last_interaction,
+            )
+        values["updated_at"] = datetime.utcnow()
+        result = connection.execute(
+            stats_table.update()
+            .where(stats_table.c.restaurant_id == restaurant_id)
+            .values(**values)
+        )
+        if result.rowcount == 0:
+            missing.append(restaurant_id)
+    refresh_restaurant_stats(missing, connection)
+
+
+def subtract_from_restaurant_stats(rows, connection=None):
+    """Take interactions deleted through Core statements out of the stats;
+    ``rows`` map at least SNAPSHOT_ATTRS to the deleted values.
+    """
+    deltas = {}
+    for row in rows:
+        _apply_snapshot(deltas, row, -1)
+    if deltas:
+        _apply_deltas(connection or db.session.connection(), deltas)
+
+
+def remove_rows_of_deleted_restaurants(session, table):
+    """Delete the ``table`` rows of the restaurants deleted in this flush
+    before their foreign keys get in the way, and return the restaurant ids.
+    """
+    deleted_ids = {
+        obj.id for obj in session.deleted if isinstance(obj, Restaurant)
+    }
+    if deleted_ids:
+        session.connection().execute(
+            table.delete().where(table.c.restaurant_id.in_(deleted_ids))
+        )
+    return deleted_ids
+
+
+@event.listens_for(db.session, "before_flush")
+def _remove_stats_of_deleted_restaurants(session, flush_context, instances):
+    session.info["deleted_restaurant_ids"] = remove_rows_of_deleted_restaurants(
+        session, stats_table
+    )
+
+
+@event.listens_for(db.session, "after_flush")
+def _maintain_restaurant_stats(session, flush_context):
+    deleted_ids = session.info.pop("deleted_restaurant_ids", set())
+    connection = session.connection()
+
+    new_ids = [
+        obj.id
+        for obj in session.new
+        if isinstance(obj, Restaurant) and obj.id not in deleted_ids
+    ]
+    if new_ids:
+        connection.execute(
+            stats_table.insert(),
+            [{"restaurant_id": restaurant_id} for restaurant_id in new_ids],
+        )
+
+    deltas = collect_interaction_deltas(session, SNAPSHOT_ATTRS, _apply_snapshot)
+    for restaurant_id in deleted_ids:
+        deltas.pop(restaurant_id, None)
+    if deltas:
+        _apply_deltas(connection, deltas)
@@ -0,0 +1,20 @@
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+# Threaded workers: a sync worker serves one request at a time, so a login
+# would hold it for the whole bcrypt hash. With gthread the other threads
+# keep serving while lib/passwords.py bounds hashing to BCRYPT_POOL_SIZE
+# threads and turns the overflow into 503s. Keep DB_POOL_SIZE +
+# DB_MAX_OVERFLOW at or above the thread count.
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+# Import the app once in the master so workers fork with the modules
+# already loaded; reset_after_fork gives each worker its own connections.
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+
+def post_fork(server, worker):
+    from app import reset_after_fork
+
+    reset_after_fork(worker.app.wsgi())
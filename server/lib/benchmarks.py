@@ -0,0 +1,353 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+from db.models import (
+    db,
+    User,
+    UserRole,
+    Restaurant,
+    RestaurantStatus,
+    CallFrequency,
+    Contact,
+    Interaction,
+)
+from db.serializers import DEFAULT_FIELDS, serializer
+from lib.extensions import cache
+from lib.fields import select_fields
+from lib.query_plans import PLAN_CHECK_ROUTES, sample_ids
+from lib.json_provider import OrjsonProvider
+from lib.passwords import hash_password
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def _run_clients(app, total, concurrency, request):
+    """Issue ``total`` calls of ``request(client)`` from ``concurrency``
+    threads, each with its own test client. Returns the latencies in
+    seconds, the status code counts and the wall time.
+    """
+    latencies, statuses = [], Counter()
+    lock = threading.Lock()
+
+    def worker(count):
+        client = app.test_client()
+        for _ in range(count):
+            start = time.perf_counter()
+            response = request(client)
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[response.status_code] += 1
+
+    shares = [total // concurrency + (i < total % concurrency) for i in range(concurrency)]
+    threads = [threading.Thread(target=worker, args=(share,)) for share in shares]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses, time.perf_counter() - started
+
+
+def _summary(latencies, statuses, wall):
+    return {
+        "requests": len(latencies),
+        "seconds": round(wall, 3),
+        "throughput": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(_percentile(latencies, 0.5) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 1),
+        "statuses": dict(statuses),
+    }
+
+
+def benchmark_login(app, total=200, concurrency=8):
+    """Measure login throughput of one gthread worker process serving
+    ``concurrency`` simultaneous logins on as many request threads (set it
+    to GUNICORN_THREADS), using a throwaway user.
+    """
+    email = f"bench-login-{uuid.uuid4().hex}@example.com"
+    password = uuid.uuid4().hex
+    with app.app_context():
+        user = User(
+            name="Login benchmark",
+            email=email,
+            password_hash=hash_password(password),
+            role=UserRole.KAM,
+        )
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+    try:
+        latencies, statuses, wall = _run_clients(
+            app,
+            total,
+            concurrency,
+            lambda client: client.post(
+                "/api/users/login", json={"email": email, "password": password}
+            ),
+        )
+    finally:
+        with app.app_context():
+            db.session.delete(db.session.get(User, user_id))
+            db.session.commit()
+    result = _summary(latencies, statuses, wall)
+    result.update(
+        concurrency=concurrency,
+        rounds=app.config["BCRYPT_LOG_ROUNDS"],
+        pool_size=app.config["BCRYPT_POOL_SIZE"],
+        queue_limit=app.config["BCRYPT_QUEUE_LIMIT"],
+    )
+    return result
+
+
+STARTUP_PROBE = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+created = time.perf_counter()
+print(json.dumps({"import": imported - started, "create_app": created - imported}))
+"""
+
+
+def benchmark_startup(runs=5):
+    """Time ``import app`` and ``create_app()`` in fresh interpreters, as a
+    gunicorn worker or a ``flask`` command would pay them.
+    """
+    server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE],
+            cwd=server_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        sample = json.loads(output.strip().splitlines()[-1])
+        sample["process"] = time.perf_counter() - started
+        samples.append(sample)
+    return {
+        "runs": runs,
+        **{
+            f"{key}_ms": round(statistics.median(s[key] for s in samples) * 1000, 1)
+            for key in ("import", "create_app", "process")
+        },
+    }
+
+
+def _comprehension_restaurant(r):
+    # The hand-written shape the restaurant routes built before db.serializers.
+    return {
+        "id": r.id,
+        "name": r.name,
+        "address": r.address,
+        "status": r.status.value if r.status else None,
+        "call_frequency": r.call_frequency.value if r.call_frequency else None,
+        "last_call_date": (
+            r.last_call_date.isoformat() if r.last_call_date else None
+        ),
+        "revenue": str(r.revenue) if r.revenue is not None else None,
+        "notes": r.notes,
+    }
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - started) * 1000, 1)
+
+
+def benchmark_serialization(app, rows=100000):
+    """Serialize and encode ``rows`` restaurants with the old per-route
+    comprehension plus stdlib JSON, and with the compiled serializer plus
+    orjson.
+    """
+    now = datetime.utcnow()
+    statuses, frequencies = list(RestaurantStatus), list(CallFrequency)
+    restaurants = [
+        Restaurant(
+            id=i,
+            name=f"Restaurant {i}",
+            address=f"{i} Main Street",
+            status=statuses[i % len(statuses)],
+            call_frequency=frequencies[i % len(frequencies)],
+            last_call_date=now - timedelta(minutes=i) if i % 10 else None,
+            revenue=Decimal(i % 50000) / 100 if i % 7 else None,
+            notes="Benchmark row",
+        )
+        for i in range(rows)
+    ]
+    serialize = serializer(Restaurant)
+
+    old_dicts, old_dicts_ms = _timed(
+        lambda: [_comprehension_restaurant(r) for r in restaurants]
+    )
+    new_dicts, new_dicts_ms = _timed(lambda: [serialize(r) for r in restaurants])
+    if old_dicts != new_dicts:
+        raise AssertionError("Compiled serializer output differs from the comprehension")
+
+    payload = {"items": new_dicts, "next_cursor": None}
+    stdlib = DefaultJSONProvider(app)
+    _, stdlib_ms = _timed(lambda: stdlib.dumps(payload))
+    _, orjson_ms = _timed(lambda: OrjsonProvider(app).dumps(payload))
+    return {
+        "rows": rows,
+        "comprehension_ms": old_dicts_ms,
+        "compiled_ms": new_dicts_ms,
+        "stdlib_json_ms": stdlib_ms,
+        "orjson_ms": orjson_ms,
+        "speedup": round((old_dicts_ms + stdlib_ms) / (new_dicts_ms + orjson_ms), 2),
+    }
+
+
+LIST_MODELS = {
+    "restaurants": Restaurant,
+    "contacts": Contact,
+    "interactions": Interaction,
+    "users": User,
+}
+
+
+def _measure_list(load, serialize):
+    db.session.remove()
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        rows = load()
+        items = [serialize(row) for row in rows]
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        db.session.remove()
+    return items, {
+        "ms": round(elapsed * 1000, 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+
+
+def benchmark_list_memory(app, table="interactions"):
+    """Load and serialize every row of ``table`` as ORM instances and as a
+    column projection, reporting wall time and peak Python allocations.
+    """
+    model = LIST_MODELS[table]
+    fields = DEFAULT_FIELDS[model]
+    serialize = serializer(model)
+    with app.app_context():
+        orm_items, orm = _measure_list(lambda: model.query.all(), serialize)
+        projected_items, projected = _measure_list(
+            lambda: db.session.execute(select_fields(model, fields)).all(),
+            serialize,
+        )
+    if sorted(orm_items, key=lambda item: item["id"]) != sorted(
+        projected_items, key=lambda item: item["id"]
+    ):
+        raise AssertionError("Projection output differs from the ORM instances")
+    return {
+        "table": table,
+        "rows": len(orm_items),
+        "orm_ms": orm["ms"],
+        "orm_peak_kb": orm["peak_kb"],
+        "projection_ms": projected["ms"],
+        "projection_peak_kb": projected["peak_kb"],
+        "memory_ratio": (
+            round(orm["peak_kb"] / projected["peak_kb"], 2)
+            if projected["peak_kb"]
+            else None
+        ),
+    }
+
+
+BENCH_ROUTES = [route for route, _ in PLAN_CHECK_ROUTES] + [
+    "/api/users?limit=50",
+    "/api/health",
+]
+
+
+def benchmark_routes(app, total=200, concurrency=4, routes=None):
+    """Replay every GET route once right after clearing the cache (cold),
+    then ``total`` times from ``concurrency`` clients (warm).
+
+    Route ids are filled in from the busiest restaurant, as in the query
+    plan check.
+    """
+    with app.app_context():
+        ids = sample_ids()
+        token = create_access_token(identity=str(ids["kam_id"]))
+        dialect = db.engine.dialect.name
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    for route in routes or BENCH_ROUTES:
+        url = route.format(**ids)
+        with app.app_context():
+            cache.clear()
+        cold, cold_ms = _timed(lambda: app.test_client().get(url, headers=headers))
+        latencies, statuses, wall = _run_clients(
+            app, total, concurrency, lambda client: client.get(url, headers=headers)
+        )
+        results[route] = {
+            "cold_ms": cold_ms,
+            "cold_status": cold.status_code,
+            **_summary(latencies, statuses, wall),
+        }
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.utcnow().isoformat(),
+        "database": dialect,
+        "cache": app.config["CACHE_TYPE"],
+        "requests": total,
+        "concurrency": concurrency,
+        "routes": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _change(old, new):
+    return f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+
+
+def compare_route_results(baseline, current):
+    """Rows of ``(route, metric, baseline, current, change)`` for the routes
+    present in both result sets.
+    """
+    rows = []
+    for route, result in current["routes"].items():
+        before = baseline["routes"].get(route)
+        if before is None:
+            continue
+        for metric in ("cold_ms", "p50_ms", "p99_ms", "throughput"):
+            rows.append(
+                (route, metric, before[metric], result[metric],
+                 _change(before[metric], result[metric]))
+            )
+    return rows
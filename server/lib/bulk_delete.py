@@ -0,0 +1,237 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import delete, func, or_, select
+from db.models import (
+    db,
+    Restaurant,
+    Contact,
+    Interaction,
+    RestaurantStats,
+    InteractionRollup,
+)
+from db.rollups import refresh_interaction_rollups, subtract_from_interaction_rollups
+from db.calls import last_calls_among, record_calls
+from db.stats import refresh_restaurant_stats, subtract_from_restaurant_stats
+from lib.cache_tags import TABLE_TAGS, kam_tags_for, restaurant_tag
+from lib.extensions import cache
+from lib.utils import invalidate_cache
+
+DELETE_BATCH_SIZE = 5000
+MAX_BULK_DELETE_IDS = 1000
+JOB_KEY_PREFIX = "bulk_delete:"
+JOB_TTL = 24 * 3600
+
+DELETE_MODELS = {
+    "restaurants": Restaurant,
+    "contacts": Contact,
+    "interactions": Interaction,
+}
+
+executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-delete")
+
+
+def _plan(entity, ids):
+    """Resolve ``ids`` to the rows that exist and the statements that delete
+    them together with everything that references them, children first.
+    """
+    model = DELETE_MODELS[entity]
+    ids = db.session.scalars(select(model.id).where(model.id.in_(ids))).all()
+    if model is Restaurant:
+        interactions = or_(
+            Interaction.restaurant_id.in_(ids),
+            Interaction.contact_id.in_(
+                select(Contact.id).where(Contact.restaurant_id.in_(ids))
+            ),
+        )
+        steps = [
+            (Contact, Contact.restaurant_id.in_(ids)),
+            (RestaurantStats, RestaurantStats.restaurant_id.in_(ids)),
+            (InteractionRollup, InteractionRollup.restaurant_id.in_(ids)),
+            (Restaurant, Restaurant.id.in_(ids)),
+        ]
+        restaurant_ids = set(ids)
+    elif model is Contact:
+        interactions = Interaction.contact_id.in_(ids)
+        steps = [(Contact, Contact.id.in_(ids))]
+        restaurant_ids = set(
+            db.session.scalars(
+                select(Contact.restaurant_id).where(Contact.id.in_(ids)).distinct()
+            )
+        )
+    else:
+        interactions = Interaction.id.in_(ids)
+        steps = []
+        restaurant_ids = set()
+
+    # Interactions can point at a contact of another restaurant, so the
+    # restaurants whose stats change come from the interactions themselves.
+    restaurant_ids.update(
+        db.session.scalars(
+            select(Interaction.restaurant_id).where(interactions).distinct()
+        )
+    )
+    tags = {TABLE_TAGS[Interaction]}
+    tags.update(TABLE_TAGS[m] for m, _ in steps if m in TABLE_TAGS)
+    tags.update(restaurant_tag(restaurant_id) for restaurant_id in restaurant_ids)
+    # The owners' portfolios lose the restaurants or their interactions.
+    tags.update(kam_tags_for(restaurant_ids))
+    return {
+        "ids": ids,
+        "interactions": interactions,
+        "steps": [(Interaction, interactions), *steps],
+        "restaurant_ids": restaurant_ids,
+        "tags": tags,
+    }
+
+
+def _execute(plan):
+    removed_calls = last_calls_among(plan["interactions"])
+    deleted = {}
+    for model, criterion in plan["steps"]:
+        result = db.session.execute(
+            delete(model).where(criterion).execution_options(synchronize_session=False)
+        )
+        if model in TABLE_TAGS:
+            name = TABLE_TAGS[model]
+            deleted[name] = deleted.get(name, 0) + result.rowcount
+    refresh_restaurant_stats(plan["restaurant_ids"])
+    refresh_interaction_rollups(plan["restaurant_ids"])
+    # Deleted calls can move a restaurant's last call back.
+    record_calls(plan["restaurant_ids"], removed_calls=removed_calls)
+    db.session.commit()
+    invalidate_cache(*plan["tags"])
+    return deleted
+
+
+def _delete_interactions_in_batches(plan, on_batch=None):
+    # Each batch commits together with its share of the stats, rollups and
+    # call schedules and then bumps the plan's cache tags, so readers never
+    # see them disagree with the interactions, even if the job dies midway.
+    deleted = 0
+    while True:
+        rows = db.session.execute(
+            select(
+                Interaction.id,
+                Interaction.restaurant_id,
+                Interaction.type,
+                Interaction.interaction_date,
+                Interaction.duration_minutes,
+                Interaction.outcome,
+            )
+            .where(plan["interactions"])
+            .limit(DELETE_BATCH_SIZE)
+        ).mappings().all()
+        if not rows:
+            return deleted
+        batch = Interaction.id.in_([row["id"] for row in rows])
+        removed_calls = last_calls_among(batch)
+        db.session.execute(
+            delete(Interaction).where(batch).execution_options(synchronize_session=False)
+        )
+        subtract_from_restaurant_stats(rows)
+        subtract_from_interaction_rollups(rows)
+        record_calls({row["restaurant_id"] for row in rows}, removed_calls=removed_calls)
+        db.session.commit()
+        invalidate_cache(*plan["tags"])
+        deleted += len(rows)
+        if on_batch is not None:
+            on_batch()
+
+
+def _job_key(job_id):
+    return JOB_KEY_PREFIX + job_id
+
+
+def _save_job(job_id, job):
+    # Jobs run in a thread of the worker that accepted them and die with it
+    # (restart, max-requests recycling). The heartbeat lets readers tell a
+    # job still making progress from one that was lost.
+    job["heartbeat"] = time.time()
+    cache.set(_job_key(job_id), job, timeout=JOB_TTL)
+
+
+def _run_job(app, job_id, entity, ids):
+    with app.app_context():
+        job = cache.get(_job_key(job_id)) or {"entity": entity, "ids": ids}
+        job.update(status="running")
+        _save_job(job_id, job)
+        try:
+            plan = _plan(entity, ids)
+            # Commit the bulk of a large cascade in batches so no single
+            # transaction holds locks on every row; the final transaction
+            # removes whatever is left, including rows added meanwhile.
+            batched = _delete_interactions_in_batches(
+                plan, lambda: _save_job(job_id, job)
+            )
+            deleted = _execute(plan)
+            deleted["interactions"] = deleted.get("interactions", 0) + batched
+            job.update(status="done", deleted=deleted)
+            app.logger.info(f"Bulk delete job {job_id} finished: {deleted}")
+        except Exception as e:
+            db.session.rollback()
+            job.update(status="failed", error=str(e))
+            app.logger.error(f"Bulk delete job {job_id} failed: {str(e)}")
+        finally:
+            db.session.remove()
+        _save_job(job_id, job)
+
+
+def get_delete_job(job_id):
+    """The job's status, with jobs that stopped sending heartbeats for
+    BULK_DELETE_JOB_STALE_AFTER seconds reported as failed.
+    """
+    job = cache.get(_job_key(job_id))
+    if (
+        job is not None
+        and job["status"] in ("pending", "running")
+        and time.time() - job.get("heartbeat", 0)
+        > current_app.config["BULK_DELETE_JOB_STALE_AFTER"]
+    ):
+        job.update(
+            status="failed",
+            error="The worker running this job stopped; repeat the delete to finish it",
+        )
+        cache.set(_job_key(job_id), job, timeout=JOB_TTL)
+    return job
+
+
+def delete_records(entity, ids):
+    """Delete ``ids`` of ``entity`` and everything that references them.
+
+    Returns ``(result, job_id)``. Cascades touching more interactions than
+    ``BULK_DELETE_BACKGROUND_THRESHOLD`` are handed to a background job and
+    ``result`` only describes the job.
+    """
+    if entity not in DELETE_MODELS:
+        raise ValueError(f"Unknown delete entity: {entity}")
+    if not isinstance(ids, list) or not all(isinstance(i, int) for i in ids):
+        raise ValueError("Expected a list of integer ids")
+    if len(ids) > MAX_BULK_DELETE_IDS:
+        raise ValueError(f"Cannot delete more than {MAX_BULK_DELETE_IDS} records at once")
+
+    plan = _plan(entity, ids)
+    missing = sorted(set(ids) - set(plan["ids"]))
+    if not plan["ids"]:
+        return {"deleted": {}, "missing": missing}, None
+
+    count = db.session.scalar(
+        select(func.count()).select_from(Interaction).where(plan["interactions"])
+    )
+    if count > current_app.config["BULK_DELETE_BACKGROUND_THRESHOLD"]:
+        job_id = uuid.uuid4().hex
+        job = {"status": "pending", "entity": entity, "ids": plan["ids"]}
+        _save_job(job_id, job)
+        db.session.rollback()
+        executor.submit(
+            _run_job, current_app._get_current_object(), job_id, entity, plan["ids"]
+        )
+        return {"job_id": job_id, "status": "pending", "missing": missing}, job_id
+
+    return {"deleted": _execute(plan), "missing": missing}, None
+
+
+def ids_from_request(request):
+    data = request.get_json(silent=True) or {}
+    return data.get("ids")
@@ -0,0 +1,282 @@
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from sqlalchemy.exc import SQLAlchemyError
+from db.models import (
+    db,
+    User,
+    Restaurant,
+    Contact,
+    Interaction,
+    RestaurantStatus,
+    CallFrequency,
+    InteractionType,
+    InteractionOutcome,
+    PreferredContactMethod,
+)
+from db.stats import refresh_restaurant_stats
+from db.rollups import refresh_interaction_rollups
+from db.calls import record_calls, schedule_rows
+from lib.cache_tags import TABLE_TAGS, kam_tag, kam_tags_for, restaurant_tag
+from lib.utils import invalidate_cache
+
+IMPORT_BATCH_SIZE = 1000
+
+
+def _text(value):
+    return value if value not in ("", None) else None
+
+
+def _integer(value):
+    value = _text(value)
+    return int(value) if value is not None else None
+
+
+def _decimal(value):
+    value = _text(value)
+    if value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"Invalid number: {value}")
+
+
+def _date(value):
+    value = _text(value)
+    return datetime.strptime(value, "%Y-%m-%d") if value is not None else None
+
+
+def _enum(enum_cls, default=None):
+    members = {member.name: member for member in enum_cls}
+
+    def parse(value):
+        value = _text(value)
+        if value is None:
+            return default
+        try:
+            return members[str(value).upper()]
+        except KeyError:
+            raise ValueError(f"Invalid value: '{value}'")
+
+    return parse
+
+
+# field name -> (parser, required)
+IMPORT_SPECS = {
+    "restaurants": (
+        Restaurant,
+        {
+            "name": (_text, True),
+            "address": (_text, False),
+            "status": (_enum(RestaurantStatus, RestaurantStatus.NEW), False),
+            "call_frequency": (_enum(CallFrequency, CallFrequency.WEEKLY), False),
+            "last_call_date": (_date, False),
+            "revenue": (_decimal, False),
+            "notes": (_text, False),
+            "assigned_kam_id": (_integer, False),
+        },
+    ),
+    "contacts": (
+        Contact,
+        {
+            "name": (_text, True),
+            "role": (_text, True),
+            "email": (_text, False),
+            "phone": (_text, False),
+            "preferred_contact_method": (_enum(PreferredContactMethod), False),
+            "time_zone": (_text, False),
+            "restaurant_id": (_integer, True),
+        },
+    ),
+    "interactions": (
+        Interaction,
+        {
+            "interaction_date": (_date, True),
+            "type": (_enum(InteractionType), True),
+            "outcome": (_enum(InteractionOutcome), False),
+            "details": (_text, False),
+            "duration_minutes": (_integer, False),
+            "restaurant_id": (_integer, True),
+            "contact_id": (_integer, True),
+        },
+    ),
+}
+
+# field name -> model whose ids it must reference
+FOREIGN_KEYS = {
+    "assigned_kam_id": User,
+    "restaurant_id": Restaurant,
+    "contact_id": Contact,
+}
+
+
+def read_csv(content):
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+def records_from_request(request):
+    upload = request.files.get("file")
+    if upload:
+        return read_csv(upload.read().decode("utf-8-sig"))
+    if request.mimetype == "text/csv":
+        return read_csv(request.get_data(as_text=True))
+    return request.get_json()
+
+
+def _validate(records, fields):
+    rows, errors = [], []
+    now = datetime.utcnow()
+    for index, record in enumerate(records):
+        if not isinstance(record, dict):
+            errors.append({"row": index, "error": "Row must be an object"})
+            continue
+        try:
+            row = {}
+            for field, (parse, required) in fields.items():
+                value = parse(record.get(field))
+                if required and value is None:
+                    raise ValueError(f"Missing required field: {field}")
+                row[field] = value
+        except (ValueError, TypeError) as e:
+            errors.append({"row": index, "error": str(e)})
+            continue
+        row["created_at"] = now
+        row["updated_at"] = now
+        rows.append((index, row))
+    return rows, errors
+
+
+def _existing_ids(model, ids):
+    ids = list(ids)
+    existing = set()
+    for start in range(0, len(ids), IMPORT_BATCH_SIZE):
+        chunk = ids[start : start + IMPORT_BATCH_SIZE]
+        existing.update(
+            id for (id,) in db.session.query(model.id).filter(model.id.in_(chunk))
+        )
+    return existing
+
+
+def _check_foreign_keys(rows, fields):
+    errors = []
+    for field, model in FOREIGN_KEYS.items():
+        if field not in fields:
+            continue
+        existing = _existing_ids(
+            model, {row[field] for _, row in rows if row[field] is not None}
+        )
+        valid = []
+        for index, row in rows:
+            if row[field] is not None and row[field] not in existing:
+                errors.append(
+                    {"row": index, "error": f"Unknown {field}: {row[field]}"}
+                )
+            else:
+                valid.append((index, row))
+        rows = valid
+    return rows, errors
+
+
+def _copy_rows(table, batch):
+    columns = list(batch[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in batch:
+        writer.writerow(
+            [
+                "\\N" if value is None else getattr(value, "name", value)
+                for value in (row[column] for column in columns)
+            ]
+        )
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN "
+            "WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_batch(table, batch, use_copy):
+    if use_copy:
+        _copy_rows(table, batch)
+    else:
+        db.session.execute(table.insert(), batch)
+
+
+def _insert_rows(table, rows):
+    dialect = db.engine.dialect
+    use_copy = dialect.name == "postgresql"
+    database_errors = (SQLAlchemyError, dialect.dbapi.Error)
+    inserted, errors = [], []
+    for start in range(0, len(rows), IMPORT_BATCH_SIZE):
+        batch = rows[start : start + IMPORT_BATCH_SIZE]
+        try:
+            with db.session.begin_nested():
+                _insert_batch(table, [row for _, row in batch], use_copy)
+            inserted.extend(row for _, row in batch)
+            continue
+        except database_errors:
+            pass
+        # Retry the failed batch row by row so one bad row doesn't sink the
+        # rest of it.
+        for index, row in batch:
+            try:
+                with db.session.begin_nested():
+                    db.session.execute(table.insert(), [row])
+                inserted.append(row)
+            except SQLAlchemyError as e:
+                errors.append({"row": index, "error": str(getattr(e, "orig", e))})
+    return inserted, errors
+
+
+def _cache_tags(model, rows):
+    tags = {TABLE_TAGS[model]}
+    if model is Restaurant:
+        kam_ids = {row["assigned_kam_id"] for row in rows}
+        tags.update(kam_tag(kam_id) for kam_id in kam_ids if kam_id is not None)
+    else:
+        restaurant_ids = {row["restaurant_id"] for row in rows}
+        tags.update(restaurant_tag(restaurant_id) for restaurant_id in restaurant_ids)
+        if model is Interaction:
+            tags.update(kam_tags_for(restaurant_ids))
+    return tags
+
+
+def import_records(entity, records):
+    if entity not in IMPORT_SPECS:
+        raise ValueError(f"Unknown import entity: {entity}")
+    if not isinstance(records, list):
+        raise ValueError("Expected a list of records")
+    model, fields = IMPORT_SPECS[entity]
+
+    rows, errors = _validate(records, fields)
+    rows, fk_errors = _check_foreign_keys(rows, fields)
+    errors.extend(fk_errors)
+    if model is Restaurant:
+        schedule_rows([row for _, row in rows])
+    inserted, insert_errors = _insert_rows(model.__table__, rows)
+    errors.extend(insert_errors)
+
+    if model is Interaction:
+        refresh_restaurant_stats({row["restaurant_id"] for row in inserted})
+        refresh_interaction_rollups({row["restaurant_id"] for row in inserted})
+        record_calls(
+            {
+                row["restaurant_id"]
+                for row in inserted
+                if row["type"] == InteractionType.CALL
+            }
+        )
+    db.session.commit()
+    if inserted:
+        invalidate_cache(*_cache_tags(model, inserted))
+    return {
+        "created": len(inserted),
+        "errors": sorted(errors, key=lambda error: error["row"]),
+    }
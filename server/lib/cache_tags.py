@@ -0,0 +1,160 @@
+from sqlalchemy import event, inspect, select
+from db.models import db, Restaurant, Contact, Interaction, User
+from lib.extensions import cache
+from lib.metrics import record_cache_lookup
+
+TAG_KEY_PREFIX = "cache_tag:"
+
+TABLE_TAGS = {
+    Restaurant: "restaurants",
+    Contact: "contacts",
+    Interaction: "interactions",
+    User: "users",
+}
+
+# Columns that the cached table-wide payloads read. Changing any other column
+# (notes, phone numbers, ...) only invalidates the row's own entity tags.
+TABLE_TAG_FIELDS = {
+    Restaurant: {"name", "revenue", "status", "assigned_kam_id", "call_frequency"},
+    Contact: {"name", "restaurant_id"},
+    Interaction: {
+        "restaurant_id",
+        "contact_id",
+        "interaction_date",
+        "duration_minutes",
+        "outcome",
+        "type",
+    },
+    User: {"name", "role"},
+}
+
+
+def restaurant_tag(restaurant_id):
+    return f"restaurant:{restaurant_id}"
+
+
+def kam_tag(kam_id):
+    return f"kam:{kam_id}"
+
+
+def tag_versions(tags):
+    values = cache.get_many(*[TAG_KEY_PREFIX + tag for tag in tags])
+    return [value or 0 for value in values]
+
+
+def tagged_key(prefix, *tags):
+    def make_key():
+        versions = ".".join(str(version) for version in tag_versions(tags))
+        return f"{prefix}:{versions}"
+
+    return make_key
+
+
+def cached_per_tag(prefix, ids, tag_for, compute, timeout=300):
+    """Cache one entry per id, keyed by the current version of the id's tag,
+    so bumping that tag orphans just that entry.
+
+    ``compute(missing_ids)`` returns ``{id: value}`` for the ids that are not
+    cached; the rest come from a single ``get_many``.
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    versions = tag_versions([tag_for(id_) for id_ in ids])
+    keys = {id_: f"{prefix}:{id_}:{version}" for id_, version in zip(ids, versions)}
+    values = dict(zip(ids, cache.get_many(*keys.values())))
+    missing = [id_ for id_, value in values.items() if value is None]
+    for id_ in ids:
+        record_cache_lookup(prefix, "miss" if values[id_] is None else "hit")
+    if missing:
+        computed = compute(missing)
+        cache.set_many({keys[id_]: computed[id_] for id_ in missing}, timeout=timeout)
+        values.update(computed)
+    return values
+
+
+def kam_tags_for(restaurant_ids, connection=None):
+    """Tags of the KAMs owning ``restaurant_ids``, whose portfolios count the
+    restaurants' interactions.
+    """
+    restaurant_ids = list(restaurant_ids)
+    if not restaurant_ids:
+        return set()
+    connection = connection or db.session.connection()
+    kam_ids = connection.execute(
+        select(Restaurant.assigned_kam_id)
+        .where(
+            Restaurant.id.in_(restaurant_ids),
+            Restaurant.assigned_kam_id.isnot(None),
+        )
+        .distinct()
+    ).scalars()
+    return {kam_tag(kam_id) for kam_id in kam_ids}
+
+
+def bump_tags(tags):
+    for tag in tags:
+        cache.cache.inc(TAG_KEY_PREFIX + tag)
+
+
+def _values(state, attr):
+    history = state.attrs[attr].history
+    return {
+        value
+        for value in (*history.deleted, *history.unchanged, *history.added)
+        if value is not None
+    }
+
+
+def _changed_fields(state):
+    return {attr.key for attr in state.attrs if attr.history.has_changes()}
+
+
+def _tags_for(obj, changed=None):
+    state = inspect(obj)
+    model = type(obj)
+    tags = set()
+    if changed is None or changed & TABLE_TAG_FIELDS[model]:
+        tags.add(TABLE_TAGS[model])
+    if model is Restaurant:
+        tags.add(restaurant_tag(obj.id))
+        tags.update(kam_tag(kam_id) for kam_id in _values(state, "assigned_kam_id"))
+    elif model in (Contact, Interaction):
+        tags.update(
+            restaurant_tag(restaurant_id)
+            for restaurant_id in _values(state, "restaurant_id")
+        )
+    elif model is User:
+        tags.add(kam_tag(obj.id))
+    return tags
+
+
+@event.listens_for(db.session, "after_flush")
+def _collect_cache_tags(session, flush_context):
+    tags = session.info.setdefault("cache_tags", set())
+    interaction_restaurants = set()
+    for obj in (*session.new, *session.deleted):
+        if type(obj) in TABLE_TAGS:
+            tags.update(_tags_for(obj))
+            if type(obj) is Interaction:
+                interaction_restaurants |= _values(inspect(obj), "restaurant_id")
+    for obj in session.dirty:
+        if type(obj) in TABLE_TAGS and session.is_modified(obj):
+            tags.update(_tags_for(obj, _changed_fields(inspect(obj))))
+            if type(obj) is Interaction:
+                interaction_restaurants |= _values(inspect(obj), "restaurant_id")
+    # Interaction rows carry no KAM, but they count towards the portfolio of
+    # the KAM owning their restaurant.
+    tags.update(kam_tags_for(interaction_restaurants, session.connection()))
+
+
+@event.listens_for(db.session, "after_commit")
+def _bump_cache_tags(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        bump_tags(tags)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _discard_cache_tags(session):
+    session.info.pop("cache_tags", None)
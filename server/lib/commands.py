@@ -0,0 +1,189 @@
+import json
+import os
+import time
+import click
+from flask import current_app
+from flask.cli import AppGroup, with_appcontext
+from db.rollups import rebuild_interaction_rollups
+from db.stats import rebuild_restaurant_stats
+from lib.benchmarks import (
+    LIST_MODELS,
+    benchmark_list_memory,
+    benchmark_login,
+    benchmark_routes,
+    compare_route_results,
+    benchmark_serialization,
+    benchmark_startup,
+)
+from lib.bulk_import import IMPORT_SPECS, import_records, read_csv
+from lib.query_plans import check_query_plans
+from lib.seed import seed_dataset
+
+stats_cli = AppGroup("stats", help="Maintain the denormalized restaurant_stats table.")
+
+
+@stats_cli.command("rebuild")
+def rebuild_stats_command():
+    count = rebuild_restaurant_stats()
+    click.echo(f"Rebuilt restaurant_stats for {count} restaurants")
+
+
+rollups_cli = AppGroup("rollups", help="Maintain the interaction_rollups table.")
+
+
+@rollups_cli.command("rebuild")
+@click.option("--since", type=click.DateTime(formats=["%Y-%m-%d"]), default=None,
+              help="Only rebuild the days from this date on.")
+def rebuild_rollups_command(since):
+    """Backfill the daily interaction rollups from the interactions."""
+    started = time.perf_counter()
+    count = rebuild_interaction_rollups(since)
+    click.echo(
+        f"Rebuilt interaction_rollups ({count} rows) in "
+        f"{time.perf_counter() - started:.1f}s"
+    )
+
+
+@click.command("import")
+@with_appcontext
+@click.argument("entity", type=click.Choice(list(IMPORT_SPECS)))
+@click.argument("path", type=click.File("r", encoding="utf-8-sig"))
+def import_command(entity, path):
+    """Bulk import restaurants, contacts or interactions from CSV or JSON."""
+    content = path.read()
+    if path.name.endswith(".json"):
+        records = json.loads(content)
+    else:
+        records = read_csv(content)
+    result = import_records(entity, records)
+    for error in result["errors"]:
+        click.echo(f"Row {error['row']}: {error['error']}", err=True)
+    click.echo(
+        f"Imported {result['created']} {entity}, {len(result['errors'])} rows failed"
+    )
+
+
+@click.command("seed")
+@with_appcontext
+@click.option("--restaurants", type=int, default=1000)
+@click.option("--contacts", type=int, default=None,
+              help="Total contacts (default: 4 per restaurant).")
+@click.option("--interactions", type=int, default=None,
+              help="Total interactions (default: 100 per restaurant).")
+@click.option("--kams", type=int, default=20)
+@click.option("--seed", "random_seed", type=int, default=42)
+def seed_command(restaurants, contacts, interactions, kams, random_seed):
+    """Bulk-generate a synthetic dataset with production-like skew."""
+    started = time.perf_counter()
+    counts = seed_dataset(
+        restaurants=restaurants,
+        contacts_per_restaurant=contacts / restaurants if contacts else 4,
+        interactions_per_restaurant=interactions / restaurants if interactions else 100,
+        kams=kams,
+        seed=random_seed,
+    )
+    click.echo(f"Seeded {counts} in {time.perf_counter() - started:.1f}s")
+
+
+plans_cli = AppGroup("plans", help="Check the query plans of the API routes.")
+
+
+@plans_cli.command("check")
+@click.option("--seed", "seed_restaurants", type=int, default=0,
+              help="Seed this many synthetic restaurants before checking.")
+@click.option("--min-rows", type=int, default=1000,
+              help="Only report sequential scans on tables at least this big.")
+def check_plans_command(seed_restaurants, min_rows):
+    if seed_restaurants:
+        counts = seed_dataset(restaurants=seed_restaurants)
+        click.echo(f"Seeded {counts}")
+    violations = check_query_plans(current_app._get_current_object(), min_rows)
+    for route, table, statement in violations:
+        if table is None:
+            click.echo(f"{route}: {statement}", err=True)
+        else:
+            click.echo(f"{route}: sequential scan on {table}\n    {statement}", err=True)
+    if violations:
+        raise click.ClickException(f"{len(violations)} query problems found")
+    click.echo("No sequential scans on large tables and no query budget overruns")
+
+
+bench_cli = AppGroup("bench", help="Benchmark the API in-process.")
+
+
+def _echo_result(result):
+    for key, value in result.items():
+        click.echo(f"{key}: {value}")
+
+
+@bench_cli.command("login")
+@click.option("--requests", "total", type=int, default=200)
+@click.option("--concurrency", type=int, default=int(os.getenv("GUNICORN_THREADS", 8)),
+              help="Simultaneous logins (default: GUNICORN_THREADS).")
+@click.option("--rounds", type=int, default=None,
+              help="Override BCRYPT_LOG_ROUNDS for this run.")
+def bench_login_command(total, concurrency, rounds):
+    """Login throughput of a single worker process."""
+    app = current_app._get_current_object()
+    if rounds is not None:
+        app.config["BCRYPT_LOG_ROUNDS"] = rounds
+    _echo_result(benchmark_login(app, total, concurrency))
+
+
+@bench_cli.command("startup")
+@click.option("--runs", type=int, default=5)
+def bench_startup_command(runs):
+    """Median import and create_app time in a fresh interpreter."""
+    _echo_result(benchmark_startup(runs))
+
+
+@bench_cli.command("serialize")
+@click.option("--rows", type=int, default=100000)
+def bench_serialize_command(rows):
+    """Compiled serializers and orjson against the old comprehensions."""
+    _echo_result(benchmark_serialization(current_app._get_current_object(), rows))
+
+
+@bench_cli.command("memory")
+@click.argument("table", type=click.Choice(list(LIST_MODELS)), default="interactions")
+def bench_memory_command(table):
+    """Peak memory of listing a table as ORM instances against a projection."""
+    _echo_result(benchmark_list_memory(current_app._get_current_object(), table))
+
+
+@bench_cli.command("routes")
+@click.option("--requests", "total", type=int, default=200,
+              help="Warm requests per route.")
+@click.option("--concurrency", type=int, default=4)
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Where to store the results (default: bench-results/<commit>.json).")
+@click.option("--compare", "baseline", type=click.File("r"), default=None,
+              help="Earlier results file to compare against.")
+def bench_routes_command(total, concurrency, output, baseline):
+    """Cold and warm latency and throughput of every GET route."""
+    result = benchmark_routes(current_app._get_current_object(), total, concurrency)
+    click.echo(f"{'route':<60} {'cold_ms':>8} {'p50_ms':>8} {'p99_ms':>8} {'req/s':>8}")
+    for route, stats in result["routes"].items():
+        click.echo(
+            f"{route:<60} {stats['cold_ms']:>8} {stats['p50_ms']:>8} "
+            f"{stats['p99_ms']:>8} {stats['throughput']:>8}"
+        )
+    output = output or os.path.join("bench-results", f"{result['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(result, f, indent=2)
+    click.echo(f"Saved results to {output}")
+    if baseline:
+        previous = json.load(baseline)
+        click.echo(f"Compared with {previous['commit']}:")
+        for route, metric, before, after, change in compare_route_results(previous, result):
+            click.echo(f"{route:<60} {metric:<10} {before:>8} -> {after:>8} {change:>6}")
+
+
+def register_commands(app):
+    app.cli.add_command(stats_cli)
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(import_command)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(plans_cli)
+    app.cli.add_command(bench_cli)
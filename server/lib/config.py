@@ -4,10 +4,47 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _redis_url():
+    # CACHE_REDIS_URL and REDIS_HOST/PORT/DB configured the cache and the
+    # scheduler client separately before they shared one pool.
+    url = os.getenv("REDIS_URL") or os.getenv("CACHE_REDIS_URL")
+    if url:
+        return url
+    host = os.getenv("REDIS_HOST", "localhost")
+    port = os.getenv("REDIS_PORT", 6379)
+    return f"redis://{host}:{port}/{os.getenv('REDIS_DB', 0)}"
+
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///default.db")
-    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+    DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "false").lower() == "true"
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "default")
-    CACHE_TYPE = "redis"
+    REDIS_URL = _redis_url()
+    REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+    REDIS_POOL_TIMEOUT = int(os.getenv("REDIS_POOL_TIMEOUT", 5))
+    REDIS_SOCKET_TIMEOUT = float(os.getenv("REDIS_SOCKET_TIMEOUT", 5))
+    REDIS_HEALTH_CHECK_INTERVAL = int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30))
+    CACHE_TYPE = "lib.pools.SharedRedisCache"
     API_URL=os.getenv("API_URL", "http://127.0.0.1:5000/api")
+    CACHE_WARM_INTERVAL = int(os.getenv("CACHE_WARM_INTERVAL", 30))
+    BULK_DELETE_BACKGROUND_THRESHOLD = int(
+        os.getenv("BULK_DELETE_BACKGROUND_THRESHOLD", 10000)
+    )
+    BULK_DELETE_JOB_STALE_AFTER = int(os.getenv("BULK_DELETE_JOB_STALE_AFTER", 300))
+    BCRYPT_LOG_ROUNDS = int(os.getenv("BCRYPT_LOG_ROUNDS", 12))
+    BCRYPT_POOL_SIZE = int(os.getenv("BCRYPT_POOL_SIZE", os.cpu_count() or 2))
+    BCRYPT_QUEUE_LIMIT = int(os.getenv("BCRYPT_QUEUE_LIMIT", 32))
+    BCRYPT_TIMEOUT = int(os.getenv("BCRYPT_TIMEOUT", 10))
+    SCHEDULER_LEASE_TTL = int(os.getenv("SCHEDULER_LEASE_TTL", 30))
+    SCHEDULER_LEASE_RENEW_INTERVAL = int(os.getenv("SCHEDULER_LEASE_RENEW_INTERVAL", 10))
+    LAZY_STARTUP = os.getenv("LAZY_STARTUP", "true").lower() == "true"
+    QUERY_GUARD = os.getenv("QUERY_GUARD", "false").lower() == "true"
+    QUERY_GUARD_RAISE = os.getenv("QUERY_GUARD_RAISE", "false").lower() == "true"
+    QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", 20))
+    QUERY_REPEAT_LIMIT = int(os.getenv("QUERY_REPEAT_LIMIT", 5))
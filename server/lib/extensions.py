@@ -1,13 +1,7 @@
 from flask_caching import Cache
 from flask_jwt_extended import JWTManager
-import redis
-import os
+from lib.pools import RedisPool
 
 cache = Cache()
 jwt = JWTManager()
-
-REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
-REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
-REDIS_DB = int(os.getenv("REDIS_DB", 0))
-
-redis_client = redis.Redis(host=REDIS_HOST, port=REDIS_PORT, db=REDIS_DB)
\ No newline at end of file
+redis_pool = RedisPool()
@@ -0,0 +1,63 @@
+from sqlalchemy import select
+from sqlalchemy.orm import load_only, selectinload
+from db.serializers import serializer
+
+
+def _parse_list(args, key, allowed, default):
+    if key not in args:
+        return tuple(default)
+    names = tuple(name for name in args[key].split(",") if name)
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValueError(f"Unknown {key}: {', '.join(unknown)}")
+    return names
+
+
+def parse_fields(args, allowed):
+    return _parse_list(args, "fields", allowed, allowed) or tuple(allowed)
+
+
+def parse_include(args, relations, default=()):
+    return _parse_list(args, "include", relations, default)
+
+
+def load_fields(model, fields):
+    """Return a ``load_only`` option for the columns behind ``fields``.
+
+    The primary key is always loaded so the identity map keeps working.
+    """
+    columns = model.__table__.columns
+    return load_only(
+        model.id, *[getattr(model, name) for name in fields if name in columns]
+    )
+
+
+def select_fields(model, fields):
+    """Return a ``select()`` of the columns behind ``fields``.
+
+    The rows are plain named tuples, so list endpoints skip building ORM
+    instances and registering them in the session's identity map.
+    """
+    return select(*[getattr(model, name) for name in fields])
+
+
+def include_options(relations, include):
+    return [
+        selectinload(relations[name][0]).options(
+            load_fields(relations[name][1], relations[name][2])
+        )
+        for name in include
+    ]
+
+
+def serialize_included(obj, relations, include):
+    result = {}
+    for name in include:
+        _, model, fields = relations[name]
+        serialize = serializer(model, fields)
+        value = getattr(obj, name)
+        if isinstance(value, list):
+            result[name] = [serialize(item) for item in value]
+        else:
+            result[name] = serialize(value) if value is not None else None
+    return result
@@ -0,0 +1,151 @@
+import os
+import time
+from flask import current_app, g, has_app_context, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+REQUEST_LATENCY = Histogram(
+    "kam_http_request_duration_seconds",
+    "Request latency by route.",
+    ["blueprint", "endpoint", "method"],
+)
+REQUESTS = Counter(
+    "kam_http_requests_total",
+    "Responses by route and status code.",
+    ["blueprint", "endpoint", "method", "status"],
+)
+REQUEST_SQL_QUERIES = Histogram(
+    "kam_http_request_sql_queries",
+    "SQL statements executed per request.",
+    ["endpoint"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, float("inf")),
+)
+REQUEST_SQL_SECONDS = Histogram(
+    "kam_http_request_sql_seconds",
+    "Time spent in SQL statements per request.",
+    ["endpoint"],
+)
+CACHE_LOOKUPS = Counter(
+    "kam_cache_lookups_total",
+    "Cached payload lookups by result (hit, stale or miss).",
+    ["key", "result"],
+)
+JOB_DURATION = Histogram(
+    "kam_scheduler_job_duration_seconds",
+    "Scheduled job run time.",
+    ["job", "status"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, float("inf")),
+)
+
+
+def record_cache_lookup(key, result):
+    CACHE_LOOKUPS.labels(key, result).inc()
+
+
+def record_job(job_id, status, duration):
+    JOB_DURATION.labels(job_id, status).observe(duration)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context.query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_app_context() and "sql_queries" in g:
+        g.sql_queries += 1
+        g.sql_seconds += time.perf_counter() - context.query_started
+
+
+def _start_request():
+    g.request_started = time.perf_counter()
+    g.sql_queries = 0
+    g.sql_seconds = 0.0
+
+
+def _record_request(response):
+    started = g.get("request_started")
+    if started is None:
+        return response
+    blueprint = request.blueprint or ""
+    endpoint = request.endpoint or "unmatched"
+    REQUEST_LATENCY.labels(blueprint, endpoint, request.method).observe(
+        time.perf_counter() - started
+    )
+    REQUESTS.labels(blueprint, endpoint, request.method, response.status_code).inc()
+    REQUEST_SQL_QUERIES.labels(endpoint).observe(g.sql_queries)
+    REQUEST_SQL_SECONDS.labels(endpoint).observe(g.sql_seconds)
+    return response
+
+
+class PoolCollector:
+    """Connection pool usage of the process answering the scrape."""
+
+    def describe(self):
+        return []
+
+    def collect(self):
+        from db.models import db
+        from lib.pools import database_pool_metrics
+
+        if not has_app_context():
+            return
+        pid = str(os.getpid())
+        database = GaugeMetricFamily(
+            "kam_db_pool_connections",
+            "Database pool connections by state.",
+            labels=["pid", "engine", "state"],
+        )
+        for name, stats in database_pool_metrics(db.engines).items():
+            for state in ("checked_out", "checked_in", "overflow"):
+                if state in stats:
+                    database.add_metric([pid, name, state], stats[state])
+        yield database
+
+        redis = GaugeMetricFamily(
+            "kam_redis_pool_connections",
+            "Redis pool connections by state.",
+            labels=["pid", "state"],
+        )
+        redis_stats = current_app.extensions["redis_pool"].metrics()
+        if redis_stats is not None:
+            for state in ("max_connections", "in_use", "idle"):
+                redis.add_metric([pid, state], redis_stats[state])
+        yield redis
+
+
+POOL_COLLECTOR = PoolCollector()
+REGISTRY.register(POOL_COLLECTOR)
+
+
+def init_metrics(app):
+    app.before_request(_start_request)
+    app.after_request(_record_request)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def render_metrics():
+    """Return the Prometheus text exposition and its content type.
+
+    Under gunicorn with ``PROMETHEUS_MULTIPROC_DIR`` set, the request,
+    cache and job series are aggregated across all workers; pool gauges
+    always come from the worker answering the scrape.
+    """
+    registry = REGISTRY
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(POOL_COLLECTOR)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
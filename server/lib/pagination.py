@@ -0,0 +1,89 @@
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import DateTime, tuple_
+from db.models import db
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(sort, value, last_id):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, last_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor):
+    try:
+        payload = base64.urlsafe_b64decode(cursor.encode("ascii"))
+        sort, value, last_id = json.loads(payload)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    return sort, value, last_id
+
+
+def parse_limit(args):
+    limit = args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+    if limit is None or limit < 1:
+        raise ValueError("limit must be a positive integer")
+    return min(limit, MAX_PAGE_SIZE)
+
+
+def parse_date(args, key):
+    value = args.get(key)
+    return datetime.strptime(value, "%Y-%m-%d") if value else None
+
+
+def paginate(query, model, sortable, args, default_sort="id"):
+    """Keyset-paginate the ``select()`` ``query`` on ``(sort column, id)``.
+
+    ``sort`` accepts one of ``sortable``, optionally prefixed with ``-`` for
+    descending order. The sort column and id are added to the projection
+    when missing, since the next cursor is built from them. Returns the page
+    of rows and the cursor for the next page, or ``None`` once the last page
+    has been reached.
+    """
+    sort = args.get("sort", default_sort)
+    descending = sort.startswith("-")
+    sort_name = sort.lstrip("-")
+    if sort_name not in sortable:
+        raise ValueError(f"Cannot sort by {sort_name}")
+    limit = parse_limit(args)
+
+    sort_column = getattr(model, sort_name)
+    id_column = model.id
+    keyset = tuple_(sort_column, id_column)
+    order_columns = [id_column] if sort_name == "id" else [sort_column, id_column]
+
+    cursor = args.get("cursor")
+    if cursor:
+        cursor_sort, value, last_id = decode_cursor(cursor)
+        if cursor_sort != sort:
+            raise ValueError("Cursor does not match the requested sort")
+        if value is not None and isinstance(sort_column.type, DateTime):
+            value = datetime.fromisoformat(value)
+        bound = tuple_(value, last_id)
+        query = query.filter(keyset < bound if descending else keyset > bound)
+
+    query = query.order_by(
+        *[column.desc() if descending else column.asc() for column in order_columns]
+    )
+
+    selected = query.selected_columns
+    missing = {
+        column.key: column
+        for column in (sort_column, id_column)
+        if column.key not in selected
+    }
+    if missing:
+        query = query.add_columns(*missing.values())
+
+    rows = db.session.execute(query.limit(limit + 1)).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort, getattr(last, sort_name), last.id)
+    return rows, next_cursor
@@ -0,0 +1,70 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from flask import current_app
+from lib.utils import bcrypt
+
+BCRYPT_COST = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_lock = threading.Lock()
+_executor = None
+_slots = None
+
+
+class PasswordPoolBusy(Exception):
+    pass
+
+
+def _pool():
+    # Created on first use in each process, so a pool built before a fork
+    # (gunicorn --preload) is never shared with the workers.
+    global _executor, _slots
+    with _lock:
+        if _executor is None:
+            size = current_app.config["BCRYPT_POOL_SIZE"]
+            _executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="bcrypt")
+            _slots = threading.BoundedSemaphore(
+                size + current_app.config["BCRYPT_QUEUE_LIMIT"]
+            )
+    return _executor, _slots
+
+
+def _run(fn, *args):
+    """Run ``fn`` on the bcrypt pool and wait for it.
+
+    bcrypt releases the GIL, so the pool bounds how many cores hashing can
+    take at once across the request threads of a gthread worker (see
+    gunicorn.conf.py). Calls beyond the queue limit, and calls still waiting
+    after BCRYPT_TIMEOUT, fail with PasswordPoolBusy instead of piling up
+    behind a login burst.
+    """
+    executor, slots = _pool()
+    if not slots.acquire(blocking=False):
+        raise PasswordPoolBusy("Too many password operations in progress")
+    try:
+        future = executor.submit(fn, *args)
+    except Exception:
+        slots.release()
+        raise
+    future.add_done_callback(lambda _: slots.release())
+    try:
+        return future.result(timeout=current_app.config["BCRYPT_TIMEOUT"])
+    except FutureTimeout:
+        future.cancel()
+        raise PasswordPoolBusy("Timed out waiting for a password operation")
+
+
+def hash_password(password):
+    rounds = current_app.config["BCRYPT_LOG_ROUNDS"]
+    return _run(bcrypt.generate_password_hash, password, rounds).decode("utf-8")
+
+
+def check_password(password_hash, password):
+    return _run(bcrypt.check_password_hash, password_hash, password)
+
+
+def needs_rehash(password_hash):
+    match = BCRYPT_COST.match(password_hash or "")
+    # Only ever raise the cost: lowering BCRYPT_LOG_ROUNDS must not weaken
+    # the hashes already stored.
+    return match is None or int(match.group(1)) < current_app.config["BCRYPT_LOG_ROUNDS"]
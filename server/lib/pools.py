@@ -0,0 +1,98 @@
+import redis
+from flask_caching.backends import RedisCache
+from sqlalchemy.pool import NullPool
+
+
+def engine_options(config):
+    """SQLAlchemy engine options built from the ``DB_POOL_*`` settings."""
+    if config["SQLALCHEMY_DATABASE_URI"].startswith("sqlite"):
+        # Flask-SQLAlchemy picks the right pool for SQLite itself.
+        return {}
+    if config["DB_PGBOUNCER"]:
+        # PgBouncer in transaction mode already pools server connections and
+        # may hand each transaction a different one, so hold none open here.
+        return {"poolclass": NullPool}
+    return {
+        "pool_size": config["DB_POOL_SIZE"],
+        "max_overflow": config["DB_MAX_OVERFLOW"],
+        "pool_timeout": config["DB_POOL_TIMEOUT"],
+        "pool_recycle": config["DB_POOL_RECYCLE"],
+        "pool_pre_ping": config["DB_POOL_PRE_PING"],
+    }
+
+
+class RedisPool:
+    """One Redis connection pool per process, shared by the cache, the
+    stale-while-revalidate locks and the scheduler lease.
+    """
+
+    def __init__(self):
+        self.pool = None
+        self.client = None
+
+    def init_app(self, app):
+        config = app.config
+        url, options = config["REDIS_URL"], {}
+        if url.startswith("fakeredis://"):
+            # In-process Redis for offline benchmarks; needs the fakeredis
+            # package, which is not a runtime requirement.
+            import fakeredis
+
+            url = "redis://" + url[len("fakeredis://"):]
+            options = {
+                "connection_class": fakeredis.FakeConnection,
+                "server": fakeredis.FakeServer(),
+            }
+        self.pool = redis.BlockingConnectionPool.from_url(
+            url,
+            max_connections=config["REDIS_MAX_CONNECTIONS"],
+            timeout=config["REDIS_POOL_TIMEOUT"],
+            socket_timeout=config["REDIS_SOCKET_TIMEOUT"],
+            socket_connect_timeout=config["REDIS_SOCKET_TIMEOUT"],
+            health_check_interval=config["REDIS_HEALTH_CHECK_INTERVAL"],
+            retry_on_timeout=True,
+            **options,
+        )
+        self.client = redis.Redis(connection_pool=self.pool)
+        app.extensions["redis_pool"] = self
+
+    def metrics(self):
+        if self.pool is None:
+            return None
+        # Checked-out connections are the slots missing from the queue; the
+        # queue holds idle connections plus placeholders for unopened ones.
+        in_use = self.pool.max_connections - self.pool.pool.qsize()
+        opened = len(self.pool._connections)
+        return {
+            "max_connections": self.pool.max_connections,
+            "opened": opened,
+            "in_use": in_use,
+            "idle": opened - in_use,
+        }
+
+
+class SharedRedisCache(RedisCache):
+    """Flask-Caching backend that talks through the app's ``RedisPool``."""
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        key_prefix = config.get("CACHE_KEY_PREFIX")
+        if key_prefix:
+            kwargs["key_prefix"] = key_prefix
+        return cls(app.extensions["redis_pool"].client, *args, **kwargs)
+
+
+def database_pool_metrics(engines):
+    metrics = {}
+    for name, engine in engines.items():
+        pool = engine.pool
+        entry = {"pool": type(pool).__name__}
+        if hasattr(pool, "checkedout"):
+            entry.update(
+                size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow=pool.overflow(),
+            )
+        metrics[name or "default"] = entry
+    return metrics
@@ -0,0 +1,141 @@
+import os
+import sysconfig
+import traceback
+from collections import Counter
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+GUARD_FILE = os.path.abspath(__file__)
+SERVER_DIR = os.path.dirname(os.path.dirname(GUARD_FILE))
+LIBRARY_DIRS = tuple(
+    {os.path.abspath(sysconfig.get_paths()[key]) for key in ("stdlib", "purelib", "platlib")}
+)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit):
+    """Allow the decorated view ``limit`` statements instead of QUERY_BUDGET.
+
+    ``None`` exempts the view, for bulk endpoints whose statement count
+    grows with the payload by design.
+    """
+
+    def decorator(view):
+        view.query_budget = limit
+        return view
+
+    return decorator
+
+
+def route_budget(app, endpoint):
+    view = app.view_functions.get(endpoint)
+    return getattr(view, "query_budget", app.config["QUERY_BUDGET"])
+
+
+def _call_site():
+    # The innermost frame outside the standard library, installed packages
+    # and this module: the app code that issued the statement.
+    for frame in reversed(traceback.extract_stack()):
+        filename = os.path.abspath(frame.filename)
+        if filename == GUARD_FILE or filename.startswith(LIBRARY_DIRS):
+            continue
+        if filename.startswith(SERVER_DIR):
+            filename = os.path.relpath(filename, SERVER_DIR)
+        return f"{filename}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def _shorten(statement, length=200):
+    statement = " ".join(statement.split())
+    return statement if len(statement) <= length else statement[:length] + "..."
+
+
+def query_problems(statements, budget, repeat_limit, sites=None):
+    """Describe the budget overrun and the statements repeated at least
+    ``repeat_limit`` times (the shape of an N+1 loop) in ``statements``.
+    """
+    sites = sites or {}
+    problems = []
+    if len(statements) > budget:
+        problem = f"{len(statements)} statements, budget {budget}"
+        if "budget" in sites:
+            problem += f", exceeded at {sites['budget']}"
+        problems.append(problem)
+    for statement, count in Counter(statements).most_common():
+        if count < repeat_limit:
+            break
+        problem = f"{count}x {_shorten(statement)}"
+        if statement in sites:
+            problem += f" from {sites[statement]}"
+        problems.append(problem)
+    return problems
+
+
+class RequestQueries:
+    def __init__(self, budget, repeat_limit):
+        self.budget = budget
+        self.repeat_limit = repeat_limit
+        self.statements = []
+        self.counts = Counter()
+        self.sites = {}
+
+    def record(self, statement):
+        self.statements.append(statement)
+        self.counts[statement] += 1
+        # Stack walks are only paid for the statements that get reported.
+        if self.counts[statement] == self.repeat_limit:
+            self.sites[statement] = _call_site()
+        if len(self.statements) == self.budget + 1:
+            self.sites["budget"] = _call_site()
+
+    def problems(self):
+        return query_problems(
+            self.statements, self.budget, self.repeat_limit, self.sites
+        )
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if has_request_context():
+        queries = g.get("request_queries")
+        if queries is not None:
+            queries.record(statement)
+
+
+def _start_request():
+    budget = route_budget(current_app, request.endpoint)
+    if budget is not None:
+        g.request_queries = RequestQueries(
+            budget, current_app.config["QUERY_REPEAT_LIMIT"]
+        )
+
+
+def _check_request(response):
+    queries = g.pop("request_queries", None)
+    if queries is None:
+        return response
+    response.headers["X-Query-Count"] = str(len(queries.statements))
+    problems = queries.problems()
+    if problems:
+        route = f"{request.method} {request.path} ({request.endpoint})"
+        for problem in problems:
+            current_app.logger.warning(f"Query guard on {route}: {problem}")
+        if current_app.config["QUERY_GUARD_RAISE"]:
+            raise QueryBudgetExceeded(f"{route}: {'; '.join(problems)}")
+    return response
+
+
+def init_query_guard(app):
+    """Count the statements of every request and flag budget overruns and
+    repeated statements. Meant for development and test runs; production
+    leaves QUERY_GUARD off and pays nothing.
+    """
+    if not app.config["QUERY_GUARD"]:
+        return
+    app.before_request(_start_request)
+    app.after_request(_check_request)
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
@@ -0,0 +1,171 @@
+import re
+import threading
+from contextlib import contextmanager
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, func, select
+from db.models import db, User, Restaurant, Contact, Interaction
+from lib.query_guard import query_problems, route_budget
+
+# Routes exercised by the plan check. Tables listed next to a route may be
+# read in full by design (the analytics payloads cover every restaurant).
+PLAN_CHECK_ROUTES = [
+    ("/api/restaurants?limit=50", ()),
+    ("/api/restaurants?assigned_kam_id={kam_id}", ()),
+    ("/api/restaurants/{restaurant_id}", ()),
+    ("/api/contacts?limit=50", ()),
+    ("/api/contacts?restaurant_id={restaurant_id}", ()),
+    ("/api/contacts/{contact_id}", ()),
+    ("/api/interactions?limit=50&sort=-interaction_date", ()),
+    ("/api/interactions?restaurant_id={restaurant_id}", ()),
+    ("/api/interactions?contact_id={contact_id}", ()),
+    ("/api/interactions/{interaction_id}", ()),
+    ("/api/restaurants/{restaurant_id}/interactions", ()),
+    ("/api/restaurants/{restaurant_id}/interactions?type=call", ()),
+    ("/api/contacts/{contact_id}/interactions", ()),
+    ("/api/restaurants/performance_score", ("restaurants", "restaurant_stats")),
+    ("/api/restaurants/underperforming", ("restaurants", "restaurant_stats")),
+    (
+        "/api/restaurants/average_interaction_duration",
+        ("restaurants", "restaurant_stats"),
+    ),
+    ("/api/dashboard", ("restaurants", "restaurant_stats")),
+    ("/api/calls/due?kam_id={kam_id}", ()),
+    ("/api/users/{kam_id}/portfolio", ()),
+    ("/api/kams/summary", ("users", "restaurants", "restaurant_stats")),
+    ("/api/analytics/timeseries?granularity=week", ()),
+    ("/api/analytics/timeseries?restaurant_id={restaurant_id}&group_by=type", ()),
+]
+
+SQLITE_SCAN = re.compile(r"^SCAN (\w+)(?! USING)")
+
+
+@contextmanager
+def capture_statements(engine):
+    statements = []
+    # Background jobs (e.g. the cache warmer) share the engine; only the
+    # replayed request's own statements count.
+    thread_id = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != thread_id:
+            return
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _postgres_seq_scans(plan):
+    tables = set()
+    if plan.get("Node Type") == "Seq Scan":
+        tables.add(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        tables |= _postgres_seq_scans(child)
+    return tables
+
+
+def seq_scanned_tables(connection, statement, parameters):
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        plan = connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar()
+        return _postgres_seq_scans(plan[0]["Plan"])
+    if dialect == "sqlite":
+        details = [
+            row[-1]
+            for row in connection.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+        ]
+        # An unfiltered rowid-ordered SCAN under LIMIT stops early, like an
+        # index scan on the primary key; with a filter or a sort it may have
+        # to read the whole table.
+        words = set(re.findall(r"\w+", statement.upper()))
+        sorts = any(detail.startswith("USE TEMP B-TREE") for detail in details)
+        if "LIMIT" in words and "WHERE" not in words and not sorts:
+            return set()
+        return {
+            match.group(1)
+            for match in (SQLITE_SCAN.match(detail) for detail in details)
+            if match
+        }
+    raise ValueError(f"Query plan check is not supported on {dialect}")
+
+
+def sample_ids():
+    restaurant_id = db.session.scalar(
+        select(Interaction.restaurant_id)
+        .group_by(Interaction.restaurant_id)
+        .order_by(func.count(Interaction.id).desc())
+        .limit(1)
+    )
+    return {
+        "restaurant_id": restaurant_id,
+        "kam_id": db.session.scalar(
+            select(Restaurant.assigned_kam_id).where(Restaurant.id == restaurant_id)
+        ),
+        "contact_id": db.session.scalar(
+            select(Contact.id).where(Contact.restaurant_id == restaurant_id).limit(1)
+        ),
+        "interaction_id": db.session.scalar(
+            select(Interaction.id).where(Interaction.restaurant_id == restaurant_id).limit(1)
+        ),
+    }
+
+
+def large_tables(min_rows):
+    tables = {}
+    for model in (User, Restaurant, Contact, Interaction):
+        count = db.session.scalar(select(func.count()).select_from(model))
+        if count >= min_rows:
+            tables[model.__tablename__] = count
+    return tables
+
+
+def check_query_plans(app, min_rows=1000):
+    """Run every route in PLAN_CHECK_ROUTES and EXPLAIN the SELECTs it emits.
+
+    Returns a list of ``(route, table, statement)`` for each sequential scan
+    on a table with at least ``min_rows`` rows that the route doesn't allow,
+    and ``(route, None, problem)`` for failed requests and for routes over
+    their query budget or repeating a statement (see lib/query_guard.py).
+    """
+    with app.app_context():
+        ids = sample_ids()
+        large = large_tables(min_rows)
+        headers = {
+            "Authorization": f"Bearer {create_access_token(identity=str(ids['kam_id']))}"
+        }
+
+    violations = []
+    client = app.test_client()
+    urls = app.url_map.bind("localhost")
+    for route, allowed in PLAN_CHECK_ROUTES:
+        url = route.format(**ids)
+        with app.app_context():
+            with capture_statements(db.engine) as statements:
+                response = client.get(url, headers=headers)
+            if response.status_code != 200:
+                violations.append((url, None, f"HTTP {response.status_code}"))
+                continue
+            endpoint, _ = urls.match(url.split("?")[0])
+            budget = route_budget(app, endpoint)
+            if budget is not None:
+                for problem in query_problems(
+                    [statement for statement, _ in statements],
+                    budget,
+                    app.config["QUERY_REPEAT_LIMIT"],
+                ):
+                    violations.append((url, None, problem))
+            with db.engine.connect() as connection:
+                for statement, parameters in statements:
+                    tables = seq_scanned_tables(connection, statement, parameters)
+                    for table in sorted(tables):
+                        if table in large and table not in allowed:
+                            violations.append((url, table, statement))
+    return violations
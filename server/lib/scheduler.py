@@ -0,0 +1,177 @@
+import atexit
+import os
+import socket
+import time
+import uuid
+from datetime import datetime
+from apscheduler.schedulers.background import BackgroundScheduler
+from redis.exceptions import RedisError
+from lib.metrics import record_job
+
+LEADER_KEY = "scheduler:leader"
+METRICS_KEY_PREFIX = "scheduler:job:"
+
+# Only extend or delete the lease if this process still holds it.
+RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class LeaderLease:
+    """A Redis lease naming the one process that runs scheduled jobs.
+
+    Every process calls ``refresh`` periodically: the holder extends the
+    lease, the others try to take it, so when the leader dies another
+    process takes over within ``ttl`` seconds.
+    """
+
+    def __init__(self, client, key=LEADER_KEY, ttl=30, logger=None):
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+        self.logger = logger
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.expires_at = 0.0
+        self._renew = client.register_script(RENEW_SCRIPT)
+        self._release = client.register_script(RELEASE_SCRIPT)
+
+    def refresh(self):
+        was_leader = self.is_leader()
+        started = time.monotonic()
+        try:
+            held = was_leader and self._renew(
+                keys=[self.key], args=[self.token, int(self.ttl * 1000)]
+            )
+            if not held:
+                held = self.client.set(
+                    self.key, self.token, nx=True, px=int(self.ttl * 1000)
+                )
+        except RedisError as e:
+            held = False
+            if self.logger:
+                self.logger.error(f"Error refreshing scheduler lease: {str(e)}")
+        self.expires_at = started + self.ttl if held else 0.0
+        if self.logger and bool(held) != was_leader:
+            state = "acquired" if held else "lost"
+            self.logger.info(f"Scheduler lease {state} by {self.token}")
+        return bool(held)
+
+    def is_leader(self):
+        return time.monotonic() < self.expires_at
+
+    def holder(self):
+        value = self.client.get(self.key)
+        return value.decode("utf-8") if value else None
+
+    def release(self):
+        if self.is_leader():
+            try:
+                self._release(keys=[self.key], args=[self.token])
+            except RedisError:
+                pass
+        self.expires_at = 0.0
+
+
+class LeasedScheduler:
+    """An APScheduler runner whose jobs only fire in the lease holder."""
+
+    def __init__(self, app, client):
+        self.app = app
+        self.client = client
+        self.lease = LeaderLease(
+            client, ttl=app.config["SCHEDULER_LEASE_TTL"], logger=app.logger
+        )
+        self.scheduler = BackgroundScheduler()
+        self.jobs = []
+        self.scheduler.add_job(
+            func=self.lease.refresh,
+            trigger="interval",
+            seconds=app.config["SCHEDULER_LEASE_RENEW_INTERVAL"],
+            id="scheduler_lease_job",
+            max_instances=1,
+            coalesce=True,
+        )
+
+    def add_job(self, func, id, **kwargs):
+        self.jobs.append(id)
+        self.scheduler.add_job(
+            func=lambda: self._run(id, func), id=id, replace_existing=True, **kwargs
+        )
+
+    def _run(self, job_id, func):
+        if not self.lease.is_leader():
+            return
+        started = time.perf_counter()
+        status = "success"
+        try:
+            func()
+        except Exception as e:
+            status = "failure"
+            self.app.logger.error(f"Scheduled job {job_id} failed: {str(e)}")
+        finally:
+            duration = time.perf_counter() - started
+            record_job(job_id, status, duration)
+            self._record(job_id, status, duration)
+
+    def _record(self, job_id, status, duration):
+        key = METRICS_KEY_PREFIX + job_id
+        try:
+            pipe = self.client.pipeline()
+            pipe.hincrby(key, "runs", 1)
+            if status == "failure":
+                pipe.hincrby(key, "failures", 1)
+            pipe.hincrbyfloat(key, "total_seconds", duration)
+            pipe.hset(
+                key,
+                mapping={
+                    "last_status": status,
+                    "last_seconds": round(duration, 6),
+                    "last_run_at": datetime.utcnow().isoformat(),
+                    "last_runner": self.lease.token,
+                },
+            )
+            pipe.execute()
+        except RedisError as e:
+            self.app.logger.error(f"Error recording metrics for {job_id}: {str(e)}")
+
+    def metrics(self):
+        result = {}
+        for job_id in self.jobs:
+            stored = self.client.hgetall(METRICS_KEY_PREFIX + job_id)
+            values = {
+                key.decode("utf-8"): value.decode("utf-8")
+                for key, value in stored.items()
+            }
+            result[job_id] = {
+                "runs": int(values.get("runs", 0)),
+                "failures": int(values.get("failures", 0)),
+                "total_seconds": float(values.get("total_seconds", 0)),
+                "last_seconds": (
+                    float(values["last_seconds"]) if "last_seconds" in values else None
+                ),
+                "last_status": values.get("last_status"),
+                "last_run_at": values.get("last_run_at"),
+                "last_runner": values.get("last_runner"),
+            }
+        return result
+
+    def start(self):
+        # Take the lease before the first jobs fire, so jobs scheduled to
+        # run at startup aren't skipped by the eventual leader.
+        self.lease.refresh()
+        self.scheduler.start()
+        atexit.register(self.shutdown)
+
+    def shutdown(self):
+        if self.scheduler.running:
+            self.scheduler.shutdown(wait=False)
+        self.lease.release()
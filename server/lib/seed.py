@@ -0,0 +1,197 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from db.models import (
+    db,
+    User,
+    Restaurant,
+    Contact,
+    Interaction,
+    UserRole,
+    RestaurantStatus,
+    CallFrequency,
+    InteractionType,
+    InteractionOutcome,
+    PreferredContactMethod,
+)
+from db.stats import rebuild_restaurant_stats
+from db.rollups import rebuild_interaction_rollups
+from db.calls import schedule_rows
+
+SEED_BATCH_SIZE = 5000
+
+# Skews that make the synthetic data behave like production: calls and emails
+# dominate, most interactions are recent, and a few restaurants account for
+# most of the activity.
+INTERACTION_TYPE_WEIGHTS = {
+    InteractionType.CALL: 45,
+    InteractionType.EMAIL: 25,
+    InteractionType.FOLLOW_UP: 15,
+    InteractionType.MEETING: 10,
+    InteractionType.SITE_VISIT: 5,
+}
+INTERACTION_OUTCOME_WEIGHTS = {
+    InteractionOutcome.SUCCESSFUL: 40,
+    InteractionOutcome.NEEDS_FOLLOW_UP: 30,
+    InteractionOutcome.NO_RESPONSE: 25,
+    InteractionOutcome.CANCELLED: 5,
+}
+# A Pareto tail truncated at ACTIVITY_MAX_WEIGHT: roughly 80% of interactions
+# land on 20% of restaurants, and the busiest one gets about 1% of them. An
+# uncapped tail has infinite variance and can hand half the rows to a single
+# restaurant, which the benchmarks would then measure instead of a typical
+# big account.
+ACTIVITY_PARETO_ALPHA = 0.8
+ACTIVITY_MAX_WEIGHT = 200
+RECENCY_MEAN_DAYS = 45
+HISTORY_DAYS = 365
+
+
+def _insert(model, rows):
+    for start in range(0, len(rows), SEED_BATCH_SIZE):
+        db.session.execute(model.__table__.insert(), rows[start : start + SEED_BATCH_SIZE])
+
+
+def _new_ids(model, after_id):
+    return db.session.scalars(
+        select(model.id).where(model.id > after_id).order_by(model.id)
+    ).all()
+
+
+def _max_id(model):
+    return db.session.query(func.coalesce(func.max(model.id), 0)).scalar()
+
+
+def seed_dataset(
+    restaurants=1000,
+    contacts_per_restaurant=4,
+    interactions_per_restaurant=100,
+    kams=20,
+    seed=42,
+):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+
+    after = _max_id(User)
+    _insert(
+        User,
+        [
+            {
+                "name": f"Seed KAM {i}",
+                "email": f"seed-kam-{after + i}@example.com",
+                "password_hash": "!",
+                "role": UserRole.KAM,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(kams)
+        ],
+    )
+    kam_ids = _new_ids(User, after)
+
+    after = _max_id(Restaurant)
+    restaurant_rows = [
+        {
+            "name": f"Seed Restaurant {i}",
+            "address": f"{i} Seed Street",
+            "status": rng.choice(list(RestaurantStatus)),
+            "call_frequency": rng.choice(list(CallFrequency)),
+            "last_call_date": now - timedelta(days=rng.randint(0, 60)),
+            "revenue": round(rng.uniform(0, 50000), 2),
+            "notes": "Seeded for load testing",
+            "assigned_kam_id": rng.choice(kam_ids) if kam_ids else None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for i in range(restaurants)
+    ]
+    _insert(Restaurant, schedule_rows(restaurant_rows))
+    restaurant_ids = _new_ids(Restaurant, after)
+
+    after = _max_id(Contact)
+    # At least one contact per restaurant, with a long tail of big accounts.
+    contact_counts = [
+        max(1, round(rng.expovariate(1 / contacts_per_restaurant)))
+        for _ in restaurant_ids
+    ]
+    contact_methods = list(PreferredContactMethod)
+    for start in range(0, len(restaurant_ids), SEED_BATCH_SIZE):
+        _insert(
+            Contact,
+            [
+                {
+                    "name": f"Seed Contact {restaurant_id}-{i}",
+                    "role": "Manager",
+                    "email": f"contact-{restaurant_id}-{i}@example.com",
+                    "phone": f"555{restaurant_id:07d}",
+                    "preferred_contact_method": rng.choice(contact_methods),
+                    "time_zone": "Asia/Kolkata",
+                    "restaurant_id": restaurant_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+                for restaurant_id, count in zip(
+                    restaurant_ids[start : start + SEED_BATCH_SIZE],
+                    contact_counts[start : start + SEED_BATCH_SIZE],
+                )
+                for i in range(count)
+            ],
+        )
+    contacts = db.session.execute(
+        select(Contact.id, Contact.restaurant_id).where(Contact.id > after)
+    ).all()
+    contacts_by_restaurant = {}
+    for contact_id, restaurant_id in contacts:
+        contacts_by_restaurant.setdefault(restaurant_id, []).append(contact_id)
+
+    activity = [
+        min(rng.paretovariate(ACTIVITY_PARETO_ALPHA), ACTIVITY_MAX_WEIGHT)
+        for _ in restaurant_ids
+    ]
+    scale = interactions_per_restaurant * len(restaurant_ids) / (sum(activity) or 1)
+    types, type_weights = zip(*INTERACTION_TYPE_WEIGHTS.items())
+    outcomes, outcome_weights = zip(*INTERACTION_OUTCOME_WEIGHTS.items())
+    history_minutes = HISTORY_DAYS * 24 * 60
+    recency = 1 / (RECENCY_MEAN_DAYS * 24 * 60)
+
+    interactions, interaction_count = [], 0
+    for restaurant_id, weight in zip(restaurant_ids, activity):
+        count = round(weight * scale)
+        if not count:
+            continue
+        contact_ids = contacts_by_restaurant[restaurant_id]
+        for kind, outcome, contact_id in zip(
+            rng.choices(types, type_weights, k=count),
+            rng.choices(outcomes, outcome_weights, k=count),
+            rng.choices(contact_ids, k=count),
+        ):
+            age = min(int(rng.expovariate(recency)), history_minutes)
+            interactions.append(
+                {
+                    "interaction_date": now - timedelta(minutes=age),
+                    "type": kind,
+                    "outcome": outcome,
+                    "details": "Seeded interaction",
+                    "duration_minutes": rng.randint(5, 90),
+                    "restaurant_id": restaurant_id,
+                    "contact_id": contact_id,
+                    "created_at": now,
+                    "updated_at": now,
+                }
+            )
+        if len(interactions) >= SEED_BATCH_SIZE:
+            _insert(Interaction, interactions)
+            interaction_count += len(interactions)
+            interactions = []
+    _insert(Interaction, interactions)
+    interaction_count += len(interactions)
+
+    db.session.commit()
+    rebuild_restaurant_stats()
+    rebuild_interaction_rollups()
+    return {
+        "users": len(kam_ids),
+        "restaurants": len(restaurant_ids),
+        "contacts": len(contacts),
+        "interactions": interaction_count,
+    }
@@ -0,0 +1,112 @@
+import time
+import uuid
+from functools import wraps
+from flask import current_app
+from lib.extensions import cache, redis_pool
+from lib.cache_tags import tag_versions
+from lib.metrics import record_cache_lookup
+from lib.scheduler import RELEASE_SCRIPT
+
+LOCK_POLL_INTERVAL = 0.05
+
+
+def _is_fresh(entry, versions, soft_ttl):
+    return entry["versions"] == versions and time.time() < entry["created"] + soft_ttl
+
+
+def swr_cached(key, tags=(), soft_ttl=300, hard_ttl=3600, lock_timeout=30):
+    """Cache a payload function with single-flight, stale-while-revalidate
+    semantics.
+
+    An entry is fresh for ``soft_ttl`` seconds and as long as the generations
+    of ``tags`` are unchanged. A stale entry is still served, up to
+    ``hard_ttl``, while the one process holding the refresh lock recomputes
+    it; on a cold miss the other processes wait for that recomputation
+    instead of running it themselves.
+    """
+    # The lock lives in Redis as a plain string, next to the cache, so it can
+    # be compared and deleted atomically by the lease's release script.
+    lock_key = f"swr_lock:{key}"
+
+    def decorator(fn):
+        def store():
+            versions = tag_versions(tags)
+            payload = fn()
+            cache.set(
+                key,
+                {"payload": payload, "versions": versions, "created": time.time()},
+                timeout=hard_ttl,
+            )
+            return payload
+
+        def acquire():
+            token = uuid.uuid4().hex
+            acquired = redis_pool.client.set(lock_key, token, nx=True, ex=lock_timeout)
+            return token if acquired else None
+
+        def release(token):
+            # Only delete the lock if it is still ours: it may have expired
+            # during a slow refresh and been taken by another process.
+            redis_pool.client.register_script(RELEASE_SCRIPT)(
+                keys=[lock_key], args=[token]
+            )
+
+        def refresh():
+            token = acquire()
+            if token is None:
+                return None
+            try:
+                return store()
+            finally:
+                release(token)
+
+        def wait_for_refresh():
+            deadline = time.time() + lock_timeout
+            while time.time() < deadline:
+                time.sleep(LOCK_POLL_INTERVAL)
+                entry = cache.get(key)
+                if entry is not None:
+                    return entry["payload"]
+                if not redis_pool.client.exists(lock_key):
+                    break
+            return None
+
+        @wraps(fn)
+        def wrapper():
+            try:
+                entry = cache.get(key)
+                if entry is not None and _is_fresh(entry, tag_versions(tags), soft_ttl):
+                    record_cache_lookup(key, "hit")
+                    return entry["payload"]
+                record_cache_lookup(key, "miss" if entry is None else "stale")
+                token = acquire()
+            except Exception as e:
+                current_app.logger.error(f"Cache error for {key}: {str(e)}")
+                record_cache_lookup(key, "error")
+                return fn()
+
+            if token is not None:
+                try:
+                    return store()
+                finally:
+                    release(token)
+            if entry is not None:
+                return entry["payload"]
+            try:
+                payload = wait_for_refresh()
+            except Exception as e:
+                current_app.logger.error(f"Cache error for {key}: {str(e)}")
+                payload = None
+            return payload if payload is not None else fn()
+
+        def warm():
+            entry = cache.get(key)
+            if entry is None or not _is_fresh(entry, tag_versions(tags), soft_ttl):
+                return refresh() is not None
+            return False
+
+        wrapper.refresh = refresh
+        wrapper.warm = warm
+        return wrapper
+
+    return decorator
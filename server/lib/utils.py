@@ -1,20 +1,19 @@
 from flask_bcrypt import Bcrypt
-import requests
-from  lib.extensions import cache
-from apscheduler.schedulers.background import BackgroundScheduler
+from lib.cache_tags import TABLE_TAGS, bump_tags
 import os
 
 bcrypt = Bcrypt()
 
 
-def invalidate_cache():
-    cache.delete("average_interaction_duration_all")
-    cache.delete("performance_score_all")
-    cache.delete("underperforming_restaurants")
-    cache.delete("test_average_interaction_duration_all")
+def invalidate_cache(*tags):
+    # ORM writes bump their own tags on commit (see lib/cache_tags.py); this
+    # is for Core statements that bypass the session events.
+    bump_tags(tags or TABLE_TAGS.values())
 
 
 def ping_server():
+    import requests
+
     try:
         api_url = os.getenv("API_URL", "http://localhost:5000")
         response = requests.get(f"{api_url}/health")
@@ -23,8 +22,3 @@ def ping_server():
     except Exception as e:
         print(f"Error pinging server: {str(e)}")
 
-
-def configure_scheduler(app):
-    scheduler = BackgroundScheduler()
-    scheduler.add_job(func=ping_server, trigger="interval", minutes=10)
-    scheduler.start()
@@ -0,0 +1,62 @@
+"""add restaurant_stats summary table
+
+Revision ID: 1ff8cebfe056
+Revises: 1a3c134f362f
+Create Date: 2026-10-18 09:20:41.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1ff8cebfe056'
+down_revision = '1a3c134f362f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'restaurant_stats',
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('interaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_interaction_date', sa.DateTime(), nullable=True),
+        sa.Column('successful_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('needs_follow_up_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('no_response_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cancelled_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text('NOW()')),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id']),
+        sa.PrimaryKeyConstraint('restaurant_id')
+    )
+
+    # Backfill from the existing interactions; afterwards the rows are kept
+    # current by the session events in db/stats.py.
+    op.execute("""
+        INSERT INTO restaurant_stats (
+            restaurant_id, interaction_count, duration_sum, duration_count,
+            last_interaction_date, successful_count, needs_follow_up_count,
+            no_response_count, cancelled_count, updated_at
+        )
+        SELECT
+            r.id,
+            COUNT(i.id),
+            COALESCE(SUM(i.duration_minutes), 0),
+            COUNT(i.duration_minutes),
+            MAX(i.interaction_date),
+            COALESCE(SUM(CASE WHEN i.outcome = 'SUCCESSFUL' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'NEEDS_FOLLOW_UP' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'NO_RESPONSE' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'CANCELLED' THEN 1 ELSE 0 END), 0),
+            NOW()
+        FROM restaurants r
+        LEFT JOIN interactions i ON i.restaurant_id = r.id
+        GROUP BY r.id
+    """)
+
+
+def downgrade():
+    op.drop_table('restaurant_stats')
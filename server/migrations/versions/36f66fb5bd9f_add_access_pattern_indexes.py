@@ -0,0 +1,50 @@
+"""add indexes for foreign keys and interaction timelines
+
+Revision ID: 36f66fb5bd9f
+Revises: 1ff8cebfe056
+Create Date: 2026-10-18 09:41:07.532981
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '36f66fb5bd9f'
+down_revision = '1ff8cebfe056'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_interactions_restaurant_id_interaction_date', 'interactions', ['restaurant_id', 'interaction_date']),
+    ('ix_interactions_contact_id', 'interactions', ['contact_id']),
+    ('ix_interactions_interaction_date_id', 'interactions', ['interaction_date', 'id']),
+    ('ix_contacts_restaurant_id', 'contacts', ['restaurant_id']),
+    ('ix_restaurants_assigned_kam_id', 'restaurants', ['assigned_kam_id']),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block, so on
+    # Postgres the indexes are built in autocommit mode without locking out
+    # writes. Other dialects ignore the postgresql_concurrently flag.
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,69 @@
+"""extend interaction indexes to cover the timeline keyset
+
+Revision ID: 4b7e2d9c51a8
+Revises: 36f66fb5bd9f
+Create Date: 2026-10-18 10:12:44.108356
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4b7e2d9c51a8'
+down_revision = '36f66fb5bd9f'
+branch_labels = None
+depends_on = None
+
+
+# (new index, columns, index it supersedes, its columns)
+INDEXES = [
+    (
+        'ix_interactions_restaurant_id_interaction_date_id',
+        ['restaurant_id', 'interaction_date', 'id'],
+        'ix_interactions_restaurant_id_interaction_date',
+        ['restaurant_id', 'interaction_date'],
+    ),
+    (
+        'ix_interactions_contact_id_interaction_date_id',
+        ['contact_id', 'interaction_date', 'id'],
+        'ix_interactions_contact_id',
+        ['contact_id'],
+    ),
+]
+
+
+def upgrade():
+    # Build the replacement before dropping the old index so lookups by
+    # restaurant or contact are never left without one.
+    with op.get_context().autocommit_block():
+        for name, columns, old_name, old_columns in INDEXES:
+            op.create_index(
+                name,
+                'interactions',
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+            op.drop_index(
+                old_name,
+                table_name='interactions',
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, columns, old_name, old_columns in reversed(INDEXES):
+            op.create_index(
+                old_name,
+                'interactions',
+                old_columns,
+                unique=False,
+                postgresql_concurrently=True,
+            )
+            op.drop_index(
+                name,
+                table_name='interactions',
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,83 @@
+"""add next_call_due_at to restaurants for the due-call queue
+
+Revision ID: 5d2e7a91c4b3
+Revises: 4b7e2d9c51a8
+Create Date: 2026-10-18 11:02:17.604215
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2e7a91c4b3'
+down_revision = '4b7e2d9c51a8'
+branch_labels = None
+depends_on = None
+
+
+# Mirrors CALL_INTERVALS in db/calls.py.
+CALL_INTERVAL_DAYS = {'DAILY': 1, 'WEEKLY': 7, 'MONTHLY': 30}
+
+NEW_INDEX = (
+    'ix_restaurants_assigned_kam_id_next_call_due_at_id',
+    ['assigned_kam_id', 'next_call_due_at', 'id'],
+)
+OLD_INDEX = ('ix_restaurants_assigned_kam_id', ['assigned_kam_id'])
+
+
+def _add_days(dialect, column, days):
+    if dialect == 'postgresql':
+        return f"{column} + interval '{days} days'"
+    return f"datetime({column}, '+{days} days')"
+
+
+def upgrade():
+    op.add_column(
+        'restaurants', sa.Column('next_call_due_at', sa.DateTime(), nullable=True)
+    )
+    dialect = op.get_bind().dialect.name
+    # Restaurants never called are due from the moment they were created;
+    # lost restaurants stay out of the queue.
+    op.execute(
+        "UPDATE restaurants SET next_call_due_at = created_at "
+        "WHERE last_call_date IS NULL AND status != 'LOST'"
+    )
+    for frequency, days in CALL_INTERVAL_DAYS.items():
+        op.execute(
+            f"UPDATE restaurants "
+            f"SET next_call_due_at = {_add_days(dialect, 'last_call_date', days)} "
+            f"WHERE last_call_date IS NOT NULL AND status != 'LOST' "
+            f"AND call_frequency = '{frequency}'"
+        )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            NEW_INDEX[0],
+            'restaurants',
+            NEW_INDEX[1],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            OLD_INDEX[0],
+            table_name='restaurants',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            OLD_INDEX[0],
+            'restaurants',
+            OLD_INDEX[1],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            NEW_INDEX[0],
+            table_name='restaurants',
+            postgresql_concurrently=True,
+        )
+    op.drop_column('restaurants', 'next_call_due_at')
@@ -0,0 +1,75 @@
+"""add interaction_rollups daily summary table
+
+Revision ID: 6c3a8f1e2b47
+Revises: 5d2e7a91c4b3
+Create Date: 2026-10-18 12:14:52.381906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6c3a8f1e2b47'
+down_revision = '5d2e7a91c4b3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    interaction_type = postgresql.ENUM(
+        'CALL', 'MEETING', 'EMAIL', 'SITE_VISIT', 'FOLLOW_UP',
+        name='interactiontype',
+        create_type=False,
+    )
+    op.create_table(
+        'interaction_rollups',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('restaurant_id', sa.Integer(), nullable=False),
+        sa.Column('type', interaction_type, nullable=False),
+        sa.Column('interaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_sum', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('duration_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('successful_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('needs_follow_up_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('no_response_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('cancelled_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.ForeignKeyConstraint(['restaurant_id'], ['restaurants.id']),
+        sa.PrimaryKeyConstraint('day', 'restaurant_id', 'type')
+    )
+    op.create_index(
+        'ix_interaction_rollups_restaurant_id_day',
+        'interaction_rollups',
+        ['restaurant_id', 'day'],
+        unique=False,
+    )
+
+    # Backfill from the existing interactions; afterwards the rows are kept
+    # current by the session events in db/rollups.py, and
+    # `flask rollups rebuild` recomputes them.
+    op.execute("""
+        INSERT INTO interaction_rollups (
+            day, restaurant_id, type, interaction_count, duration_sum,
+            duration_count, successful_count, needs_follow_up_count,
+            no_response_count, cancelled_count
+        )
+        SELECT
+            date(i.interaction_date),
+            i.restaurant_id,
+            i.type,
+            COUNT(i.id),
+            COALESCE(SUM(i.duration_minutes), 0),
+            COUNT(i.duration_minutes),
+            COALESCE(SUM(CASE WHEN i.outcome = 'SUCCESSFUL' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'NEEDS_FOLLOW_UP' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'NO_RESPONSE' THEN 1 ELSE 0 END), 0),
+            COALESCE(SUM(CASE WHEN i.outcome = 'CANCELLED' THEN 1 ELSE 0 END), 0)
+        FROM interactions i
+        GROUP BY date(i.interaction_date), i.restaurant_id, i.type
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_interaction_rollups_restaurant_id_day', table_name='interaction_rollups')
+    op.drop_table('interaction_rollups')
@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from db.analytics import interaction_timeseries
+from db.models import InteractionType
+from  lib.cache_tags import kam_tag, tagged_key
+from  lib.extensions import cache
+from  lib.metrics import record_cache_lookup
+from  lib.pagination import parse_date
+
+analytics_bp = Blueprint("analytics_bp", __name__)
+
+DEFAULT_TIMESERIES_DAYS = 90
+# Keys embed the "interactions" tag version, so any interaction write retires
+# every cached series, plus the KAM's tag for ``kam_id`` series, which also
+# change when restaurants are reassigned. The TTL only evicts series nobody
+# asks for again.
+TIMESERIES_CACHE_TTL = 3600
+
+
+@analytics_bp.route("/analytics/timeseries", methods=["GET"])
+@jwt_required()
+def get_interaction_timeseries():
+    """Interactions per day, week or month between ``start`` and ``end``
+    (default: the last 90 days), optionally for one restaurant or KAM, one
+    interaction type, or split by type with ``group_by=type``.
+    """
+    try:
+        args = request.args
+        today = datetime.utcnow().date()
+        end = parse_date(args, "end")
+        end = end.date() if end else today
+        start = parse_date(args, "start")
+        start = start.date() if start else end - timedelta(days=DEFAULT_TIMESERIES_DAYS - 1)
+        granularity = args.get("granularity", "day")
+        restaurant_id = int(args["restaurant_id"]) if args.get("restaurant_id") else None
+        kam_id = int(args["kam_id"]) if args.get("kam_id") else None
+        interaction_type = (
+            InteractionType[args["type"].upper()] if args.get("type") else None
+        )
+        by_type = args.get("group_by") == "type"
+
+        tags = ["interactions"]
+        if kam_id is not None:
+            tags.append(kam_tag(kam_id))
+        make_key = tagged_key(
+            f"timeseries:{start}:{end}:{granularity}:{restaurant_id}:{kam_id}:"
+            f"{interaction_type and interaction_type.name}:{by_type}",
+            *tags,
+        )
+        key = make_key()
+        series = cache.get(key)
+        record_cache_lookup("timeseries", "miss" if series is None else "hit")
+        if series is None:
+            series = interaction_timeseries(
+                start,
+                end,
+                granularity,
+                restaurant_id=restaurant_id,
+                kam_id=kam_id,
+                interaction_type=interaction_type,
+                by_type=by_type,
+            )
+            cache.set(key, series, timeout=TIMESERIES_CACHE_TTL)
+        current_app.logger.info(
+            f"Fetched {granularity} interaction timeseries from {start} to {end}"
+        )
+        return (
+            jsonify(
+                {
+                    "start": start.isoformat(),
+                    "end": end.isoformat(),
+                    "granularity": granularity,
+                    "series": series,
+                }
+            ),
+            200,
+        )
+    except KeyError as e:
+        current_app.logger.error(f"Invalid value for key: {e}")
+        return jsonify({"error": f"Invalid value: {e}"}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error fetching interaction timeseries: {str(e)}")
+        return jsonify({"error": str(e)}), 400
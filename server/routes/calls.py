@@ -0,0 +1,66 @@
+from datetime import timedelta
+from flask import Blueprint, request, jsonify, current_app
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from db.calls import overdue_before
+from db.models import Restaurant
+from db.serializers import serializer
+from  lib.fields import select_fields
+from  lib.pagination import paginate, parse_date
+
+call_bp = Blueprint("call_bp", __name__)
+
+CALL_QUEUE_FIELDS = (
+    "id",
+    "name",
+    "status",
+    "call_frequency",
+    "last_call_date",
+    "next_call_due_at",
+)
+
+
+@call_bp.route("/calls/due", methods=["GET"])
+@jwt_required()
+def get_due_calls():
+    """A KAM's call queue: restaurants due by the end of ``until`` (default
+    today), most overdue first. Defaults to the signed-in KAM.
+    """
+    try:
+        args = request.args
+        kam_id = int(args.get("kam_id") or get_jwt_identity())
+        today = overdue_before()
+        due_before = (parse_date(args, "until") or today) + timedelta(days=1)
+
+        # Equality on the KAM and a range on next_call_due_at, ordered by
+        # (next_call_due_at, id): one range scan of the queue index.
+        query = select_fields(Restaurant, CALL_QUEUE_FIELDS).filter(
+            Restaurant.assigned_kam_id == kam_id,
+            Restaurant.next_call_due_at < due_before,
+        )
+        restaurants, next_cursor = paginate(
+            query,
+            Restaurant,
+            ("next_call_due_at",),
+            args,
+            default_sort="next_call_due_at",
+        )
+        serialize = serializer(Restaurant, CALL_QUEUE_FIELDS)
+        result = [
+            {**serialize(r), "overdue": r.next_call_due_at < today}
+            for r in restaurants
+        ]
+        current_app.logger.info(f"Fetched due calls for KAM {kam_id}")
+        return (
+            jsonify(
+                {
+                    "kam_id": kam_id,
+                    "due_before": due_before.isoformat(),
+                    "items": result,
+                    "next_cursor": next_cursor,
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error fetching due calls: {str(e)}")
+        return jsonify({"error": str(e)}), 400
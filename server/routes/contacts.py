@@ -1,7 +1,20 @@
 from flask import Blueprint, request, jsonify, current_app
-from db.models import Interaction, db, Contact, PreferredContactMethod
+from db.models import Interaction, db, Contact, PreferredContactMethod, Restaurant
 from flask_jwt_extended import jwt_required
-from  lib.utils import invalidate_cache
+from  lib.bulk_import import import_records, records_from_request
+from  lib.bulk_delete import delete_records, ids_from_request
+from  lib.query_guard import query_budget
+from  lib.pagination import paginate
+from routes.interactions import interaction_preview
+from  lib.fields import (
+    include_options,
+    load_fields,
+    parse_fields,
+    parse_include,
+    select_fields,
+    serialize_included,
+)
+from db.serializers import CONTACT_FIELDS, serializer
 
 contact_bp = Blueprint("contact_bp", __name__)
 
@@ -10,26 +23,28 @@ contact_bp = Blueprint("contact_bp", __name__)
 @jwt_required()
 def get_contacts():
     try:
-        contacts = Contact.query.all()
-        result = [
-            {
-                "id": c.id,
-                "name": c.name,
-                "role": c.role,
-                "email": c.email,
-                "phone": c.phone,
-                "preferred_contact_method": (
-                    c.preferred_contact_method.value
-                    if c.preferred_contact_method
-                    else None
-                ),
-                "time_zone": c.time_zone,
-                "restaurant_id": c.restaurant_id,
-            }
-            for c in contacts
-        ]
+        args = request.args
+        fields = parse_fields(args, CONTACT_FIELDS)
+        query = select_fields(Contact, fields)
+        if args.get("restaurant_id"):
+            query = query.filter_by(restaurant_id=int(args["restaurant_id"]))
+        if args.get("preferred_contact_method"):
+            query = query.filter_by(
+                preferred_contact_method=PreferredContactMethod[
+                    args["preferred_contact_method"].upper()
+                ]
+            )
+
+        contacts, next_cursor = paginate(
+            query, Contact, ("id", "name", "created_at", "updated_at"), args
+        )
+        serialize = serializer(Contact, fields)
+        result = [serialize(c) for c in contacts]
         current_app.logger.info("Fetched contacts successfully")
-        return jsonify(result), 200
+        return jsonify({"items": result, "next_cursor": next_cursor}), 200
+    except KeyError as e:
+        current_app.logger.error(f"Invalid value for key: {e}")
+        return jsonify({"error": f"Invalid value: {e}"}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching contacts: {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -55,7 +70,6 @@ def create_contact():
         )
         db.session.add(new_contact)
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Created contact with ID {new_contact.id}")
         return jsonify({"message": "Contact created", "id": new_contact.id}), 201
     except KeyError as e:
@@ -67,31 +81,58 @@ def create_contact():
         return jsonify({"error": str(e)}), 400
 
 
+@contact_bp.route("/contacts/bulk", methods=["POST"])
+@jwt_required()
+@query_budget(None)
+def bulk_create_contacts():
+    try:
+        result = import_records("contacts", records_from_request(request))
+        current_app.logger.info(
+            f"Bulk imported {result['created']} contacts with "
+            f"{len(result['errors'])} errors"
+        )
+        return jsonify(result), 201 if result["created"] else 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk importing contacts: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+CONTACT_RESTAURANT_FIELDS = ("id", "name")
+CONTACT_INTERACTION_FIELDS = ("id", "type", "outcome", "interaction_date")
+
+CONTACT_RELATIONS = {
+    "restaurant": (Contact.restaurant, Restaurant, CONTACT_RESTAURANT_FIELDS),
+}
+CONTACT_INCLUDES = (*CONTACT_RELATIONS, "interactions")
+
+
 @contact_bp.route("/contacts/<int:contact_id>", methods=["GET"])
 @jwt_required()
 def get_contact_by_id(contact_id):
     try:
-        contact = Contact.query.get_or_404(contact_id)
-        current_app.logger.info(f"Fetched contact with ID {contact.id}")
-        return (
-            jsonify(
-                {
-                    "id": contact.id,
-                    "name": contact.name,
-                    "role": contact.role,
-                    "email": contact.email,
-                    "phone": contact.phone,
-                    "preferred_contact_method": (
-                        contact.preferred_contact_method.value
-                        if contact.preferred_contact_method
-                        else None
-                    ),
-                    "time_zone": contact.time_zone,
-                    "restaurant_id": contact.restaurant_id,
-                }
-            ),
-            200,
+        fields = parse_fields(request.args, CONTACT_FIELDS)
+        include = parse_include(request.args, CONTACT_INCLUDES)
+        relations = [name for name in include if name in CONTACT_RELATIONS]
+        contact = (
+            Contact.query.options(
+                load_fields(Contact, fields),
+                *include_options(CONTACT_RELATIONS, relations),
+            )
+            .filter_by(id=contact_id)
+            .first_or_404()
         )
+        result = serializer(Contact, fields)(contact)
+        result.update(serialize_included(contact, CONTACT_RELATIONS, relations))
+        if "interactions" in include:
+            interactions, next_cursor = interaction_preview(
+                Interaction.contact_id == contact.id, CONTACT_INTERACTION_FIELDS
+            )
+            serialize = serializer(Interaction, CONTACT_INTERACTION_FIELDS)
+            result["interactions"] = [serialize(i) for i in interactions]
+            result["interactions_next_cursor"] = next_cursor
+        current_app.logger.info(f"Fetched contact with ID {contact.id}")
+        return jsonify(result), 200
     except Exception as e:
         current_app.logger.error(
             f"Error fetching contact with ID {contact_id}: {str(e)}"
@@ -115,7 +156,6 @@ def update_contact(contact_id):
             ]
         contact.time_zone = data.get("time_zone", contact.time_zone)
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Updated contact with ID {contact.id}")
         return jsonify({"message": "Contact updated"}), 200
     except KeyError as e:
@@ -132,16 +172,32 @@ def update_contact(contact_id):
 @contact_bp.route("/contacts/<int:contact_id>", methods=["DELETE"])
 @jwt_required()
 def delete_contact(contact_id):
-    contact = Contact.query.get_or_404(contact_id)
+    Contact.query.get_or_404(contact_id)
     try:
-        interactions = Interaction.query.filter_by(contact_id=contact_id).all()
-        for interaction in interactions:
-            db.session.delete(interaction)
-        db.session.commit()
-        db.session.delete(contact)
-        db.session.commit()
-        invalidate_cache()
+        result, job_id = delete_records("contacts", [contact_id])
+        if job_id:
+            current_app.logger.info(
+                f"Scheduled deletion of contact with ID {contact_id} as job {job_id}"
+            )
+            return jsonify(result), 202
+        current_app.logger.info(f"Deleted contact with ID {contact_id}")
         return jsonify({"message": "Contact deleted"}), 200
     except Exception as e:
         db.session.rollback()
+        current_app.logger.error(
+            f"Error deleting contact with ID {contact_id}: {str(e)}"
+        )
+        return jsonify({"error": str(e)}), 400
+
+
+@contact_bp.route("/contacts/bulk", methods=["DELETE"])
+@jwt_required()
+def bulk_delete_contacts():
+    try:
+        result, job_id = delete_records("contacts", ids_from_request(request))
+        current_app.logger.info(f"Bulk deleted contacts: {result}")
+        return jsonify(result), 202 if job_id else 200
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk deleting contacts: {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -0,0 +1,15 @@
+from flask import Blueprint, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from  lib.bulk_delete import get_delete_job
+
+delete_bp = Blueprint("delete_bp", __name__)
+
+
+@delete_bp.route("/deletes/<job_id>", methods=["GET"])
+@jwt_required()
+def get_delete_job_status(job_id):
+    job = get_delete_job(job_id)
+    if job is None:
+        return jsonify({"error": "Delete job not found"}), 404
+    current_app.logger.info(f"Fetched delete job {job_id}")
+    return jsonify(job), 200
@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+import zlib
+from datetime import timedelta
+from flask import Blueprint, Response, request, jsonify, current_app, stream_with_context
+from flask_jwt_extended import jwt_required
+from sqlalchemy import select
+from db.models import db, Interaction, Restaurant
+from lib.pagination import parse_date
+
+export_bp = Blueprint("export_bp", __name__)
+
+EXPORT_BATCH_SIZE = 1000
+
+INTERACTION_COLUMNS = [
+    "id",
+    "interaction_date",
+    "type",
+    "outcome",
+    "details",
+    "duration_minutes",
+    "restaurant_id",
+    "contact_id",
+]
+
+RESTAURANT_COLUMNS = [
+    "id",
+    "name",
+    "address",
+    "status",
+    "call_frequency",
+    "last_call_date",
+    "revenue",
+    "notes",
+    "assigned_kam_id",
+]
+
+
+def _export_value(value):
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+def _encode_rows(rows, columns, fmt):
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        yield buffer.getvalue()
+    for batch in rows.partitions(EXPORT_BATCH_SIZE):
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerows(
+                [_export_value(value) for value in row] for row in batch
+            )
+            yield buffer.getvalue()
+        else:
+            yield "".join(
+                json.dumps(
+                    {c: _export_value(v) for c, v in zip(columns, row)},
+                    separators=(",", ":"),
+                )
+                + "\n"
+                for row in batch
+            )
+
+
+def _gzip(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def _stream_export(statement, columns, name):
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in ("ndjson", "csv"):
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    def generate():
+        rows = db.session.execute(
+            statement.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        try:
+            yield from _encode_rows(rows, columns, fmt)
+        finally:
+            rows.close()
+
+    chunks = generate()
+    headers = {
+        "Content-Disposition": f"attachment; filename={name}.{fmt}",
+        # The body depends on Accept-Encoding; shared caches must key on it.
+        "Vary": "Accept-Encoding",
+    }
+    if request.accept_encodings["gzip"]:
+        chunks = _gzip(chunks)
+        headers["Content-Encoding"] = "gzip"
+    mimetype = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return Response(stream_with_context(chunks), mimetype=mimetype, headers=headers)
+
+
+@export_bp.route("/exports/interactions", methods=["GET"])
+@jwt_required()
+def export_interactions():
+    try:
+        args = request.args
+        statement = select(
+            *[getattr(Interaction, column) for column in INTERACTION_COLUMNS]
+        ).order_by(Interaction.id)
+        if args.get("restaurant_id"):
+            statement = statement.where(
+                Interaction.restaurant_id == int(args["restaurant_id"])
+            )
+        date_from = parse_date(args, "date_from")
+        if date_from:
+            statement = statement.where(Interaction.interaction_date >= date_from)
+        date_to = parse_date(args, "date_to")
+        if date_to:
+            # Dates are whole days: include everything logged on date_to.
+            statement = statement.where(
+                Interaction.interaction_date < date_to + timedelta(days=1)
+            )
+        current_app.logger.info("Streaming interactions export")
+        return _stream_export(statement, INTERACTION_COLUMNS, "interactions")
+    except Exception as e:
+        current_app.logger.error(f"Error exporting interactions: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+@export_bp.route("/exports/restaurants", methods=["GET"])
+@jwt_required()
+def export_restaurants():
+    try:
+        args = request.args
+        statement = select(
+            *[getattr(Restaurant, column) for column in RESTAURANT_COLUMNS]
+        ).order_by(Restaurant.id)
+        if args.get("assigned_kam_id"):
+            statement = statement.where(
+                Restaurant.assigned_kam_id == int(args["assigned_kam_id"])
+            )
+        created_from = parse_date(args, "created_from")
+        if created_from:
+            statement = statement.where(Restaurant.created_at >= created_from)
+        created_to = parse_date(args, "created_to")
+        if created_to:
+            statement = statement.where(
+                Restaurant.created_at < created_to + timedelta(days=1)
+            )
+        current_app.logger.info("Streaming restaurants export")
+        return _stream_export(statement, RESTAURANT_COLUMNS, "restaurants")
+    except Exception as e:
+        current_app.logger.error(f"Error exporting restaurants: {str(e)}")
+        return jsonify({"error": str(e)}), 400
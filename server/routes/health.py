@@ -1,4 +1,8 @@
-from flask import Blueprint
+from flask import Blueprint, jsonify, current_app
+from flask_jwt_extended import jwt_required
+from db.models import db
+from  lib.extensions import redis_pool
+from  lib.pools import database_pool_metrics
 
 
 health_bp = Blueprint("health_bp", __name__)
@@ -7,3 +11,44 @@ health_bp = Blueprint("health_bp", __name__)
 @health_bp.route("/health", methods=["GET"])
 def health_check():
     return "Server Healthy", 200
+
+
+@health_bp.route("/health/scheduler", methods=["GET"])
+@jwt_required()
+def scheduler_status():
+    scheduler = current_app.extensions.get("leased_scheduler")
+    if scheduler is None:
+        return jsonify({"error": "Scheduler is not running"}), 404
+    try:
+        return (
+            jsonify(
+                {
+                    "process": scheduler.lease.token,
+                    "is_leader": scheduler.lease.is_leader(),
+                    "leader": scheduler.lease.holder(),
+                    "jobs": scheduler.metrics(),
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error fetching scheduler status: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+@health_bp.route("/health/pools", methods=["GET"])
+@jwt_required()
+def pool_status():
+    try:
+        return (
+            jsonify(
+                {
+                    "database": database_pool_metrics(db.engines),
+                    "redis": redis_pool.metrics(),
+                }
+            ),
+            200,
+        )
+    except Exception as e:
+        current_app.logger.error(f"Error fetching pool status: {str(e)}")
+        return jsonify({"error": str(e)}), 400
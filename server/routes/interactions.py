@@ -1,8 +1,29 @@
 from flask import Blueprint, request, jsonify, current_app
-from db.models import db, Interaction, InteractionType, InteractionOutcome
-from datetime import datetime
+from db.models import (
+    db,
+    Interaction,
+    InteractionType,
+    InteractionOutcome,
+    Restaurant,
+    Contact,
+)
+from datetime import datetime, timedelta
 from flask_jwt_extended import jwt_required
-from  lib.utils import invalidate_cache
+from sqlalchemy import select
+from werkzeug.datastructures import MultiDict
+from  lib.bulk_import import import_records, records_from_request
+from  lib.bulk_delete import delete_records, ids_from_request
+from  lib.query_guard import query_budget
+from  lib.pagination import paginate, parse_date
+from  lib.fields import (
+    include_options,
+    load_fields,
+    parse_fields,
+    parse_include,
+    select_fields,
+    serialize_included,
+)
+from db.serializers import INTERACTION_FIELDS, serializer
 
 interaction_bp = Blueprint("interaction_bp", __name__)
 
@@ -10,27 +31,107 @@ interaction_bp = Blueprint("interaction_bp", __name__)
 @jwt_required()
 def get_interactions():
     try:
-        interactions = Interaction.query.all()
-        result = [
-            {
-                "id": i.id,
-                "interaction_date": i.interaction_date.isoformat(),
-                "type": i.type.value if i.type else None,
-                "outcome": i.outcome.value if i.outcome else None,
-                "details": i.details,
-                "duration_minutes": i.duration_minutes,
-                "restaurant_id": i.restaurant_id,
-                "contact_id": i.contact_id,
-            }
-            for i in interactions
-        ]
+        args = request.args
+        fields = parse_fields(args, INTERACTION_FIELDS)
+        query = select_fields(Interaction, fields)
+        if args.get("restaurant_id"):
+            query = query.filter_by(restaurant_id=int(args["restaurant_id"]))
+        if args.get("contact_id"):
+            query = query.filter_by(contact_id=int(args["contact_id"]))
+        if args.get("type"):
+            query = query.filter_by(type=InteractionType[args["type"].upper()])
+        if args.get("outcome"):
+            query = query.filter_by(
+                outcome=InteractionOutcome[args["outcome"].upper()]
+            )
+        date_from = parse_date(args, "date_from")
+        if date_from:
+            query = query.filter(Interaction.interaction_date >= date_from)
+        date_to = parse_date(args, "date_to")
+        if date_to:
+            # Dates are whole days: include interactions logged on date_to.
+            query = query.filter(
+                Interaction.interaction_date < date_to + timedelta(days=1)
+            )
+
+        interactions, next_cursor = paginate(
+            query,
+            Interaction,
+            ("id", "interaction_date", "created_at", "updated_at"),
+            args,
+        )
+        serialize = serializer(Interaction, fields)
+        result = [serialize(i) for i in interactions]
         current_app.logger.info("Fetched interactions successfully")
-        return jsonify(result), 200
+        return jsonify({"items": result, "next_cursor": next_cursor}), 200
+    except KeyError as e:
+        current_app.logger.error(f"Invalid value for key: {e}")
+        return jsonify({"error": f"Invalid value: {e}"}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching interactions: {str(e)}")
         return jsonify({"error": str(e)}), 400
 
 
+TIMELINE_PREVIEW_LIMIT = 10
+
+
+def interaction_timeline(query, args):
+    """Page through ``query`` newest-first on ``(interaction_date, id)``."""
+    if args.get("type"):
+        query = query.filter_by(type=InteractionType[args["type"].upper()])
+    if args.get("outcome"):
+        query = query.filter_by(outcome=InteractionOutcome[args["outcome"].upper()])
+    return paginate(
+        query, Interaction, ("interaction_date",), args, default_sort="-interaction_date"
+    )
+
+
+def interaction_preview(criterion, fields):
+    query = select_fields(Interaction, fields).filter(criterion)
+    return interaction_timeline(query, MultiDict({"limit": TIMELINE_PREVIEW_LIMIT}))
+
+
+def timeline_response(model, owner_id, criterion, owner):
+    # An empty timeline and an unknown owner are different answers.
+    if db.session.scalar(select(model.id).where(model.id == owner_id)) is None:
+        current_app.logger.warning(f"Interaction timeline requested for missing {owner}")
+        return jsonify({"error": f"{owner.capitalize()} not found"}), 404
+    try:
+        fields = parse_fields(request.args, INTERACTION_FIELDS)
+        interactions, next_cursor = interaction_timeline(
+            select_fields(Interaction, fields).filter(criterion), request.args
+        )
+        serialize = serializer(Interaction, fields)
+        result = [serialize(i) for i in interactions]
+        current_app.logger.info(f"Fetched interaction timeline for {owner}")
+        return jsonify({"items": result, "next_cursor": next_cursor}), 200
+    except KeyError as e:
+        current_app.logger.error(f"Invalid value for key: {e}")
+        return jsonify({"error": f"Invalid value: {e}"}), 400
+    except Exception as e:
+        current_app.logger.error(f"Error fetching interaction timeline for {owner}: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+@interaction_bp.route("/restaurants/<int:restaurant_id>/interactions", methods=["GET"])
+@jwt_required()
+def get_restaurant_interactions(restaurant_id):
+    return timeline_response(
+        Restaurant,
+        restaurant_id,
+        Interaction.restaurant_id == restaurant_id,
+        f"restaurant {restaurant_id}",
+    )
+
+
+@interaction_bp.route("/contacts/<int:contact_id>/interactions", methods=["GET"])
+@jwt_required()
+def get_contact_interactions(contact_id):
+    return timeline_response(
+        Contact, contact_id, Interaction.contact_id == contact_id, f"contact {contact_id}"
+    )
+
+
 @interaction_bp.route("/interactions", methods=["POST"])
 @jwt_required()
 def create_interaction():
@@ -52,7 +153,6 @@ def create_interaction():
         )
         db.session.add(new_interaction)
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Created interaction with ID {new_interaction.id}")
         return (
             jsonify({"message": "Interaction created", "id": new_interaction.id}),
@@ -67,27 +167,50 @@ def create_interaction():
         return jsonify({"error": str(e)}), 400
 
 
+@interaction_bp.route("/interactions/bulk", methods=["POST"])
+@jwt_required()
+@query_budget(None)
+def bulk_create_interactions():
+    try:
+        result = import_records("interactions", records_from_request(request))
+        current_app.logger.info(
+            f"Bulk imported {result['created']} interactions with "
+            f"{len(result['errors'])} errors"
+        )
+        return jsonify(result), 201 if result["created"] else 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk importing interactions: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+INTERACTION_RESTAURANT_FIELDS = ("id", "name")
+INTERACTION_CONTACT_FIELDS = ("id", "name", "role")
+
+INTERACTION_RELATIONS = {
+    "restaurant": (Interaction.restaurant, Restaurant, INTERACTION_RESTAURANT_FIELDS),
+    "contact": (Interaction.contact, Contact, INTERACTION_CONTACT_FIELDS),
+}
+
+
 @interaction_bp.route("/interactions/<int:interaction_id>", methods=["GET"])
 @jwt_required()
 def get_interaction_by_id(interaction_id):
     try:
-        interaction = Interaction.query.get_or_404(interaction_id)
-        current_app.logger.info(f"Fetched interaction with ID {interaction.id}")
-        return (
-            jsonify(
-                {
-                    "id": interaction.id,
-                    "interaction_date": interaction.interaction_date.isoformat(),
-                    "type": interaction.type.value if interaction.type else None,
-                    "outcome": interaction.outcome.value if interaction.outcome else None,
-                    "details": interaction.details,
-                    "duration_minutes": interaction.duration_minutes,
-                    "restaurant_id": interaction.restaurant_id,
-                    "contact_id": interaction.contact_id,
-                }
-            ),
-            200,
+        fields = parse_fields(request.args, INTERACTION_FIELDS)
+        include = parse_include(request.args, INTERACTION_RELATIONS)
+        interaction = (
+            Interaction.query.options(
+                load_fields(Interaction, fields),
+                *include_options(INTERACTION_RELATIONS, include),
+            )
+            .filter_by(id=interaction_id)
+            .first_or_404()
         )
+        result = serializer(Interaction, fields)(interaction)
+        result.update(serialize_included(interaction, INTERACTION_RELATIONS, include))
+        current_app.logger.info(f"Fetched interaction with ID {interaction.id}")
+        return jsonify(result), 200
     except Exception as e:
         current_app.logger.error(f"Error fetching interaction with ID {interaction_id}: {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -112,7 +235,6 @@ def update_interaction(interaction_id):
                 data["interaction_date"], "%Y-%m-%d"
             )
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Updated interaction with ID {interaction.id}")
         return jsonify({"message": "Interaction updated"}), 200
     except KeyError as e:
@@ -127,14 +249,32 @@ def update_interaction(interaction_id):
 @interaction_bp.route("/interactions/<int:interaction_id>", methods=["DELETE"])
 @jwt_required()
 def delete_interaction(interaction_id):
-    interaction = Interaction.query.get_or_404(interaction_id)
+    Interaction.query.get_or_404(interaction_id)
     try:
-        db.session.delete(interaction)
-        db.session.commit()
-        invalidate_cache()
-        current_app.logger.info(f"Deleted interaction with ID {interaction.id}")
+        result, job_id = delete_records("interactions", [interaction_id])
+        if job_id:
+            current_app.logger.info(
+                f"Scheduled deletion of interaction with ID {interaction_id} as job {job_id}"
+            )
+            return jsonify(result), 202
+        current_app.logger.info(f"Deleted interaction with ID {interaction_id}")
         return jsonify({"message": "Interaction deleted"}), 200
     except Exception as e:
         db.session.rollback()
-        current_app.logger.error(f"Error deleting interaction with ID {interaction_id}: {str(e)}")
+        current_app.logger.error(
+            f"Error deleting interaction with ID {interaction_id}: {str(e)}"
+        )
+        return jsonify({"error": str(e)}), 400
+
+
+@interaction_bp.route("/interactions/bulk", methods=["DELETE"])
+@jwt_required()
+def bulk_delete_interactions():
+    try:
+        result, job_id = delete_records("interactions", ids_from_request(request))
+        current_app.logger.info(f"Bulk deleted interactions: {result}")
+        return jsonify(result), 202 if job_id else 200
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk deleting interactions: {str(e)}")
         return jsonify({"error": str(e)}), 400
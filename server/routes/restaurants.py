@@ -1,35 +1,81 @@
 from flask import Blueprint, request, jsonify, current_app
 from db.models import Interaction, db, Restaurant, RestaurantStatus, CallFrequency, Contact
-from datetime import datetime
+from datetime import datetime, timedelta
 from flask_jwt_extended import jwt_required
-from  lib.extensions import cache
-from  lib.utils import invalidate_cache
+from  lib.swr_cache import swr_cached
+from  lib.bulk_import import import_records, records_from_request
+from  lib.bulk_delete import delete_records, ids_from_request
+from  lib.query_guard import query_budget
+from  lib.pagination import paginate, parse_date
+from  lib.fields import (
+    include_options,
+    load_fields,
+    parse_fields,
+    parse_include,
+    select_fields,
+    serialize_included,
+)
+from routes.interactions import interaction_preview
+from db import analytics
+from db.serializers import RESTAURANT_FIELDS, serializer
 
 restaurant_bp = Blueprint("restaurant_bp", __name__)
 
+ANALYTICS_TAGS = ("restaurants", "interactions")
+
+cached_dashboard = swr_cached("dashboard", tags=ANALYTICS_TAGS)(analytics.dashboard)
+cached_test_average_interaction_durations = swr_cached(
+    "test_average_interaction_duration_all", tags=ANALYTICS_TAGS
+)(analytics.average_interaction_durations)
+
+WARMED_PAYLOADS = (cached_dashboard,)
+
+
+def warm_analytics_cache(app):
+    try:
+        with app.app_context():
+            warmed = [fn.__name__ for fn in WARMED_PAYLOADS if fn.warm()]
+            if warmed:
+                app.logger.info(f"Warmed analytics cache: {', '.join(warmed)}")
+    except Exception as e:
+        app.logger.error(f"Error in scheduled warm_analytics_cache: {str(e)}")
+
 
 @restaurant_bp.route("/restaurants", methods=["GET"])
 @jwt_required()
 def get_restaurants():
     try:
-        restaurants = Restaurant.query.all()
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "address": r.address,
-                "status": r.status.value if r.status else None,
-                "call_frequency": r.call_frequency.value if r.call_frequency else None,
-                "last_call_date": (
-                    r.last_call_date.isoformat() if r.last_call_date else None
-                ),
-                "revenue": str(r.revenue) if r.revenue is not None else None,
-                "notes": r.notes,
-            }
-            for r in restaurants
-        ]
+        args = request.args
+        fields = parse_fields(args, RESTAURANT_FIELDS)
+        query = select_fields(Restaurant, fields)
+        if args.get("status"):
+            query = query.filter_by(status=RestaurantStatus[args["status"].upper()])
+        if args.get("call_frequency"):
+            query = query.filter_by(
+                call_frequency=CallFrequency[args["call_frequency"].upper()]
+            )
+        if args.get("assigned_kam_id"):
+            query = query.filter_by(assigned_kam_id=int(args["assigned_kam_id"]))
+        last_call_from = parse_date(args, "last_call_from")
+        if last_call_from:
+            query = query.filter(Restaurant.last_call_date >= last_call_from)
+        last_call_to = parse_date(args, "last_call_to")
+        if last_call_to:
+            # Dates are whole days: include calls made on last_call_to.
+            query = query.filter(
+                Restaurant.last_call_date < last_call_to + timedelta(days=1)
+            )
+
+        restaurants, next_cursor = paginate(
+            query, Restaurant, ("id", "name", "created_at", "updated_at"), args
+        )
+        serialize = serializer(Restaurant, fields)
+        result = [serialize(r) for r in restaurants]
         current_app.logger.info("Fetched restaurants successfully")
-        return jsonify(result), 200
+        return jsonify({"items": result, "next_cursor": next_cursor}), 200
+    except KeyError as e:
+        current_app.logger.error(f"Invalid value for key: {e}")
+        return jsonify({"error": f"Invalid value: {e}"}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching restaurants: {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -55,7 +101,6 @@ def create_restaurant():
         )
         db.session.add(new_restaurant)
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Created restaurant with ID {new_restaurant.id}")
         return jsonify({"message": "Restaurant created", "id": new_restaurant.id}), 201
     except KeyError as e:
@@ -67,58 +112,61 @@ def create_restaurant():
         return jsonify({"error": str(e)}), 400
 
 
+@restaurant_bp.route("/restaurants/bulk", methods=["POST"])
+@jwt_required()
+@query_budget(None)
+def bulk_create_restaurants():
+    try:
+        result = import_records("restaurants", records_from_request(request))
+        current_app.logger.info(
+            f"Bulk imported {result['created']} restaurants with "
+            f"{len(result['errors'])} errors"
+        )
+        return jsonify(result), 201 if result["created"] else 400
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk importing restaurants: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+RESTAURANT_CONTACT_FIELDS = ("id", "name", "role", "email", "phone")
+RESTAURANT_INTERACTION_FIELDS = ("id", "type", "details", "interaction_date")
+
+RESTAURANT_RELATIONS = {
+    "contacts": (Restaurant.contacts, Contact, RESTAURANT_CONTACT_FIELDS),
+}
+RESTAURANT_INCLUDES = (*RESTAURANT_RELATIONS, "interactions")
+
+
 @restaurant_bp.route("/restaurants/<int:restaurant_id>", methods=["GET"])
 @jwt_required()
 def get_restaurant_by_id(restaurant_id):
     try:
-        restaurant = Restaurant.query.get_or_404(restaurant_id)
-        current_app.logger.info(f"Fetched restaurant with ID {restaurant.id}")
-        return (
-            jsonify(
-                {
-                    "id": restaurant.id,
-                    "name": restaurant.name,
-                    "address": restaurant.address,
-                    "status": restaurant.status.value if restaurant.status else None,
-                    "call_frequency": (
-                        restaurant.call_frequency.value
-                        if restaurant.call_frequency
-                        else None
-                    ),
-                    "last_call_date": (
-                        restaurant.last_call_date.isoformat()
-                        if restaurant.last_call_date
-                        else None
-                    ),
-                    "revenue": (
-                        str(restaurant.revenue)
-                        if restaurant.revenue is not None
-                        else None
-                    ),
-                    "notes": restaurant.notes,
-                    "contacts": [
-                        {
-                            "id": c.id,
-                            "name": c.name,
-                            "role": c.role,
-                            "email": c.email,
-                            "phone": c.phone,
-                        }
-                        for c in restaurant.contacts
-                    ],
-                    "interactions": [
-                        {
-                            "id": i.id,
-                            "type": i.type.value if i.type else None,
-                            "details": i.details,
-                            "interaction_date": i.interaction_date.isoformat(),
-                        }
-                        for i in restaurant.interactions
-                    ],
-                }
-            ),
-            200,
+        fields = parse_fields(request.args, RESTAURANT_FIELDS)
+        include = parse_include(
+            request.args, RESTAURANT_INCLUDES, default=RESTAURANT_INCLUDES
+        )
+        relations = [name for name in include if name in RESTAURANT_RELATIONS]
+        restaurant = (
+            Restaurant.query.options(
+                load_fields(Restaurant, fields),
+                *include_options(RESTAURANT_RELATIONS, relations),
+            )
+            .filter_by(id=restaurant_id)
+            .first_or_404()
         )
+        result = serializer(Restaurant, fields)(restaurant)
+        result.update(serialize_included(restaurant, RESTAURANT_RELATIONS, relations))
+        if "interactions" in include:
+            interactions, next_cursor = interaction_preview(
+                Interaction.restaurant_id == restaurant.id,
+                RESTAURANT_INTERACTION_FIELDS,
+            )
+            serialize = serializer(Interaction, RESTAURANT_INTERACTION_FIELDS)
+            result["interactions"] = [serialize(i) for i in interactions]
+            result["interactions_next_cursor"] = next_cursor
+        current_app.logger.info(f"Fetched restaurant with ID {restaurant.id}")
+        return jsonify(result), 200
     except Exception as e:
         current_app.logger.error(
             f"Error fetching restaurant with ID {restaurant_id}: {str(e)}"
@@ -145,7 +193,6 @@ def update_restaurant(restaurant_id):
         restaurant.revenue = data.get("revenue", restaurant.revenue)
         restaurant.notes = data.get("notes", restaurant.notes)
         db.session.commit()
-        invalidate_cache()
         current_app.logger.info(f"Updated restaurant with ID {restaurant.id}")
         return jsonify({"message": "Restaurant updated"}), 200
     except KeyError as e:
@@ -162,20 +209,15 @@ def update_restaurant(restaurant_id):
 @restaurant_bp.route("/restaurants/<int:restaurant_id>", methods=["DELETE"])
 @jwt_required()
 def delete_restaurant(restaurant_id):
-    restaurant = Restaurant.query.get_or_404(restaurant_id)
+    Restaurant.query.get_or_404(restaurant_id)
     try:
-        contacts = Contact.query.filter_by(restaurant_id=restaurant_id).all()
-        interactions = Interaction.query.filter_by(restaurant_id=restaurant_id).all()
-
-        for interaction in interactions:
-            db.session.delete(interaction)
-        for contact in contacts:
-            db.session.delete(contact)
-
-        db.session.delete(restaurant)
-        db.session.commit()
-        invalidate_cache()
-        current_app.logger.info(f"Deleted restaurant with ID {restaurant.id}")
+        result, job_id = delete_records("restaurants", [restaurant_id])
+        if job_id:
+            current_app.logger.info(
+                f"Scheduled deletion of restaurant with ID {restaurant_id} as job {job_id}"
+            )
+            return jsonify(result), 202
+        current_app.logger.info(f"Deleted restaurant with ID {restaurant_id}")
         return jsonify({"message": "Restaurant deleted"}), 200
     except Exception as e:
         db.session.rollback()
@@ -185,33 +227,24 @@ def delete_restaurant(restaurant_id):
         return jsonify({"error": str(e)}), 400
 
 
+@restaurant_bp.route("/restaurants/bulk", methods=["DELETE"])
+@jwt_required()
+def bulk_delete_restaurants():
+    try:
+        result, job_id = delete_records("restaurants", ids_from_request(request))
+        current_app.logger.info(f"Bulk deleted restaurants: {result}")
+        return jsonify(result), 202 if job_id else 200
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error bulk deleting restaurants: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
 @restaurant_bp.route("/restaurants/underperforming", methods=["GET"])
 @jwt_required()
-@cache.cached(timeout=300, key_prefix="underperforming_restaurants")
 def get_underperforming_restaurants():
     try:
-        restaurants = Restaurant.query.all()
-        for r in restaurants:
-            r.is_underperforming()
-        underperforming_restaurants = [r for r in restaurants if r.is_underperforming()]
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "last_interaction_date": (
-                    r.last_interaction_date().isoformat()
-                    if r.last_interaction_date()
-                    else None
-                ),
-                "time_since_last_interaction": (
-                    (datetime.utcnow() - r.last_interaction_date()).days
-                    if r.last_interaction_date()
-                    else None
-                ),
-                "revenue": r.revenue,
-            }
-            for r in underperforming_restaurants
-        ]
+        result = cached_dashboard()["underperforming"]
         current_app.logger.info("Fetched underperforming restaurants successfully")
         return jsonify(result), 200
     except Exception as e:
@@ -223,18 +256,9 @@ def get_underperforming_restaurants():
 
 @restaurant_bp.route("/restaurants/performance_score", methods=["GET"])
 @jwt_required()
-@cache.cached(timeout=300, key_prefix="performance_score_all")
 def get_performance_scores():
     try:
-        restaurants = Restaurant.query.all()
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "performance_score": str(r.performance_score()).split(".")[0],
-            }
-            for r in restaurants
-        ]
+        result = cached_dashboard()["performance_scores"]
         current_app.logger.info("Fetched performance scores successfully")
         return jsonify(result), 200
     except Exception as e:
@@ -244,20 +268,9 @@ def get_performance_scores():
 
 @restaurant_bp.route("/restaurants/average_interaction_duration", methods=["GET"])
 @jwt_required()
-@cache.cached(timeout=300, key_prefix="average_interaction_duration_all")
 def get_all_average_interaction_duration():
     try:
-        restaurants = Restaurant.query.all()
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "average_interaction_duration": str(
-                    r.average_interaction_duration()
-                ).split(".")[0],
-            }
-            for r in restaurants
-        ]
+        result = cached_dashboard()["average_interaction_duration"]
         current_app.logger.info("Fetched average interaction durations successfully")
         return jsonify(result), 200
     except Exception as e:
@@ -267,21 +280,28 @@ def get_all_average_interaction_duration():
         return jsonify({"error": str(e)}), 400
 
 
+@restaurant_bp.route("/dashboard", methods=["GET"])
+@jwt_required()
+def get_dashboard():
+    try:
+        panels = request.args.get("panels")
+        panels = panels.split(",") if panels else list(analytics.DASHBOARD_PANELS)
+        unknown = [panel for panel in panels if panel not in analytics.DASHBOARD_PANELS]
+        if unknown:
+            return jsonify({"error": f"Unknown panels: {', '.join(unknown)}"}), 400
+        payload = cached_dashboard()
+        result = {panel: payload[panel] for panel in panels}
+        current_app.logger.info("Fetched dashboard successfully")
+        return jsonify(result), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching dashboard: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
 @restaurant_bp.route("/restaurants/average_interaction_duration/test", methods=["GET"])
-@cache.cached(timeout=300, key_prefix="test_average_interaction_duration_all")
 def test_get_all_average_interaction_duration():
     try:
-        restaurants = Restaurant.query.all()
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "average_interaction_duration": str(
-                    r.average_interaction_duration()
-                ).split(".")[0],
-            }
-            for r in restaurants
-        ]
+        result = cached_test_average_interaction_durations()
         current_app.logger.info("Fetched average interaction durations successfully")
         return jsonify(result), 200
     except Exception as e:
@@ -296,17 +316,7 @@ def test_get_all_average_interaction_duration():
 )
 def test_get_all_average_interaction_duration_without_cache():
     try:
-        restaurants = Restaurant.query.all()
-        result = [
-            {
-                "id": r.id,
-                "name": r.name,
-                "average_interaction_duration": str(
-                    r.average_interaction_duration()
-                ).split(".")[0],
-            }
-            for r in restaurants
-        ]
+        result = analytics.average_interaction_durations()
         current_app.logger.info("Fetched average interaction durations successfully")
         return jsonify(result), 200
     except Exception as e:
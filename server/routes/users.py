@@ -1,13 +1,23 @@
 from flask import Blueprint, request, jsonify, current_app
 from db.models import db, User, UserRole
+from db.serializers import USER_FIELDS, serializer
+from db.analytics import kam_portfolios
 from flask_jwt_extended import create_access_token, jwt_required
-from lib.utils import bcrypt
+from lib.cache_tags import cached_per_tag, kam_tag
+from lib.passwords import PasswordPoolBusy, check_password, hash_password, needs_rehash
+from lib.pagination import paginate
+from lib.fields import parse_fields, select_fields
 from datetime import timedelta
+from sqlalchemy import select
 
 user_bp = Blueprint("user_bp", __name__)
 
 expires = timedelta(days=3)
 
+# Portfolios are invalidated through their KAM's tag; the TTL only bounds how
+# long the overdue call count can lag behind the clock.
+PORTFOLIO_CACHE_TTL = 300
+
 
 def can_create_user(current_user_role, new_user_role):
     if current_user_role == UserRole.ADMIN:
@@ -20,29 +30,36 @@ def can_create_user(current_user_role, new_user_role):
 def fetch_users(app):
     try:
         with app.app_context():
-            users = User.query.all()
+            users = db.session.execute(select_fields(User, ("id",))).all()
             app.logger.info(f"Fetched {len(users)} users")
     except Exception as e:
         app.logger.error(f"Error in scheduled fetch_users: {str(e)}")
 
+
+def cached_portfolios(kam_ids):
+    return cached_per_tag(
+        "kam_portfolio", kam_ids, kam_tag, kam_portfolios, PORTFOLIO_CACHE_TTL
+    )
+
 @user_bp.route("/users", methods=["GET"])
 def get_users():
     try:
-        users = User.query.all()
-        result = [
-            {
-                "id": u.id,
-                "name": u.name,
-                "email": u.email,
-                "phone": u.phone,
-                "role": u.role.value,
-                "created_at": u.created_at.isoformat(),
-                "updated_at": u.updated_at.isoformat(),
-            }
-            for u in users
-        ]
+        args = request.args
+        fields = parse_fields(args, USER_FIELDS)
+        query = select_fields(User, fields)
+        if args.get("role"):
+            query = query.filter_by(role=UserRole[args["role"].upper()])
+
+        users, next_cursor = paginate(
+            query, User, ("id", "name", "email", "created_at", "updated_at"), args
+        )
+        serialize = serializer(User, fields)
+        result = [serialize(u) for u in users]
         current_app.logger.info(f"Fetched {len(users)} users successfully.")
-        return jsonify(result), 200
+        return jsonify({"items": result, "next_cursor": next_cursor}), 200
+    except KeyError as e:
+        current_app.logger.error(f"Invalid role filter: {e}")
+        return jsonify({"error": f"Invalid role"}), 400
     except Exception as e:
         current_app.logger.error(f"Error fetching users: {str(e)}")
         return jsonify({"error": str(e)}), 400
@@ -53,20 +70,12 @@ def get_users():
 def get_users_by_currentUserRole(user_id):
     current_user = User.query.get_or_404(user_id)
     try:
-        users = User.query.all()
-        result = [
-            {
-                "id": u.id,
-                "name": u.name,
-                "email": u.email,
-                "phone": u.phone,
-                "role": u.role.value,
-                "created_at": u.created_at.isoformat(),
-                "updated_at": u.updated_at.isoformat(),
-            }
-            for u in users
-            if can_create_user(current_user.role, u.role)
-        ]
+        roles = [role for role in UserRole if can_create_user(current_user.role, role)]
+        users = db.session.execute(
+            select_fields(User, USER_FIELDS).where(User.role.in_(roles))
+        ).all()
+        serialize = serializer(User)
+        result = [serialize(u) for u in users]
         current_app.logger.info(
             f"Fetched users based on the current user's role: {current_user.role.value}."
         )
@@ -82,7 +91,19 @@ def get_users_by_currentUserRole(user_id):
 def login_user():
     data = request.get_json()
     user = User.query.filter_by(email=data.get("email")).first()
-    if user and bcrypt.check_password_hash(user.password_hash, data.get("password")):
+    try:
+        authenticated = user is not None and check_password(
+            user.password_hash, data.get("password")
+        )
+        if authenticated and needs_rehash(user.password_hash):
+            user.password_hash = hash_password(data.get("password"))
+            db.session.commit()
+            current_app.logger.info(f"Rehashed password for user {user.id}.")
+    except PasswordPoolBusy as e:
+        db.session.rollback()
+        current_app.logger.warning(f"Login rejected, password pool busy: {str(e)}")
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
+    if authenticated:
         access_token = create_access_token(
             identity=user.id,
             additional_claims={"role": user.role.value, "email": user.email},
@@ -107,9 +128,7 @@ def login_user():
 def create_user():
     data = request.get_json()
     try:
-        password_hash = bcrypt.generate_password_hash(data.get("password")).decode(
-            "utf-8"
-        )
+        password_hash = hash_password(data.get("password"))
         new_user = User(
             name=data.get("name"),
             email=data.get("email"),
@@ -139,6 +158,9 @@ def create_user():
     except KeyError as e:
         current_app.logger.error(f"Invalid role during user creation: {e}")
         return jsonify({"error": f"Invalid role"}), 400
+    except PasswordPoolBusy as e:
+        current_app.logger.warning(f"User creation rejected, password pool busy: {str(e)}")
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error creating user: {str(e)}")
@@ -150,9 +172,7 @@ def create_user():
 def add_role_based_user():
     data = request.get_json()
     try:
-        password_hash = bcrypt.generate_password_hash(data.get("password")).decode(
-            "utf-8"
-        )
+        password_hash = hash_password(data.get("password"))
         new_user = User(
             name=data.get("name"),
             email=data.get("email"),
@@ -184,6 +204,9 @@ def add_role_based_user():
     except KeyError as e:
         current_app.logger.error(f"Invalid role during user creation: {e}")
         return jsonify({"error": f"Invalid role"}), 400
+    except PasswordPoolBusy as e:
+        current_app.logger.warning(f"User creation rejected, password pool busy: {str(e)}")
+        return jsonify({"error": str(e)}), 503, {"Retry-After": "1"}
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error creating role-based user: {str(e)}")
@@ -212,6 +235,35 @@ def get_user_by_id(user_id):
         return jsonify({"error": str(e)}), 400
 
 
+@user_bp.route("/users/<int:user_id>/portfolio", methods=["GET"])
+@jwt_required()
+def get_user_portfolio(user_id):
+    user = User.query.get_or_404(user_id)
+    try:
+        portfolio = cached_portfolios([user.id])[user.id]
+        current_app.logger.info(f"Portfolio of user {user_id} fetched successfully.")
+        return jsonify({**portfolio, "name": user.name}), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching portfolio of user {user_id}: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
+@user_bp.route("/kams/summary", methods=["GET"])
+@jwt_required()
+def get_kams_summary():
+    try:
+        kams = db.session.execute(
+            select(User.id, User.name).where(User.role == UserRole.KAM).order_by(User.id)
+        ).all()
+        portfolios = cached_portfolios([kam.id for kam in kams])
+        result = [{**portfolios[kam.id], "name": kam.name} for kam in kams]
+        current_app.logger.info(f"Fetched portfolio summary of {len(kams)} KAMs.")
+        return jsonify(result), 200
+    except Exception as e:
+        current_app.logger.error(f"Error fetching KAM summary: {str(e)}")
+        return jsonify({"error": str(e)}), 400
+
+
 @user_bp.route("/users/<int:user_id>", methods=["PUT"])
 def update_user(user_id):
     user = User.query.get_or_404(user_id)
@@ -0,0 +1,128 @@
+import os
+import tempfile
+from datetime import datetime
+
+import pytest
+
+# lib.config reads the environment on import, so it is set before the app is
+# imported: an in-memory database and an in-process Redis per test, and every
+# request fails on an N+1 loop or a query budget overrun (lib/query_guard.py).
+os.environ.update(
+    DATABASE_URL="sqlite:///:memory:",
+    REDIS_URL="fakeredis://",
+    LOG_FILE=os.path.join(tempfile.gettempdir(), "kam-tests.log"),
+    BCRYPT_LOG_ROUNDS="4",
+    QUERY_GUARD="true",
+    QUERY_GUARD_RAISE="true",
+)
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import create_app  # noqa: E402
+from db.models import (  # noqa: E402
+    db,
+    User,
+    UserRole,
+    Restaurant,
+    Contact,
+    Interaction,
+    InteractionType,
+    InteractionRollup,
+    RestaurantStats,
+)
+from db.rollups import KEY_COLUMNS, rollup_select  # noqa: E402
+from db.stats import COUNTER_COLUMNS, stats_select  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    app.config["TESTING"] = True
+    # The scheduler only starts on the first request when none is
+    # registered; the tests run without its background jobs.
+    app.extensions["leased_scheduler"] = None
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+    app.logger.handlers.clear()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def kam(app):
+    user = User(name="KAM", email="kam@example.com", password_hash="x", role=UserRole.KAM)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(kam):
+    return {"Authorization": f"Bearer {create_access_token(identity=str(kam.id))}"}
+
+
+@pytest.fixture
+def make_restaurant(kam):
+    def make(**fields):
+        fields.setdefault("name", "Restaurant")
+        fields.setdefault("assigned_kam_id", kam.id)
+        restaurant = Restaurant(**fields)
+        db.session.add(restaurant)
+        db.session.flush()
+        db.session.add(Contact(name="Owner", role="owner", restaurant_id=restaurant.id))
+        db.session.commit()
+        return restaurant
+
+    return make
+
+
+@pytest.fixture
+def make_interaction():
+    def make(restaurant, **fields):
+        fields.setdefault("type", InteractionType.CALL)
+        fields.setdefault("interaction_date", datetime(2026, 9, 1, 10))
+        interaction = Interaction(
+            restaurant_id=restaurant.id,
+            contact_id=restaurant.contacts[0].id,
+            **fields,
+        )
+        db.session.add(interaction)
+        db.session.commit()
+        return interaction
+
+    return make
+
+
+@pytest.fixture
+def summaries_current():
+    """Whether restaurant_stats and interaction_rollups hold what a rebuild
+    from the interactions would.
+    """
+
+    def check():
+        stats_columns = [
+            RestaurantStats.restaurant_id,
+            RestaurantStats.interaction_count,
+            RestaurantStats.duration_sum,
+            RestaurantStats.duration_count,
+            RestaurantStats.last_interaction_date,
+            *[RestaurantStats.__table__.c[name] for name in COUNTER_COLUMNS[3:]],
+        ]
+        stats = set(db.session.execute(db.select(*stats_columns)).all())
+        rebuilt_stats = {row[:-1] for row in db.session.execute(stats_select())}
+        rollup_columns = [
+            InteractionRollup.__table__.c[name] for name in [*KEY_COLUMNS, *COUNTER_COLUMNS]
+        ]
+        # SQLite returns date() as text.
+        rollups = {
+            (str(day), *rest) for day, *rest in db.session.execute(db.select(*rollup_columns))
+        }
+        rebuilt_rollups = {(str(day), *rest) for day, *rest in db.session.execute(rollup_select())}
+        return stats == rebuilt_stats and rollups == rebuilt_rollups
+
+    return check
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+import lib.bulk_delete as bulk_delete
+from db.models import db, Interaction, InteractionOutcome, InteractionType, Restaurant
+from lib.cache_tags import restaurant_tag, tag_versions
+
+
+def test_batched_job_keeps_summaries_current_after_every_batch(
+    app, monkeypatch, make_restaurant, make_interaction, summaries_current
+):
+    monkeypatch.setattr(bulk_delete, "DELETE_BATCH_SIZE", 2)
+    restaurant = make_restaurant()
+    other = make_restaurant()
+    start = datetime(2026, 9, 1, 9)
+    for day in range(5):
+        make_interaction(
+            restaurant,
+            interaction_date=start + timedelta(days=day),
+            type=InteractionType.CALL if day % 2 else InteractionType.EMAIL,
+            outcome=InteractionOutcome.SUCCESSFUL,
+            duration_minutes=10,
+        )
+    make_interaction(other, interaction_date=start)
+    contact_id = restaurant.contacts[0].id
+    tag = restaurant_tag(restaurant.id)
+    plan = bulk_delete._plan("contacts", [contact_id])
+
+    versions, checks = [], []
+
+    def on_batch():
+        versions.append(tag_versions([tag])[0])
+        checks.append(summaries_current())
+
+    assert bulk_delete._delete_interactions_in_batches(plan, on_batch) == 5
+    assert checks == [True, True, True]
+    assert versions == sorted(set(versions))
+    assert Interaction.query.filter_by(restaurant_id=restaurant.id).count() == 0
+    # The restaurant's last call (Sep 4) was deleted and no call is left.
+    assert db.session.get(Restaurant, restaurant.id).last_call_date == start + timedelta(days=3)
+    assert db.session.get(Restaurant, other.id).last_call_date == start
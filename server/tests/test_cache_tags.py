@@ -0,0 +1,135 @@
+from datetime import datetime
+
+from db.models import db, User, UserRole
+from lib.cache_tags import cached_per_tag, kam_tag, restaurant_tag, tag_versions, tagged_key
+
+
+def bumped(tags, change):
+    """The subset of ``tags`` whose version ``change()`` bumps."""
+    tags = list(tags)
+    before = tag_versions(tags)
+    change()
+    return {tag for tag, old, new in zip(tags, before, tag_versions(tags)) if new != old}
+
+
+def test_restaurant_fields_outside_the_table_payloads_only_bump_the_row(make_restaurant, kam):
+    restaurant = make_restaurant()
+
+    def edit_notes():
+        restaurant.notes = "Prefers mornings"
+        db.session.commit()
+
+    def rename():
+        restaurant.name = "Renamed"
+        db.session.commit()
+
+    tags = ["restaurants", restaurant_tag(restaurant.id), kam_tag(kam.id)]
+    assert bumped(tags, edit_notes) == {restaurant_tag(restaurant.id), kam_tag(kam.id)}
+    assert bumped(tags, rename) == set(tags)
+
+
+def test_reassigning_a_restaurant_bumps_both_kams(make_restaurant, kam):
+    restaurant = make_restaurant()
+    other = User(name="Other", email="other@example.com", password_hash="x", role=UserRole.KAM)
+    db.session.add(other)
+    db.session.commit()
+
+    def reassign():
+        restaurant.assigned_kam_id = other.id
+        db.session.commit()
+
+    assert bumped([kam_tag(kam.id), kam_tag(other.id)], reassign) == {
+        kam_tag(kam.id),
+        kam_tag(other.id),
+    }
+
+
+def test_interactions_bump_their_restaurant_and_its_kam(make_restaurant, make_interaction, kam):
+    restaurant, untouched = make_restaurant(), make_restaurant()
+    tags = [
+        "interactions",
+        "restaurants",
+        restaurant_tag(restaurant.id),
+        restaurant_tag(untouched.id),
+        kam_tag(kam.id),
+    ]
+    assert bumped(tags, lambda: make_interaction(restaurant)) == {
+        "interactions",
+        restaurant_tag(restaurant.id),
+        kam_tag(kam.id),
+    }
+
+
+def test_moving_an_interaction_bumps_both_restaurants(make_restaurant, make_interaction):
+    source, target = make_restaurant(), make_restaurant()
+    interaction = make_interaction(source)
+
+    def move():
+        interaction.restaurant_id = target.id
+        interaction.contact_id = target.contacts[0].id
+        db.session.commit()
+
+    tags = [restaurant_tag(source.id), restaurant_tag(target.id)]
+    assert bumped(tags, move) == set(tags)
+
+
+def test_rolled_back_changes_bump_nothing(make_restaurant):
+    restaurant = make_restaurant()
+
+    def rollback():
+        restaurant.name = "Never saved"
+        db.session.flush()
+        db.session.rollback()
+
+    assert bumped(["restaurants", restaurant_tag(restaurant.id)], rollback) == set()
+
+
+def test_core_imports_bump_through_invalidate_cache(make_restaurant, kam):
+    from lib.bulk_import import import_records
+
+    restaurant = make_restaurant()
+
+    def import_call():
+        import_records(
+            "interactions",
+            [
+                {
+                    "interaction_date": datetime(2026, 10, 1).strftime("%Y-%m-%d"),
+                    "type": "Call",
+                    "restaurant_id": restaurant.id,
+                    "contact_id": restaurant.contacts[0].id,
+                }
+            ],
+        )
+
+    tags = ["interactions", restaurant_tag(restaurant.id), kam_tag(kam.id)]
+    assert bumped(tags, import_call) == set(tags)
+
+
+def test_tagged_keys_change_when_a_tag_is_bumped(make_restaurant):
+    restaurant = make_restaurant()
+    make_key = tagged_key("detail", restaurant_tag(restaurant.id))
+    before = make_key()
+    restaurant.name = "Renamed"
+    db.session.commit()
+    assert make_key() != before
+
+
+def test_cached_per_tag_recomputes_only_the_bumped_ids(make_restaurant):
+    restaurants = [make_restaurant(name=f"Restaurant {i}") for i in range(3)]
+    ids = [restaurant.id for restaurant in restaurants]
+    computed = []
+
+    def compute(missing):
+        computed.append(sorted(missing))
+        return {id_: db.session.get(type(restaurants[0]), id_).name for id_ in missing}
+
+    assert cached_per_tag("names", ids, restaurant_tag, compute) == {
+        id_: f"Restaurant {i}" for i, id_ in enumerate(ids)
+    }
+    restaurants[1].name = "Renamed"
+    db.session.commit()
+    values = cached_per_tag("names", ids, restaurant_tag, compute)
+
+    assert values[ids[1]] == "Renamed"
+    assert computed == [ids, [ids[1]]]
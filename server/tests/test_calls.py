@@ -0,0 +1,110 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from db.calls import next_call_due, overdue_before
+from db.models import db, CallFrequency, Restaurant, RestaurantStatus
+
+
+@pytest.mark.parametrize(
+    "frequency, interval",
+    [
+        (CallFrequency.DAILY, timedelta(days=1)),
+        (CallFrequency.WEEKLY, timedelta(days=7)),
+        (CallFrequency.MONTHLY, timedelta(days=30)),
+        (None, timedelta(days=7)),
+    ],
+)
+def test_next_call_is_due_one_interval_after_the_last(frequency, interval):
+    last_call = datetime(2026, 9, 1, 15)
+    assert next_call_due(frequency, last_call, RestaurantStatus.CONTACTED) == last_call + interval
+
+
+def test_restaurants_never_called_are_due_from_when_they_were_added():
+    created_at = datetime(2026, 9, 1)
+    assert next_call_due(CallFrequency.DAILY, None, RestaurantStatus.NEW, created_at) == created_at
+
+
+def test_lost_restaurants_are_never_due():
+    assert next_call_due(CallFrequency.DAILY, datetime(2026, 9, 1), RestaurantStatus.LOST) is None
+
+
+def test_calls_are_overdue_from_the_start_of_today():
+    assert overdue_before(datetime(2026, 10, 18, 17, 45, 12)) == datetime(2026, 10, 18)
+
+
+def test_logging_a_call_reschedules_the_restaurant(make_restaurant, make_interaction):
+    restaurant = make_restaurant(call_frequency=CallFrequency.DAILY)
+    assert restaurant.next_call_due_at == restaurant.created_at
+
+    make_interaction(restaurant, interaction_date=datetime(2026, 9, 1, 10))
+
+    assert restaurant.last_call_date == datetime(2026, 9, 1, 10)
+    assert restaurant.next_call_due_at == datetime(2026, 9, 2, 10)
+
+
+def test_losing_a_restaurant_takes_it_out_of_the_queue(make_restaurant):
+    restaurant = make_restaurant()
+    restaurant.status = RestaurantStatus.LOST
+    db.session.commit()
+    assert restaurant.next_call_due_at is None
+
+
+def test_deleting_a_call_keeps_a_later_manual_last_call_date(make_restaurant, make_interaction):
+    restaurant = make_restaurant(last_call_date=datetime(2026, 10, 10))
+    call = make_interaction(restaurant, interaction_date=datetime(2026, 9, 1))
+    assert restaurant.last_call_date == datetime(2026, 10, 10)
+
+    db.session.delete(call)
+    db.session.commit()
+
+    assert db.session.get(Restaurant, restaurant.id).last_call_date == datetime(2026, 10, 10)
+
+
+def test_editing_a_call_keeps_a_later_manual_last_call_date(make_restaurant, make_interaction):
+    restaurant = make_restaurant(last_call_date=datetime(2026, 10, 10))
+    call = make_interaction(restaurant, interaction_date=datetime(2026, 9, 1))
+
+    call.interaction_date = datetime(2026, 8, 1)
+    db.session.commit()
+
+    assert restaurant.last_call_date == datetime(2026, 10, 10)
+
+
+def test_deleting_the_latest_call_moves_back_to_the_previous_one(make_restaurant, make_interaction):
+    restaurant = make_restaurant()
+    make_interaction(restaurant, interaction_date=datetime(2026, 9, 1))
+    latest = make_interaction(restaurant, interaction_date=datetime(2026, 9, 20))
+    assert restaurant.last_call_date == datetime(2026, 9, 20)
+
+    db.session.delete(latest)
+    db.session.commit()
+
+    assert restaurant.last_call_date == datetime(2026, 9, 1)
+    assert restaurant.next_call_due_at == datetime(2026, 9, 8)
+
+
+def test_deleting_the_only_call_keeps_last_call_date(make_restaurant, make_interaction):
+    restaurant = make_restaurant()
+    call = make_interaction(restaurant, interaction_date=datetime(2026, 9, 1))
+
+    db.session.delete(call)
+    db.session.commit()
+
+    assert restaurant.last_call_date == datetime(2026, 9, 1)
+
+
+def test_bulk_delete_keeps_a_later_manual_last_call_date(make_restaurant, make_interaction):
+    from lib.bulk_delete import delete_records
+
+    restaurant = make_restaurant(last_call_date=datetime(2026, 10, 10))
+    earlier = make_interaction(restaurant, interaction_date=datetime(2026, 9, 1))
+    other = make_restaurant()
+    make_interaction(other, interaction_date=datetime(2026, 9, 1))
+    latest = make_interaction(other, interaction_date=datetime(2026, 9, 20))
+
+    delete_records("interactions", [earlier.id, latest.id])
+    db.session.expire_all()
+
+    assert db.session.get(Restaurant, restaurant.id).last_call_date == datetime(2026, 10, 10)
+    assert db.session.get(Restaurant, other.id).last_call_date == datetime(2026, 9, 1)
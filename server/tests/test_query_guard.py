@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+from flask import jsonify
+
+from db.models import Restaurant, InteractionOutcome, InteractionType
+from lib.query_guard import QueryBudgetExceeded, route_budget
+from lib.query_plans import PLAN_CHECK_ROUTES, sample_ids
+
+
+@pytest.fixture
+def restaurants(make_restaurant, make_interaction):
+    # More restaurants than QUERY_REPEAT_LIMIT, so a per-row query shows.
+    restaurants = [make_restaurant(name=f"Restaurant {i}", revenue=1000 * i) for i in range(8)]
+    types = list(InteractionType)
+    for i, restaurant in enumerate(restaurants):
+        for day in range(3):
+            make_interaction(
+                restaurant,
+                interaction_date=datetime(2026, 9, 1) + timedelta(days=day + i),
+                type=types[(i + day) % len(types)],
+                outcome=InteractionOutcome.SUCCESSFUL,
+                duration_minutes=15,
+            )
+    return restaurants
+
+
+def test_guard_raises_on_an_n_plus_one_route(app, client, restaurants):
+    @app.route("/test/nplus1")
+    def nplus1():
+        return jsonify([len(restaurant.contacts) for restaurant in Restaurant.query.all()])
+
+    with pytest.raises(QueryBudgetExceeded, match="8x SELECT"):
+        client.get("/test/nplus1")
+
+
+@pytest.mark.parametrize("route", [route for route, _ in PLAN_CHECK_ROUTES])
+def test_routes_stay_within_their_query_budget(app, client, auth_headers, restaurants, route):
+    url = route.format(**sample_ids())
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 200, response.get_json()
+    endpoint, _ = app.url_map.bind("localhost").match(url.split("?")[0])
+    assert int(response.headers["X-Query-Count"]) <= route_budget(app, endpoint)
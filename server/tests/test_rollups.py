@@ -0,0 +1,113 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import db.rollups as rollups
+from db.analytics import interaction_timeseries
+from db.models import db, InteractionOutcome, InteractionRollup, InteractionType
+from db.rollups import rebuild_interaction_rollups, rollups_table
+
+START = datetime(2026, 9, 1, 9)
+
+
+def _rows(restaurant):
+    return {
+        (row.day, row.type): row.interaction_count
+        for row in InteractionRollup.query.filter_by(restaurant_id=restaurant.id)
+    }
+
+
+def test_interactions_on_the_same_day_share_a_row(make_restaurant, make_interaction):
+    restaurant = make_restaurant()
+    make_interaction(restaurant, interaction_date=START)
+    make_interaction(restaurant, interaction_date=START + timedelta(hours=8))
+    make_interaction(restaurant, interaction_date=START, type=InteractionType.EMAIL)
+
+    assert _rows(restaurant) == {
+        (START.date(), InteractionType.CALL): 2,
+        (START.date(), InteractionType.EMAIL): 1,
+    }
+
+
+def test_moving_the_last_interaction_of_a_day_removes_its_row(
+    make_restaurant, make_interaction, summaries_current
+):
+    restaurant = make_restaurant()
+    interaction = make_interaction(restaurant, interaction_date=START)
+
+    interaction.interaction_date = START + timedelta(days=2)
+    interaction.type = InteractionType.MEETING
+    db.session.commit()
+
+    assert _rows(restaurant) == {(START.date() + timedelta(days=2), InteractionType.MEETING): 1}
+    assert summaries_current()
+
+
+def test_deleting_the_last_interaction_of_a_day_removes_its_row(make_restaurant, make_interaction):
+    restaurant = make_restaurant()
+    interaction = make_interaction(restaurant, interaction_date=START)
+
+    db.session.delete(interaction)
+    db.session.commit()
+
+    assert _rows(restaurant) == {}
+
+
+def test_dialects_without_an_upsert_recompute_the_rows(
+    monkeypatch, make_restaurant, make_interaction, summaries_current
+):
+    monkeypatch.setattr(rollups, "UPSERT_INSERTS", {})
+    restaurant = make_restaurant()
+    first = make_interaction(restaurant, interaction_date=START, duration_minutes=10)
+    make_interaction(
+        restaurant,
+        interaction_date=START + timedelta(hours=1),
+        outcome=InteractionOutcome.SUCCESSFUL,
+    )
+    assert summaries_current()
+
+    first.interaction_date = START + timedelta(days=1)
+    db.session.commit()
+    assert summaries_current()
+
+    db.session.delete(first)
+    db.session.commit()
+    assert summaries_current()
+    assert _rows(restaurant) == {(START.date(), InteractionType.CALL): 1}
+
+
+def test_rebuild_since_only_touches_later_days(make_restaurant, make_interaction):
+    restaurant = make_restaurant()
+    make_interaction(restaurant, interaction_date=START)
+    make_interaction(restaurant, interaction_date=START + timedelta(days=5))
+    db.session.execute(rollups_table.update().values(interaction_count=7))
+    db.session.commit()
+
+    assert rebuild_interaction_rollups(since=START + timedelta(days=1)) == 2
+    assert _rows(restaurant) == {
+        (START.date(), InteractionType.CALL): 7,
+        (START.date() + timedelta(days=5), InteractionType.CALL): 1,
+    }
+
+
+@pytest.mark.parametrize("granularity", ["day", "week", "month"])
+def test_timeseries_buckets_add_up_to_the_interactions(
+    make_restaurant, make_interaction, granularity
+):
+    restaurant = make_restaurant()
+    for day in range(40):
+        make_interaction(
+            restaurant,
+            interaction_date=START + timedelta(days=day),
+            type=InteractionType.CALL if day % 3 else InteractionType.EMAIL,
+            duration_minutes=day,
+        )
+
+    series = interaction_timeseries(date(2026, 9, 1), date(2026, 10, 10), granularity)
+    by_type = interaction_timeseries(
+        date(2026, 9, 1), date(2026, 10, 10), granularity, by_type=True
+    )
+
+    assert sum(point["interactions"] for point in series) == 40
+    assert sum(point["total_duration_minutes"] for point in series) == sum(range(40))
+    assert sum(point["interactions"] for point in by_type if point["type"] == "Email") == 14
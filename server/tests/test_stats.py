@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from db.models import (
+    db,
+    Contact,
+    Interaction,
+    InteractionOutcome,
+    InteractionType,
+    RestaurantStats,
+)
+from db.stats import stats_table
+from lib.bulk_delete import delete_records
+from lib.bulk_import import import_records
+
+START = datetime(2026, 9, 1, 9)
+
+
+@pytest.fixture
+def restaurants(make_restaurant, make_interaction):
+    restaurants = [make_restaurant(name=f"Restaurant {i}") for i in range(3)]
+    outcomes = [*InteractionOutcome, None]
+    for i in range(9):
+        make_interaction(
+            restaurants[i % 2],
+            interaction_date=START + timedelta(days=i),
+            type=list(InteractionType)[i % len(InteractionType)],
+            outcome=outcomes[i % len(outcomes)],
+            duration_minutes=None if i % 3 == 0 else 10 * i,
+        )
+    return restaurants
+
+
+def _interactions(restaurant):
+    return Interaction.query.filter_by(restaurant_id=restaurant.id).order_by(Interaction.id).all()
+
+
+def test_inserts_are_counted(restaurants, make_interaction, summaries_current):
+    assert summaries_current()
+    make_interaction(restaurants[2], outcome=InteractionOutcome.CANCELLED, duration_minutes=5)
+    assert summaries_current()
+    assert db.session.get(RestaurantStats, restaurants[2].id).interaction_count == 1
+
+
+def test_new_restaurants_start_with_empty_stats(restaurants, summaries_current):
+    stats = db.session.get(RestaurantStats, restaurants[2].id)
+    assert stats.interaction_count == 0 and stats.last_interaction_date is None
+    assert summaries_current()
+
+
+@pytest.mark.parametrize(
+    "changes",
+    [
+        {"type": InteractionType.SITE_VISIT},
+        {"outcome": InteractionOutcome.NO_RESPONSE},
+        {"outcome": None},
+        {"duration_minutes": 77},
+        {"duration_minutes": None},
+        {"interaction_date": START + timedelta(days=30)},
+        {"interaction_date": START - timedelta(days=30)},
+    ],
+)
+def test_updates_move_the_counters(restaurants, summaries_current, changes):
+    for interaction in _interactions(restaurants[0]):
+        for name, value in changes.items():
+            setattr(interaction, name, value)
+    db.session.commit()
+    assert summaries_current()
+
+
+def test_moving_an_interaction_to_another_restaurant(restaurants, summaries_current):
+    interaction = _interactions(restaurants[0])[-1]
+    interaction.restaurant_id = restaurants[2].id
+    interaction.contact_id = restaurants[2].contacts[0].id
+    db.session.commit()
+    assert summaries_current()
+    assert db.session.get(RestaurantStats, restaurants[2].id).interaction_count == 1
+
+
+def test_deleting_the_latest_interaction_moves_the_last_date_back(restaurants, summaries_current):
+    *earlier, latest = _interactions(restaurants[0])
+    db.session.delete(latest)
+    db.session.commit()
+    assert summaries_current()
+    stats = db.session.get(RestaurantStats, restaurants[0].id)
+    assert stats.last_interaction_date == earlier[-1].interaction_date
+
+
+def test_deleting_every_interaction_empties_the_stats(restaurants, summaries_current):
+    for interaction in _interactions(restaurants[1]):
+        db.session.delete(interaction)
+    db.session.commit()
+    assert summaries_current()
+    assert db.session.get(RestaurantStats, restaurants[1].id).interaction_count == 0
+
+
+def test_deleting_a_restaurant_removes_its_stats(restaurants, summaries_current):
+    restaurant = restaurants[1]
+    for interaction in _interactions(restaurant):
+        db.session.delete(interaction)
+    for contact in Contact.query.filter_by(restaurant_id=restaurant.id):
+        db.session.delete(contact)
+    db.session.delete(restaurant)
+    db.session.commit()
+    assert summaries_current()
+    assert db.session.get(RestaurantStats, restaurant.id) is None
+
+
+def test_a_missing_stats_row_is_recomputed(restaurants, make_interaction, summaries_current):
+    db.session.execute(
+        stats_table.delete().where(stats_table.c.restaurant_id == restaurants[0].id)
+    )
+    db.session.commit()
+    make_interaction(restaurants[0])
+    assert summaries_current()
+
+
+def test_bulk_import_and_delete(restaurants, summaries_current):
+    restaurant = restaurants[2]
+    result = import_records(
+        "interactions",
+        [
+            {
+                "interaction_date": "2026-10-01",
+                "type": "Call",
+                "outcome": "Successful",
+                "restaurant_id": restaurant.id,
+                "contact_id": restaurant.contacts[0].id,
+                "duration_minutes": 12,
+            }
+        ],
+    )
+    assert result == {"created": 1, "errors": []}
+    assert summaries_current()
+
+    delete_records("interactions", [i.id for i in _interactions(restaurants[0])[:2]])
+    assert summaries_current()
+    delete_records("restaurants", [restaurants[1].id])
+    assert summaries_current()
+
+
+def test_changes_to_expired_instances_move_the_counters(restaurants, make_interaction, summaries_current):
+    # Committing expires the instance, so its previous values are not loaded.
+    interaction = make_interaction(restaurants[0], duration_minutes=5)
+    interaction.restaurant_id = restaurants[2].id
+    interaction.contact_id = restaurants[2].contacts[0].id
+    interaction.duration_minutes = 9
+    db.session.commit()
+    assert summaries_current()